@@ -2,21 +2,41 @@ from django.contrib import admin
 from django import forms
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import Group
+from django.db.models import OuterRef, Subquery
 from apis.models import (
+    ArchivedInterview,
+    ArchivedInterviewRound,
+    AuditLog,
     Skill,
+    SkillAlias,
     CandidateInfo,
     WorkExperience,
     User,
     EmployeeProfile,
     Employee,
     Interview,
-    InterviewRound
+    InterviewRound,
+    OutboxEvent,
+    Role
+)
+from apis.paginators import EstimatedCountPaginator
+from apis.selectors import (
+    EXPERIENCE_SUMMARY_FIELDS,
+    refresh_experience_summaries
 )
 from apis.utils import candidate_exists
 
 
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    fk_name = 'skill'
+    extra = 0
+
+
 class SkillAdmin(admin.ModelAdmin):
-    pass
+    search_fields = ['^name']
+    ordering = ['name']
+    inlines = [SkillAliasInline]
 
 
 admin.site.register(Skill, SkillAdmin)
@@ -51,6 +71,20 @@ class CandidateInfoAdmin(admin.ModelAdmin):
     form = CandidateInfoAdminForm
     list_display = ['email', 'first_name', 'last_name', 'gender', 'mobile_no']
     inlines = [WorkExperienceInline]
+    readonly_fields = EXPERIENCE_SUMMARY_FIELDS
+    # prefix/exact lookups only, so every search term can use an index
+    search_fields = ['^email', '^first_name', '^last_name', '=mobile_no']
+    list_filter = ['gender']
+    autocomplete_fields = ['skills']
+    ordering = ['-id']
+    list_per_page = 50
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def save_related(self, request, form, formsets, change):
+        # the change view runs in one transaction, inlines included
+        super().save_related(request, form, formsets, change)
+        refresh_experience_summaries([form.instance.pk])
 
 
 admin.site.register(CandidateInfo, CandidateInfoAdmin)
@@ -66,27 +100,47 @@ class EmployeeProfileInline(admin.StackedInline):
     fk_name = 'user'
     extra = 1
     max_num = 1
+    readonly_fields = ("open_rounds",)
+    autocomplete_fields = ("skills",)
 
 
 class EmployeeAdmin(UserAdmin):
     inlines = [EmployeeProfileInline]
     list_display = UserAdmin.list_display + ("role",)
+    search_fields = ("^username", "^email", "^first_name", "^last_name")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            role_name=Subquery(
+                EmployeeProfile.objects.filter(
+                    user=OuterRef("pk")
+                ).values("role")[:1]
+            )
+        )
+
+    def role(self, obj):
+        return obj.role_name or ""
+    role.admin_order_field = "role_name"
 
 
 admin.site.register(Employee, EmployeeAdmin)
 
 
 class InterviewAdminForm(forms.ModelForm):
-    employee = forms.ModelChoiceField(
-        queryset=Employee.objects.filter(
-            emp_profile__role="HR"
-        )
-    )
-
     class Meta:
         model = Interview
         fields = '__all__'
 
+    def clean_employee(self):
+        employee = self.cleaned_data.get('employee', None)
+        if employee and not employee.emp_profile.filter(
+            role=Role.HR.value
+        ).exists():
+            raise forms.ValidationError("Assigned Employee must be a HR.")
+        return employee
+
 
 class InterviewRoundInline(admin.StackedInline):
     model = InterviewRound
@@ -96,12 +150,83 @@ class InterviewRoundInline(admin.StackedInline):
     extra = 0
     max_num = 0
     readonly_fields = ("round_no",)
+    autocomplete_fields = ("interviewer", "skills")
 
 
 class InterviewAdmin(admin.ModelAdmin):
     form = InterviewAdminForm
     inlines = [InterviewRoundInline]
     readonly_fields = ['job_id']
+    list_display = ['job_id', 'employee', 'candidate', 'status', 'overall_rating']
+    list_select_related = ['employee', 'candidate']
+    list_filter = ['status']
+    search_fields = ['=job_id']
+    autocomplete_fields = ['employee', 'candidate']
+    ordering = ['-id']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 admin.site.register(Interview, InterviewAdmin)
+
+
+class AuditLogAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'actor_username', 'action', 'job_id', 'round_no']
+    list_filter = ['action']
+    search_fields = ['=job_id', '=actor_username']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+admin.site.register(AuditLog, AuditLogAdmin)
+
+
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ['id', 'event_type', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status', 'event_type']
+    search_fields = ['=idempotency_key']
+    readonly_fields = ['event_type', 'idempotency_key', 'payload', 'created_at', 'sent_at']
+
+
+admin.site.register(OutboxEvent, OutboxEventAdmin)
+
+
+class ArchivedInterviewRoundInline(admin.TabularInline):
+    model = ArchivedInterviewRound
+    extra = 0
+    can_delete = False
+    exclude = ['skills']
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+class ArchivedInterviewAdmin(admin.ModelAdmin):
+    list_display = ['job_id', 'candidate', 'employee', 'status', 'closed_at', 'archived_at']
+    list_select_related = ['candidate', 'employee']
+    list_filter = ['status']
+    search_fields = ['=job_id']
+    inlines = [ArchivedInterviewRoundInline]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+admin.site.register(ArchivedInterview, ArchivedInterviewAdmin)
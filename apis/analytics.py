@@ -0,0 +1,342 @@
+import json
+import os
+from pathlib import Path
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from apis import models
+from apis.changes import get_start_cursor, read_changes
+from apis.exceptions import CursorExpiredError
+
+# InterviewRound.status -> code stored in the snapshot, 0 is "no status yet"
+STATUS_CODES = {
+    None: 0,
+    models.InterviewRoundStatus.PASS: 1,
+    models.InterviewRoundStatus.FAIL: 2,
+    models.InterviewRoundStatus.RECOMMEND: 3,
+}
+PASSED_CODES = (1, 3)
+ROUND_COLUMNS = {
+    "round_id": np.int64,
+    "interview_id": np.int64,
+    "interviewer_id": np.int64,
+    "rating": np.int16,
+    "status": np.int8,
+}
+SKILL_COLUMNS = {
+    "skill_round_id": np.int64,
+    "skill_id": np.int64,
+}
+# Rounds live in either table, archiving moves them keeping their ids
+ROUND_MODELS = (models.InterviewRound, models.ArchivedInterviewRound)
+
+
+def get_snapshot_dir():
+    return Path(getattr(
+        settings, "SNAPSHOT_DIR", settings.BASE_DIR / "snapshots"
+    )) / "rounds"
+
+
+class RoundSnapshot:
+    """
+    Columnar copy of the interview rounds, archived ones included, saved
+    as .npy files, one per column, so readers can
+    np.load(..., mmap_mode="r") them.
+
+    Round columns are sorted by round id, skills are (round id, skill id)
+    pairs. `cursor` is the change feed position (apis/changes.py) the
+    snapshot was taken at: an incremental `build()` reads again the
+    rounds of the interviews changed since, which covers new rounds,
+    edits, deletes and archiving.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or get_snapshot_dir())
+        self.columns = {}
+        self.cursor = None
+        self.built_at = None
+
+    def __len__(self):
+        return len(self.columns.get("round_id", ()))
+
+    def column_path(self, name):
+        return self.path / f"{name}.npy"
+
+    def exists(self):
+        return (self.path / "meta.json").exists()
+
+    def load(self, mmap_mode="r"):
+        meta = json.loads((self.path / "meta.json").read_text())
+        self.cursor = meta.get("cursor")
+        self.built_at = meta["built_at"]
+        self.columns = {
+            name: np.load(self.column_path(name), mmap_mode=mmap_mode)
+            for name in {**ROUND_COLUMNS, **SKILL_COLUMNS}
+        }
+        return self
+
+    def save(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        for name, values in self.columns.items():
+            tmp_path = self.path / f"{name}.tmp.npy"
+            np.save(tmp_path, values)
+            os.replace(tmp_path, self.column_path(name))
+        self.built_at = timezone.now().isoformat()
+        (self.path / "meta.json").write_text(json.dumps({
+            "cursor": self.cursor,
+            "built_at": self.built_at,
+            "rounds": len(self),
+            "skill_entries": len(self.columns["skill_id"]),
+        }))
+
+    @staticmethod
+    def fetch_rounds(model, chunk_size, **lookup):
+        chunks = {name: [] for name in ROUND_COLUMNS}
+        last_id = 0
+        while True:
+            rows = list(model.objects.filter(
+                id__gt=last_id, **lookup
+            ).order_by("id").values_list(
+                "id", "interview_id", "interviewer_id", "rating", "status"
+            )[:chunk_size])
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            chunks["round_id"].append(
+                np.fromiter((row[0] for row in rows), np.int64, len(rows))
+            )
+            chunks["interview_id"].append(
+                np.fromiter((row[1] for row in rows), np.int64, len(rows))
+            )
+            chunks["interviewer_id"].append(
+                np.fromiter((row[2] or 0 for row in rows), np.int64, len(rows))
+            )
+            chunks["rating"].append(
+                np.fromiter((row[3] or 0 for row in rows), np.int16, len(rows))
+            )
+            chunks["status"].append(np.fromiter(
+                (STATUS_CODES.get(row[4], 0) for row in rows), np.int8, len(rows)
+            ))
+        return {
+            name: np.concatenate(values) if values else np.empty(0, dtype)
+            for (name, values), dtype in zip(
+                chunks.items(), ROUND_COLUMNS.values()
+            )
+        }
+
+    @staticmethod
+    def fetch_skills(model, chunk_size, **lookup):
+        through = model.skills.through
+        round_field = model.skills.field.m2m_field_name()
+        lookup = {
+            f"{round_field}__{name}": value for name, value in lookup.items()
+        }
+        entries, last_id = [], 0
+        while True:
+            rows = list(through.objects.filter(
+                id__gt=last_id, **lookup
+            ).order_by("id").values_list(
+                "id", f"{round_field}_id", "skill_id"
+            )[:chunk_size])
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            entries.append(np.array(rows, dtype=np.int64)[:, 1:])
+        entries = (
+            np.concatenate(entries) if entries
+            else np.empty((0, 2), dtype=np.int64)
+        )
+        return {"skill_round_id": entries[:, 0], "skill_id": entries[:, 1]}
+
+    @classmethod
+    def fetch(cls, chunk_size, interview_ids=None):
+        """
+        Columns of the rounds of `interview_ids` (all of them when None)
+        from both round tables, sorted by round id.
+        """
+        if interview_ids is None:
+            lookups = [{}]
+        else:
+            interview_ids = sorted(interview_ids)
+            lookups = [
+                {"interview_id__in": interview_ids[start:start + chunk_size]}
+                for start in range(0, len(interview_ids), chunk_size)
+            ]
+        parts = [
+            {
+                **cls.fetch_rounds(model, chunk_size, **lookup),
+                **cls.fetch_skills(model, chunk_size, **lookup),
+            }
+            for model in ROUND_MODELS for lookup in lookups
+        ]
+        return cls.merge(parts)
+
+    @staticmethod
+    def merge(parts):
+        columns = {
+            name: np.concatenate(
+                [np.asarray(part[name]) for part in parts]
+                or [np.empty(0, dtype)]
+            )
+            for name, dtype in {**ROUND_COLUMNS, **SKILL_COLUMNS}.items()
+        }
+        order = np.argsort(columns["round_id"], kind="stable")
+        for name in ROUND_COLUMNS:
+            columns[name] = columns[name][order]
+        return columns
+
+    def read_changed_interviews(self, chunk_size):
+        """
+        Ids of the interviews changed after `cursor`, moves the cursor to
+        the newest change. None when the cursor can't be continued from.
+        """
+        interview_ids, cursor = set(), self.cursor
+        try:
+            while True:
+                changes, cursor, has_more = read_changes(cursor, chunk_size)
+                interview_ids.update(
+                    object_id for _, resource, object_id, _ in changes
+                    if resource == models.ChangeResource.INTERVIEW
+                )
+                if not has_more:
+                    break
+        except (CursorExpiredError, ValidationError):
+            return None
+        self.cursor = cursor
+        return interview_ids
+
+    def build(self, full=False, chunk_size=5000):
+        """
+        Reads the rounds of the interviews changed since the snapshot,
+        everything when `full`, without a previous snapshot or once the
+        changes after it were pruned. Returns the number of rows read.
+        """
+        interview_ids = None
+        if not full and self.columns and self.cursor:
+            interview_ids = self.read_changed_interviews(chunk_size)
+        if interview_ids is None:
+            # taken before reading, a change committed meanwhile is
+            # read again by the next build
+            self.cursor = get_start_cursor()
+            self.columns = self.fetch(chunk_size)
+            return len(self)
+        columns = self.fetch(chunk_size, interview_ids)
+        changed = np.isin(
+            np.asarray(self.columns["interview_id"]), list(interview_ids)
+        )
+        kept_skills = ~np.isin(
+            np.asarray(self.columns["skill_round_id"]),
+            np.asarray(self.columns["round_id"])[changed]
+        )
+        self.columns = self.merge([
+            {
+                **{
+                    name: np.asarray(self.columns[name])[~changed]
+                    for name in ROUND_COLUMNS
+                },
+                **{
+                    name: np.asarray(self.columns[name])[kept_skills]
+                    for name in SKILL_COLUMNS
+                },
+            },
+            columns,
+        ])
+        return len(columns["round_id"])
+
+
+def group_stats(groups, size, ratings, passed):
+    """Per group count, rating mean, variance and pass rate."""
+    counts = np.bincount(groups, minlength=size).astype(np.float64)
+    totals = np.bincount(groups, weights=ratings, minlength=size)
+    squares = np.bincount(groups, weights=ratings * ratings, minlength=size)
+    passes = np.bincount(groups, weights=passed, minlength=size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = totals / counts
+        variances = np.maximum(squares / counts - means * means, 0)
+        pass_rates = passes / counts
+    return counts, means, variances, pass_rates
+
+
+def compare_groups(groups, size, ratings, passed, baseline_mean,
+                   baseline_std, baseline_pass_rate, min_rounds):
+    """
+    Stats of every group with at least `min_rounds` rows, compared with
+    the baseline (scalars or one value per group): the z-score of the
+    group mean and the pass rate delta.
+    """
+    counts, means, variances, pass_rates = group_stats(
+        groups, size, ratings, passed
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_scores = (means - baseline_mean) / (baseline_std / np.sqrt(counts))
+    z_scores = np.where(np.isfinite(z_scores), z_scores, 0.0)
+    deltas = pass_rates - baseline_pass_rate
+    for group in np.flatnonzero(counts >= min_rounds):
+        yield group, {
+            "rounds": int(counts[group]),
+            "mean_rating": round(float(means[group]), 3),
+            "variance": round(float(variances[group]), 3),
+            "z_score": round(float(z_scores[group]), 3),
+            "pass_rate": round(float(pass_rates[group]), 3),
+            "pass_rate_delta": round(float(deltas[group]), 3),
+        }
+
+
+def calibration_report(snapshot, min_rounds=5):
+    """
+    Rating calibration of every interviewer over their closed rounds,
+    overall (skill_id None, compared with every interviewer) and per skill
+    of the rounds (compared with every interviewer of that skill).
+    Returns a list of dicts, see `compare_groups`.
+    """
+    columns = {
+        name: np.asarray(values) for name, values in snapshot.columns.items()
+    }
+    closed = (columns["status"] != 0) & (columns["interviewer_id"] != 0)
+    round_ids = columns["round_id"][closed]
+    if not len(round_ids):
+        return []
+    ratings = columns["rating"][closed].astype(np.float64)
+    passed = np.isin(columns["status"][closed], PASSED_CODES).astype(np.float64)
+    interviewer_ids, interviewers = np.unique(
+        columns["interviewer_id"][closed], return_inverse=True
+    )
+    report = [
+        dict(interviewer_id=int(interviewer_ids[group]), skill_id=None, **row)
+        for group, row in compare_groups(
+            interviewers, len(interviewer_ids), ratings, passed,
+            ratings.mean(), ratings.std(), passed.mean(), min_rounds
+        )
+    ]
+    # one row per (closed round, skill), pair = interviewer x skill
+    rows = np.minimum(
+        np.searchsorted(round_ids, columns["skill_round_id"]),
+        len(round_ids) - 1
+    )
+    matched = round_ids[rows] == columns["skill_round_id"]
+    rows = rows[matched]
+    if not len(rows):
+        return report
+    skill_ids, skills = np.unique(
+        columns["skill_id"][matched], return_inverse=True
+    )
+    skill_count = len(skill_ids)
+    _, skill_means, skill_variances, skill_pass_rates = group_stats(
+        skills, skill_count, ratings[rows], passed[rows]
+    )
+    pair_skills = np.arange(len(interviewer_ids) * skill_count) % skill_count
+    report += [
+        dict(
+            interviewer_id=int(interviewer_ids[group // skill_count]),
+            skill_id=int(skill_ids[group % skill_count]),
+            **row
+        )
+        for group, row in compare_groups(
+            interviewers[rows] * skill_count + skills,
+            len(pair_skills), ratings[rows], passed[rows],
+            skill_means[pair_skills], np.sqrt(skill_variances[pair_skills]),
+            skill_pass_rates[pair_skills], min_rounds
+        )
+    ]
+    return report
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ApisConfig(AppConfig):
     name = 'apis'
+
+    def ready(self):
+        from apis import signals  # noqa: F401
@@ -0,0 +1,156 @@
+from collections import Counter
+from datetime import timedelta
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from apis import models
+from apis.changes import record_interview_changes
+from apis.selectors import apply_interviewer_load_deltas, release_interviewer_load
+from apis.timeline import invalidate_candidate_timelines
+
+INTERVIEW_FIELDS = (
+    "id",
+    "job_id",
+    "employee_id",
+    "candidate_id",
+    "overall_rating",
+    "status",
+    "created_at",
+    "closed_at",
+    "version",
+)
+ROUND_FIELDS = (
+    "id",
+    "interview_id",
+    "round_no",
+    "interviewer_id",
+    "status",
+    "remarks",
+    "rating",
+    "date",
+    "is_final_round",
+    "created_at",
+    "version",
+)
+
+
+def get_archivable_interviews(older_than_days):
+    """
+    Closed (SELECT/REJECT) interviews closed more than `older_than_days`
+    ago. Interviews closed before closed_at existed are aged by created_at.
+    """
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    return models.Interview.objects.filter(status__isnull=False).filter(
+        Q(closed_at__lt=cutoff) | Q(closed_at__isnull=True, created_at__lt=cutoff)
+    )
+
+
+def delete_rows(model, column, values, chunk_size=500):
+    """
+    `DELETE FROM <table> WHERE <column> IN (...)` straight on the cursor:
+    no rows are loaded and no pre_delete/post_delete signals are sent,
+    the caller takes care of what the signal handlers would have done.
+    """
+    values = list(values)
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(column)
+    with connection.cursor() as cursor:
+        for start in range(0, len(values), chunk_size):
+            chunk = values[start:start + chunk_size]
+            cursor.execute(
+                f"DELETE FROM {table} WHERE {column} IN "
+                f"({', '.join(['%s'] * len(chunk))})",
+                chunk
+            )
+
+
+def move_rows(source_model, target_model, fields, **lookup):
+    rows = list(source_model.objects.filter(**lookup).values(*fields))
+    target_model.objects.bulk_create(
+        [target_model(**row) for row in rows], batch_size=500
+    )
+    return rows
+
+
+@transaction.atomic
+def archive_interviews(interview_ids):
+    """
+    Moves the given closed interviews, their rounds and the round skills
+    to the archive tables in one transaction. Returns the number of
+    interviews archived, interviews reopened meanwhile are skipped.
+
+    Archived interviews stay readable through the interview endpoints,
+    so the change feed gets a regular change for them, not a tombstone,
+    and renders them from the archive (with `archived_at`).
+    """
+    interview_ids = list(models.Interview.objects.select_for_update().filter(
+        pk__in=interview_ids, status__isnull=False
+    ).values_list("id", flat=True))
+    if not interview_ids:
+        return 0
+    interviews = move_rows(
+        models.Interview, models.ArchivedInterview, INTERVIEW_FIELDS,
+        pk__in=interview_ids
+    )
+    rounds = move_rows(
+        models.InterviewRound, models.ArchivedInterviewRound, ROUND_FIELDS,
+        interview_id__in=interview_ids
+    )
+    through = models.InterviewRound.skills.through
+    archived_through = models.ArchivedInterviewRound.skills.through
+    archived_through.objects.bulk_create([
+        archived_through(archivedinterviewround_id=round_id, skill_id=skill_id)
+        for round_id, skill_id in through.objects.filter(
+            interviewround__interview_id__in=interview_ids
+        ).values_list("interviewround_id", "skill_id")
+    ], batch_size=500)
+    release_interviewer_load(models.InterviewRound.objects.filter(
+        interview_id__in=interview_ids, status__isnull=True
+    ))
+    # Plain DELETEs, children first, see delete_rows: the collector
+    # would load every row and send the per-row post_delete signals
+    # (change feed entries, interviewer load, timeline invalidation),
+    # all of which are done once for the whole batch above and below.
+    round_ids = [row["id"] for row in rounds]
+    delete_rows(through, "interviewround_id", round_ids)
+    delete_rows(models.InterviewRound, "id", round_ids)
+    delete_rows(models.Interview, "id", interview_ids)
+    invalidate_candidate_timelines(row["candidate_id"] for row in interviews)
+    record_interview_changes(interview_ids)
+    return len(interview_ids)
+
+
+@transaction.atomic
+def restore_interviews(job_ids):
+    """
+    Moves archived interviews (by job_id) back with their original ids,
+    returns the number of interviews restored.
+    """
+    interview_ids = list(models.ArchivedInterview.objects.select_for_update(
+    ).filter(job_id__in=job_ids).values_list("id", flat=True))
+    if not interview_ids:
+        return 0
+    interviews = move_rows(
+        models.ArchivedInterview, models.Interview, INTERVIEW_FIELDS,
+        pk__in=interview_ids
+    )
+    rounds = move_rows(
+        models.ArchivedInterviewRound, models.InterviewRound, ROUND_FIELDS,
+        interview_id__in=interview_ids
+    )
+    through = models.InterviewRound.skills.through
+    archived_through = models.ArchivedInterviewRound.skills.through
+    through.objects.bulk_create([
+        through(interviewround_id=round_id, skill_id=skill_id)
+        for round_id, skill_id in archived_through.objects.filter(
+            archivedinterviewround__interview_id__in=interview_ids
+        ).values_list("archivedinterviewround_id", "skill_id")
+    ], batch_size=500)
+    apply_interviewer_load_deltas(Counter(
+        row["interviewer_id"] for row in rounds
+        if row["status"] is None and row["interviewer_id"]
+    ))
+    models.ArchivedInterview.objects.filter(pk__in=interview_ids).delete()
+    invalidate_candidate_timelines(row["candidate_id"] for row in interviews)
+    record_interview_changes(interview_ids)
+    return len(interview_ids)
@@ -0,0 +1,141 @@
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import F
+from apis import models
+from apis.changes import record_interview_changes
+from apis.selectors import apply_interviewer_load_deltas
+from apis.timeline import invalidate_interview_timelines
+
+
+class InterviewerPool:
+    """
+    In-memory view of the eligible interviewers and their open round
+    counters, loaded once per assignment run (two queries).
+    Picking is least-loaded first, ties broken by the larger skill
+    overlap with the round and then by the lower employee id.
+    """
+
+    def __init__(self, profiles):
+        self.load = {}
+        self.skills = {}
+        self.skill_index = defaultdict(set)
+        for profile in profiles:
+            skill_ids = {skill.id for skill in profile.skills.all()}
+            self.load[profile.user_id] = profile.open_rounds
+            self.skills[profile.user_id] = skill_ids
+            for skill_id in skill_ids:
+                self.skill_index[skill_id].add(profile.user_id)
+
+    @classmethod
+    def load_eligible(cls, lock=False):
+        """
+        `lock` holds the counters until the transaction ends, so two
+        concurrent runs don't both pick from the same loads.
+        """
+        profiles = models.EmployeeProfile.objects.filter(
+            role=models.Role.DEV.value,
+            user__is_active=True
+        ).only("id", "user_id", "open_rounds").prefetch_related("skills")
+        if lock:
+            profiles = profiles.select_for_update()
+        return cls(profiles)
+
+    def pick(self, skill_ids=None):
+        """
+        Returns the user id of the least-loaded interviewer sharing at least
+        one of `skill_ids`, or any interviewer when the round has no skills.
+        """
+        skill_ids = set(skill_ids or [])
+        if skill_ids:
+            user_ids = set()
+            for skill_id in skill_ids:
+                user_ids |= self.skill_index.get(skill_id, set())
+        else:
+            user_ids = self.load.keys()
+        best_key, best_user_id = None, None
+        for user_id in user_ids:
+            overlap = len(skill_ids & self.skills[user_id])
+            key = (self.load[user_id], -overlap, user_id)
+            if best_key is None or key < best_key:
+                best_key, best_user_id = key, user_id
+        return best_user_id
+
+    def charge(self, user_id, rounds=1):
+        self.load[user_id] += rounds
+
+
+def auto_assign_interviewer(skill_ids=None):
+    """
+    Picks an interviewer for a single round, the counter itself is
+    charged by InterviewRound.save() once the round is saved.
+    """
+    user_id = InterviewerPool.load_eligible().pick(skill_ids)
+    if user_id is None:
+        return None
+    return models.Employee.objects.get(pk=user_id)
+
+
+@transaction.atomic()
+def bulk_auto_assign(rounds):
+    """
+    Assigns interviewers to many unassigned rounds at once,
+    rounds must come with their `skills` prefetched.
+    The rounds are locked and read again first: a concurrent request may
+    have assigned or closed them since they were loaded, those are left
+    alone and returned as taken with their current interviewer and status
+    (neither for a round deleted since).
+    Returns (assigned_rounds, unassigned_rounds, taken_rounds).
+    """
+    current = {
+        pk: (interviewer_id, status, version)
+        for pk, interviewer_id, status, version in
+        models.InterviewRound.objects.select_for_update().filter(
+            pk__in=[interview_round.pk for interview_round in rounds]
+        ).values_list("id", "interviewer_id", "status", "version")
+    }
+    pool = InterviewerPool.load_eligible(lock=True)
+    deltas = Counter()
+    assigned, unassigned, taken = [], [], []
+    for interview_round in rounds:
+        if interview_round.pk not in current:
+            taken.append(interview_round)
+            continue
+        interviewer_id, status, version = current[interview_round.pk]
+        if interviewer_id or status:
+            interview_round.interviewer_id = interviewer_id
+            interview_round.status = status
+            interview_round._loaded_open_interviewer_id = (
+                interview_round.open_interviewer_id
+            )
+            taken.append(interview_round)
+            continue
+        interview_round.version = version
+        skill_ids = [skill.id for skill in interview_round.skills.all()]
+        user_id = pool.pick(skill_ids)
+        if user_id is None:
+            unassigned.append(interview_round)
+            continue
+        interview_round.interviewer_id = user_id
+        pool.charge(user_id)
+        deltas[user_id] += 1
+        assigned.append(interview_round)
+    versions = [interview_round.version for interview_round in assigned]
+    for interview_round in assigned:
+        interview_round.version = F("version") + 1
+    models.InterviewRound.objects.bulk_update(
+        assigned, ["interviewer", "version"], batch_size=500
+    )
+    for interview_round, version in zip(assigned, versions):
+        interview_round.version = version + 1
+    apply_interviewer_load_deltas(deltas)
+    invalidate_interview_timelines(
+        {interview_round.interview_id for interview_round in assigned}
+    )
+    record_interview_changes(
+        interview_round.interview_id for interview_round in assigned
+    )
+    for interview_round in assigned:
+        interview_round._loaded_open_interviewer_id = (
+            interview_round.open_interviewer_id
+        )
+    return assigned, unassigned, taken
@@ -0,0 +1,182 @@
+import atexit
+import logging
+import threading
+import time
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import connections, transaction
+from django.utils import timezone
+from apis import models
+
+logger = logging.getLogger("apps.audit")
+
+
+class AuditBuffer:
+    """
+    Write-behind buffer for audit log entries.
+
+    Entries are written with one bulk_create when `max_size` entries are
+    waiting, `flush_interval` seconds after the first buffered entry, when
+    a request has finished (after the response is sent) and at exit.
+
+    A batch that fails to insert goes back to the front of the buffer and
+    is retried `flush_interval` seconds later, size and request flushes
+    wait for that retry. At most `max_backlog` entries are kept while the
+    database is unavailable, the oldest ones beyond that are dropped and
+    logged.
+    """
+
+    def __init__(self, max_size=100, flush_interval=5.0, max_backlog=10000):
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.max_backlog = max_backlog
+        self._entries = []
+        self._lock = threading.Lock()
+        self._timer = None
+        self._retry_at = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+            if len(self._entries) >= self.max_size and not self._waiting():
+                batch = self._take()
+            else:
+                batch = []
+                self._schedule()
+        self._write(batch)
+
+    def flush(self, force=False, **kwargs):
+        with self._lock:
+            if self._waiting() and not force:
+                self._schedule()
+                return
+            batch = self._take()
+        self._write(batch)
+
+    def _waiting(self):
+        """True until the retry of a failed batch is due."""
+        return self._retry_at is not None and time.monotonic() < self._retry_at
+
+    def _take(self):
+        batch, self._entries = self._entries, []
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _schedule(self):
+        if self._timer is None and self.flush_interval:
+            self._timer = threading.Timer(self.flush_interval, self._timed_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _timed_flush(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        finally:
+            # the timer thread owns its own connection
+            connections.close_all()
+
+    def _write(self, batch):
+        if not batch:
+            return
+        try:
+            models.AuditLog.objects.bulk_create(batch, batch_size=500)
+        except Exception:
+            logger.exception(
+                f"Could not write {len(batch)} audit log entries, "
+                f"retrying in {self.flush_interval}s."
+            )
+            self._requeue(batch)
+        else:
+            self._retry_at = None
+
+    def _requeue(self, batch):
+        with self._lock:
+            self._entries = batch + self._entries
+            dropped = len(self._entries) - self.max_backlog
+            if dropped > 0:
+                self._entries = self._entries[dropped:]
+                logger.error(
+                    f"Audit log backlog is full, dropped the {dropped} "
+                    f"oldest entries."
+                )
+            self._retry_at = time.monotonic() + self.flush_interval
+            self._schedule()
+
+
+audit_buffer = AuditBuffer(
+    max_size=getattr(settings, "AUDIT_LOG_BUFFER_SIZE", 100),
+    flush_interval=getattr(settings, "AUDIT_LOG_FLUSH_SECONDS", 5.0),
+    max_backlog=getattr(settings, "AUDIT_LOG_MAX_BACKLOG", 10000),
+)
+request_finished.connect(audit_buffer.flush, dispatch_uid="audit_log_flush")
+atexit.register(audit_buffer.flush, force=True)
+
+
+def build_audit_entry(actor, action, job_id=None, round_no=None,
+                      changes=None):
+    return models.AuditLog(
+        actor_id=getattr(actor, "pk", None),
+        actor_username=getattr(actor, "username", "") or "",
+        action=action,
+        job_id=job_id,
+        round_no=round_no,
+        changes=changes or {},
+        created_at=timezone.now(),
+    )
+
+
+def record_audit(actor, action, job_id=None, round_no=None, changes=None):
+    """
+    Records who did `action` on which interview (round).
+
+    With AUDIT_LOG_DURABILITY = "sync" the entry is inserted right away,
+    in the caller's transaction. Otherwise it is buffered once the
+    surrounding transaction commits, and dropped if it rolls back.
+    """
+    record_audit_entries([
+        build_audit_entry(actor, action, job_id, round_no, changes)
+    ])
+
+
+def record_audit_entries(entries):
+    """Like `record_audit` for many entries, one insert when "sync"."""
+    if not entries:
+        return
+    if getattr(settings, "AUDIT_LOG_DURABILITY", "buffered") == "sync":
+        models.AuditLog.objects.bulk_create(entries, batch_size=500)
+        return
+
+    def buffer_entries():
+        for entry in entries:
+            audit_buffer.add(entry)
+
+    transaction.on_commit(buffer_entries)
+
+
+def round_audit_snapshot(interview_round, skill_ids=None):
+    if skill_ids is None:
+        skill_ids = [skill.id for skill in interview_round.skills.all()]
+    return {
+        "interviewer": interview_round.interviewer_id,
+        "status": interview_round.status,
+        "rating": interview_round.rating,
+        "remarks": interview_round.remarks,
+        "date": str(interview_round.date) if interview_round.date else None,
+        "is_final_round": interview_round.is_final_round,
+        "skills": sorted(skill_ids),
+    }
+
+
+def snapshot_changes(before, after):
+    return {
+        field: [before.get(field), value]
+        for field, value in after.items()
+        if before.get(field) != value
+    }
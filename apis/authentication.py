@@ -0,0 +1,176 @@
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+from apis import models
+
+TOKEN_SALT = "apis.authentication.token"
+ACCESS = "access"
+REFRESH = "refresh"
+REVOKED_SESSIONS_CACHE_KEY = "revoked-token-sessions"
+
+
+def get_token_lifetime(token_type):
+    if token_type == REFRESH:
+        return getattr(settings, "REFRESH_TOKEN_SECONDS", 86400)
+    return getattr(settings, "ACCESS_TOKEN_SECONDS", 900)
+
+
+class TokenUser:
+    """
+    The employee a signed token was issued to, built from its claims
+    without touching the database. Enough for permissions, auditing and
+    anything else reading the id, username, role or superuser flag.
+    """
+    is_active = True
+    is_anonymous = False
+    is_authenticated = True
+    is_staff = False
+
+    def __init__(self, claims):
+        self.id = self.pk = claims["uid"]
+        self.username = claims["usr"]
+        self.role = claims["role"]
+        self.is_superuser = claims["su"]
+        self.session_id = claims["sid"]
+
+    def __str__(self):
+        return self.username
+
+    def get_username(self):
+        return self.username
+
+
+def get_employee_role(user):
+    """Role claim of token users, read from the employee profile otherwise."""
+    if isinstance(user, TokenUser):
+        return user.role
+    emp_profile = user.emp_profile.first()
+    if not emp_profile:
+        return ""
+    return emp_profile.role
+
+
+def build_claims(employee, session_id, token_type):
+    return {
+        "uid": employee.pk,
+        "usr": employee.username,
+        "role": get_employee_role(employee),
+        "su": employee.is_superuser,
+        "sid": session_id,
+        "typ": token_type,
+    }
+
+
+def issue_tokens(employee):
+    """
+    Access and refresh token of a new session of `employee`, both HMAC
+    signed (SECRET_KEY) and timestamped by django.core.signing.
+    """
+    session_id = uuid.uuid4().hex
+    tokens = {
+        token_type: signing.dumps(
+            build_claims(employee, session_id, token_type),
+            salt=TOKEN_SALT,
+            compress=True
+        ) for token_type in (ACCESS, REFRESH)
+    }
+    tokens["expires_in"] = get_token_lifetime(ACCESS)
+    return tokens
+
+
+def read_token(token, token_type):
+    """Claims of a valid, unexpired and not revoked token of `token_type`."""
+    try:
+        claims = signing.loads(
+            token, salt=TOKEN_SALT, max_age=get_token_lifetime(token_type)
+        )
+    except signing.SignatureExpired:
+        raise AuthenticationFailed("Token has expired.")
+    except signing.BadSignature:
+        raise AuthenticationFailed("Invalid token.")
+    if claims.get("typ") != token_type:
+        raise AuthenticationFailed(f"Token is not a valid {token_type} token.")
+    if claims["sid"] in get_revoked_sessions():
+        raise AuthenticationFailed("Token has been revoked.")
+    return claims
+
+
+def get_revoked_sessions():
+    """
+    Sessions revoked before their refresh token expired. Kept in the cache
+    for REVOKED_TOKENS_CACHE_SECONDS, with a cache that is not shared by
+    the workers a revocation can take that long to reach all of them.
+    """
+    revoked = cache.get(REVOKED_SESSIONS_CACHE_KEY)
+    if revoked is None:
+        revoked = frozenset(models.RevokedToken.objects.filter(
+            expires_at__gt=timezone.now()
+        ).values_list("session_id", flat=True))
+        cache.set(
+            REVOKED_SESSIONS_CACHE_KEY, revoked,
+            getattr(settings, "REVOKED_TOKENS_CACHE_SECONDS", 30)
+        )
+    return revoked
+
+
+def revoke_session(session_id):
+    """Revokes the tokens of a session, False if it already was."""
+    now = timezone.now()
+    models.RevokedToken.objects.filter(expires_at__lte=now).delete()
+    _, created = models.RevokedToken.objects.get_or_create(
+        session_id=session_id,
+        defaults={
+            "expires_at": now + timedelta(seconds=get_token_lifetime(REFRESH))
+        }
+    )
+    cache.delete(REVOKED_SESSIONS_CACHE_KEY)
+    return created
+
+
+def refresh_tokens(refresh_token):
+    """
+    New session for the employee of `refresh_token`, the old one is
+    revoked. The employee is read again so role changes and deactivation
+    apply from here on.
+    """
+    claims = read_token(refresh_token, REFRESH)
+    employee = models.Employee.objects.filter(
+        pk=claims["uid"], is_active=True
+    ).first()
+    if not employee:
+        raise AuthenticationFailed("User inactive or deleted.")
+    if not revoke_session(claims["sid"]):
+        # refreshed concurrently, a refresh token is good for one refresh
+        raise AuthenticationFailed("Token has been revoked.")
+    return issue_tokens(employee)
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    `Authorization: Bearer <access token>`, the request user is a
+    TokenUser so authentication and permissions need no query.
+    """
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed(
+                "Invalid token header, the token must not contain spaces."
+            )
+        try:
+            token = auth[1].decode()
+        except UnicodeError:
+            raise AuthenticationFailed("Invalid token header.")
+        claims = read_token(token, ACCESS)
+        return TokenUser(claims), claims
+
+    def authenticate_header(self, request):
+        return self.keyword
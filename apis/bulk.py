@@ -0,0 +1,174 @@
+from collections import Counter
+from functools import reduce
+from operator import or_
+from django.db import transaction
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from apis import models
+from apis.audit import (
+    build_audit_entry,
+    record_audit_entries,
+    round_audit_snapshot,
+    snapshot_changes
+)
+from apis.changes import record_interview_changes
+from apis.exceptions import ConflictError
+from apis.selectors import (
+    allocate_sequence_values,
+    apply_interviewer_load_deltas
+)
+from apis.streams import build_interview_event, record_interview_events
+from apis.timeline import (
+    invalidate_candidate_timelines,
+    invalidate_interview_timelines
+)
+from apis.utils import apply_m2m_diff
+
+ROUND_UPDATE_FIELDS = (
+    "interviewer",
+    "rating",
+    "remarks",
+    "date",
+    "is_final_round",
+)
+
+
+@transaction.atomic
+def bulk_update_rounds(rows, actor):
+    """
+    Applies many interview round updates (validated rows of
+    InterviewRoundBulkItemSerializer) all or nothing.
+
+    Rounds, interviewers and skills are each looked up with one query,
+    the rounds are locked while they are checked and written back with
+    one bulk_update plus one batched M2M diff for the skills.
+    Raises ValidationError (400) or ConflictError (409, stale "version")
+    with one entry per failing row, returns the updated rounds.
+    """
+    refs = [(row["job_id"], row["round_no"]) for row in rows]
+    rounds = models.InterviewRound.objects.select_for_update().filter(
+        reduce(or_, (
+            Q(interview__job_id=job_id, round_no=round_no)
+            for job_id, round_no in set(refs)
+        ))
+    ).select_related("interview").prefetch_related("skills")
+    rounds_by_ref = {
+        (obj.interview.job_id, obj.round_no): obj for obj in rounds
+    }
+    interviewers = {
+        employee.username: employee
+        for employee in models.Employee.objects.filter(username__in={
+            row["interviewer"] for row in rows if row.get("interviewer")
+        })
+    }
+    skill_ids = dict(models.Skill.objects.filter(name__in={
+        name for row in rows for name in row.get("skills", [])
+    }).values_list("name", "id"))
+
+    errors, conflicts, seen = [], [], set()
+    for index, (row, ref) in enumerate(zip(rows, refs)):
+        row_errors = []
+        obj = rounds_by_ref.get(ref)
+        if ref in seen:
+            row_errors.append("Round is listed more than once.")
+        seen.add(ref)
+        if not obj:
+            row_errors.append("Interview round not found.")
+        if row.get("interviewer") and row["interviewer"] not in interviewers:
+            row_errors.append("Employee(Interviewer) not Found.")
+        missing_skills = [
+            name for name in row.get("skills", []) if name not in skill_ids
+        ]
+        if missing_skills:
+            row_errors.append(
+                f"{', '.join(missing_skills)} are not valid 'skills'."
+            )
+        error = {"index": index, "job_id": ref[0], "round_no": ref[1]}
+        if row_errors:
+            errors.append(dict(error, errors=row_errors))
+        elif "version" in row and row["version"] != obj.version:
+            conflicts.append(dict(
+                error, errors=[f"Round is at version {obj.version}."]
+            ))
+    if errors:
+        raise ValidationError({"errors": errors})
+    if conflicts:
+        raise ConflictError({"errors": conflicts})
+
+    updated, update_fields = [], {"version"}
+    load_deltas, desired_skills, snapshots = Counter(), {}, []
+    for row, ref in zip(rows, refs):
+        obj = rounds_by_ref[ref]
+        before = round_audit_snapshot(obj)
+        previous_open = obj.open_interviewer_id
+        for field in ROUND_UPDATE_FIELDS:
+            if field not in row:
+                continue
+            value = row[field]
+            if field == "interviewer":
+                value = interviewers[value] if value else None
+            setattr(obj, field, value)
+            update_fields.add(field)
+        if obj.open_interviewer_id != previous_open:
+            load_deltas[previous_open] -= 1
+            load_deltas[obj.open_interviewer_id] += 1
+        round_skills = before["skills"]
+        if "skills" in row:
+            round_skills = [skill_ids[name] for name in row["skills"]]
+            desired_skills[obj.pk] = round_skills
+        # the row is locked, so the version read above is still current
+        obj.version += 1
+        obj._loaded_open_interviewer_id = obj.open_interviewer_id
+        obj._loaded_rating = obj.rating
+        snapshots.append((obj, before, round_audit_snapshot(obj, round_skills)))
+        updated.append(obj)
+    models.InterviewRound.objects.bulk_update(
+        updated, list(update_fields), batch_size=500
+    )
+    if desired_skills:
+        apply_m2m_diff(models.InterviewRound.skills, desired_skills)
+    apply_interviewer_load_deltas(load_deltas)
+    invalidate_interview_timelines({obj.interview_id for obj in updated})
+    record_interview_changes(obj.interview_id for obj in updated)
+    record_interview_events(
+        build_interview_event("round.rated", obj.interview, obj)
+        for obj, before, after in snapshots
+        if before["rating"] != after["rating"]
+    )
+    record_audit_entries([
+        build_audit_entry(
+            actor,
+            "round.bulk_update",
+            job_id=obj.interview.job_id,
+            round_no=obj.round_no,
+            changes=snapshot_changes(before, after)
+        ) for obj, before, after in snapshots
+    ])
+    return updated
+
+
+@transaction.atomic
+def bulk_assign_interviews(candidates, employees):
+    """
+    Creates one interview per candidate, handing the candidates to the
+    HR `employees` round-robin. Job ids are allocated as one block of the
+    job id sequence and the interviews are written with one bulk_create.
+    """
+    numbers = allocate_sequence_values(
+        models.JOB_ID_SEQUENCE, len(candidates)
+    )
+    interviews = [
+        models.Interview(
+            job_id=models.Interview.build_job_id(number),
+            employee=employees[index % len(employees)],
+            candidate=candidate,
+        )
+        for index, (number, candidate) in enumerate(zip(numbers, candidates))
+    ]
+    models.Interview.objects.bulk_create(interviews, batch_size=500)
+    invalidate_candidate_timelines(candidate.pk for candidate in candidates)
+    # bulk_create doesn't set the ids on MySQL
+    record_interview_changes(models.Interview.objects.filter(
+        job_id__in=[interview.job_id for interview in interviews]
+    ).values_list("id", flat=True))
+    return interviews
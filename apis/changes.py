@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from apis import models
+from apis.exceptions import CursorExpiredError
+from apis.gaps import SequenceGaps
+
+CURSOR_SALT = "apis.changes.cursor"
+
+
+def record_changes(resource, object_ids, deleted=False):
+    """
+    Appends one change log entry per object, call it inside the
+    transaction writing the change. Rounds and work experiences are
+    recorded as a change of their interview or candidate.
+    """
+    now = timezone.now()
+    models.ChangeLogEntry.objects.bulk_create([
+        models.ChangeLogEntry(
+            resource=resource,
+            object_id=object_id,
+            deleted=deleted,
+            changed_at=now
+        ) for object_id in sorted(set(object_ids)) if object_id
+    ], batch_size=500)
+
+
+def record_interview_changes(interview_ids, deleted=False):
+    record_changes(models.ChangeResource.INTERVIEW, interview_ids, deleted)
+
+
+def record_candidate_changes(candidate_ids, deleted=False):
+    record_changes(models.ChangeResource.CANDIDATE, candidate_ids, deleted)
+
+
+def get_retention():
+    return timedelta(days=getattr(settings, "CHANGE_LOG_RETENTION_DAYS", 30))
+
+
+def get_gap_timeout():
+    return getattr(settings, "CHANGE_FEED_GAP_TIMEOUT_SECONDS", 300)
+
+
+def encode_cursor(gaps, at):
+    return signing.dumps({
+        "seq": gaps.high, "gaps": gaps.to_list(), "at": at.isoformat()
+    }, salt=CURSOR_SALT)
+
+
+def decode_cursor(cursor):
+    """SequenceGaps to continue from, 410 once entries after it were pruned."""
+    try:
+        data = signing.loads(cursor, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        raise ValidationError(detail="Invalid cursor.")
+    if datetime.fromisoformat(data["at"]) < timezone.now() - get_retention():
+        raise CursorExpiredError()
+    return SequenceGaps(data["seq"], data.get("gaps", ()), get_gap_timeout())
+
+
+def get_start_cursor():
+    """
+    Cursor of a client starting at the newest entry. Sequences are
+    allocated before their transaction commits, the ids missing among
+    the entries of the last gap timeout are still read once committed.
+    """
+    now = timezone.now()
+    gaps = SequenceGaps(timeout=get_gap_timeout())
+    recent = list(models.ChangeLogEntry.objects.filter(
+        changed_at__gte=now - timedelta(seconds=gaps.timeout)
+    ).order_by("id").values_list("id", flat=True))
+    before = models.ChangeLogEntry.objects.order_by("-id")
+    if recent:
+        before = before.filter(id__lt=recent[0])
+    gaps.skip_to(
+        before.values_list("id", flat=True).first() or 0,
+        recent,
+        int(now.timestamp())
+    )
+    return encode_cursor(gaps, now)
+
+
+def read_changes(cursor, limit):
+    """
+    Entries after the `cursor` (None for all of them), at most `limit`,
+    merged to the last entry per object. Returns the changes, each one
+    being (sequence, resource, object id, deleted), the cursor to
+    continue from and whether more entries are waiting.
+
+    Entries can commit out of sequence order, the ids skipped below the
+    cursor are read again for CHANGE_FEED_GAP_TIMEOUT_SECONDS, see
+    apis/gaps.py, so a change of a slow transaction comes late rather
+    than never.
+    """
+    if cursor is None:
+        gaps = SequenceGaps(timeout=get_gap_timeout())
+    else:
+        gaps = decode_cursor(cursor)
+    now = timezone.now()
+    gaps.expire(int(now.timestamp()))
+    entries = list(models.ChangeLogEntry.objects.filter(
+        gaps.unread()
+    ).order_by("id").values_list(
+        "id", "resource", "object_id", "deleted", "changed_at"
+    )[:limit])
+    has_more = len(entries) == limit
+    for index, entry in enumerate(entries):
+        if not gaps.add(entry[0], int(now.timestamp())):
+            entries, has_more = entries[:index], False
+            break
+    latest = {
+        (resource, object_id): (sequence, resource, object_id, deleted)
+        for sequence, resource, object_id, deleted, _ in entries
+    }
+    cursor = encode_cursor(gaps, entries[-1][4] if entries else now)
+    return sorted(latest.values()), cursor, has_more
+
+
+def prune_changes(before, chunk_size=10000):
+    """Deletes the entries older than `before` in chunks, returns how many."""
+    total = 0
+    while True:
+        ids = list(models.ChangeLogEntry.objects.filter(
+            changed_at__lt=before
+        ).order_by("id").values_list("id", flat=True)[:chunk_size])
+        if not ids:
+            return total
+        total += models.ChangeLogEntry.objects.filter(
+            id__in=ids
+        ).delete()[0]
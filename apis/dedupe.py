@@ -0,0 +1,131 @@
+import re
+from collections import namedtuple
+from django.conf import settings
+from apis import models
+
+# Blocking key columns on CandidateInfo, strongest first, and how much
+# a match on each contributes to the duplicate score.
+MATCH_WEIGHTS = {
+    "phone_key": 1.0,
+    "email_key": 0.6,
+    "name_key": 0.4,
+}
+KEY_FIELDS = tuple(MATCH_WEIGHTS.keys())
+# Phonetic name keys collide a lot: below DEDUPE_MIN_SCORE on purpose, a
+# name match never reports a duplicate alone, it only corroborates a
+# phone or email match.
+CORROBORATING_FIELDS = ("name_key",)
+
+DuplicateMatch = namedtuple(
+    "DuplicateMatch", ["candidate_id", "email", "score", "matched_on"]
+)
+
+SOUNDEX_CODES = {
+    **dict.fromkeys("BFPV", "1"),
+    **dict.fromkeys("CGJKQSXZ", "2"),
+    **dict.fromkeys("DT", "3"),
+    "L": "4",
+    **dict.fromkeys("MN", "5"),
+    "R": "6",
+}
+
+
+def normalize_phone(phone):
+    """
+    Normalizes a mobile number to E.164, national numbers get
+    settings.DEDUPE_DEFAULT_COUNTRY_CODE as prefix.
+    """
+    if not phone:
+        return None
+    digits = re.sub(r"\D", "", phone)
+    if not digits:
+        return None
+    if phone.strip().startswith("+"):
+        return f"+{digits}"
+    country_code = getattr(settings, "DEDUPE_DEFAULT_COUNTRY_CODE", "91")
+    if len(digits) == 11 and digits.startswith("0"):
+        digits = digits[1:]
+    if len(digits) == 10:
+        return f"+{country_code}{digits}"
+    return f"+{digits}"
+
+
+def normalize_email_local(email):
+    """
+    Lower cased local-part of the email without dots and "+tag",
+    so john.doe+jobs@x.com and JohnDoe@y.com share a block.
+    """
+    if not email or "@" not in email:
+        return None
+    local = email.rsplit("@", 1)[0].lower().split("+", 1)[0]
+    return local.replace(".", "") or None
+
+
+def soundex(value):
+    letters = [char for char in (value or "").upper() if char.isalpha()]
+    if not letters:
+        return ""
+    code = letters[0]
+    previous = SOUNDEX_CODES.get(letters[0], "")
+    for char in letters[1:]:
+        digit = SOUNDEX_CODES.get(char, "")
+        if digit and digit != previous:
+            code += digit
+        if char not in "HW":
+            previous = digit
+    return (code + "000")[:4]
+
+
+def phonetic_name_key(first_name, last_name):
+    key = f"{soundex(last_name)}{soundex(first_name)}"
+    return key or None
+
+
+def build_blocking_keys(email, first_name, last_name, mobile_no):
+    return {
+        "phone_key": normalize_phone(mobile_no),
+        "email_key": normalize_email_local(email),
+        "name_key": phonetic_name_key(first_name, last_name),
+    }
+
+
+def score_match(keys, other_keys):
+    matched_on = [
+        field for field in KEY_FIELDS
+        if keys.get(field) and keys.get(field) == other_keys.get(field)
+    ]
+    score = round(sum(MATCH_WEIGHTS[field] for field in matched_on), 2)
+    return score, matched_on
+
+
+def find_duplicates(keys, exclude_pk=None, min_score=None, limit=20):
+    """
+    Looks for candidates sharing a blocking key, one indexed lookup per
+    key, each block read up to `limit * 5` rows so that a big block
+    can't crowd out the others. Blocks of corroborating keys are only
+    read when a match on them alone reaches min_score.
+    """
+    if min_score is None:
+        min_score = getattr(settings, "DEDUPE_MIN_SCORE", 0.6)
+    rows = {}
+    for field in KEY_FIELDS:
+        if not keys.get(field):
+            continue
+        if field in CORROBORATING_FIELDS and MATCH_WEIGHTS[field] < min_score:
+            continue
+        block = models.CandidateInfo.objects.filter(**{field: keys[field]})
+        if exclude_pk:
+            block = block.exclude(pk=exclude_pk)
+        for row in block.order_by("id").values(
+            "id", "email", *KEY_FIELDS
+        )[:limit * 5]:
+            rows[row["id"]] = row
+    matches = []
+    for row in rows.values():
+        score, matched_on = score_match(keys, row)
+        if score >= min_score:
+            matches.append(
+                DuplicateMatch(row["id"], row["email"], score, matched_on)
+            )
+    matches.sort(key=lambda match: (-match.score, match.candidate_id))
+    return matches[:limit]
@@ -0,0 +1,40 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.views import exception_handler as drf_exception_handler
+
+
+class ConcurrentUpdateError(Exception):
+    """A versioned row was changed by someone else since it was read."""
+
+
+class ConflictError(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = (
+        "The resource was changed by another request, "
+        "reload it and try again."
+    )
+    default_code = "conflict"
+
+
+class PreconditionFailedError(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = (
+        "If-Match doesn't match the current version of the resource, "
+        "reload it and try again."
+    )
+    default_code = "precondition_failed"
+
+
+class CursorExpiredError(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = (
+        "The cursor is older than the change log retention, "
+        "download the full lists again and continue with a new cursor."
+    )
+    default_code = "cursor_expired"
+
+
+def exception_handler(exc, context):
+    if isinstance(exc, ConcurrentUpdateError):
+        exc = ConflictError()
+    return drf_exception_handler(exc, context)
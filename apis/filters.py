@@ -0,0 +1,129 @@
+from django.db.models import Exists, OuterRef
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from apis.models import InterviewRound, InterviewStatus
+
+PENDING = "PENDING"
+
+# ordering param -> order_by(), every entry is served by an index
+# ending with "id" (see Interview.Meta.indexes).
+INTERVIEW_ORDERINGS = {
+    "id": ("id",),
+    "-id": ("-id",),
+    "overall_rating": ("overall_rating", "id"),
+    "-overall_rating": ("-overall_rating", "-id"),
+    "status": ("status", "id"),
+    "-status": ("-status", "-id"),
+}
+
+
+class InterviewFilterSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(
+        choices=InterviewStatus.values + [PENDING], required=False
+    )
+    hr = serializers.CharField(
+        required=False, help_text="HR employee id or username"
+    )
+    candidate = serializers.EmailField(
+        required=False, help_text="Candidate email"
+    )
+    interviewer = serializers.CharField(
+        required=False, help_text="Interviewer username"
+    )
+    round_date_from = serializers.DateField(
+        required=False, input_formats=["%d-%m-%Y", "iso-8601"]
+    )
+    round_date_to = serializers.DateField(
+        required=False, input_formats=["%d-%m-%Y", "iso-8601"]
+    )
+    min_rating = serializers.IntegerField(required=False, min_value=0)
+    pending_round = serializers.IntegerField(
+        required=False, min_value=1,
+        help_text="Interviews whose round N has no status yet"
+    )
+    ordering = serializers.ChoiceField(
+        choices=list(INTERVIEW_ORDERINGS.keys()), required=False
+    )
+
+    def validate(self, attrs):
+        date_from = attrs.get("round_date_from", None)
+        date_to = attrs.get("round_date_to", None)
+        if date_from and date_to and date_from > date_to:
+            raise ValidationError(
+                detail="round_date_from must be before round_date_to."
+            )
+        return attrs
+
+
+class InterviewFilterBackend(BaseFilterBackend):
+    """
+    Server side filters and whitelisted ordering for the interview list.
+    Round based filters are combined into one EXISTS subquery on
+    interview_round, so they never multiply the interview rows.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        serializer = InterviewFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        status = params.get("status", None)
+        if status == PENDING:
+            queryset = queryset.filter(status__isnull=True)
+        elif status:
+            queryset = queryset.filter(status=status)
+        hr = params.get("hr", None)
+        if hr:
+            lookup = "employee_id" if hr.isnumeric() else "employee__username"
+            queryset = queryset.filter(**{lookup: hr})
+        if params.get("candidate", None):
+            queryset = queryset.filter(candidate__email=params["candidate"])
+        if "min_rating" in params:
+            queryset = queryset.filter(overall_rating__gte=params["min_rating"])
+        round_filters = {}
+        if params.get("interviewer", None):
+            round_filters["interviewer__username"] = params["interviewer"]
+        if params.get("round_date_from", None):
+            round_filters["date__gte"] = params["round_date_from"]
+        if params.get("round_date_to", None):
+            round_filters["date__lte"] = params["round_date_to"]
+        if params.get("pending_round", None):
+            round_filters["round_no"] = params["pending_round"]
+            round_filters["status__isnull"] = True
+        if round_filters:
+            queryset = queryset.filter(Exists(InterviewRound.objects.filter(
+                interview=OuterRef("pk"), **round_filters
+            )))
+        ordering = INTERVIEW_ORDERINGS[params.get("ordering", "-id")]
+        return queryset.order_by(*ordering)
+
+
+class CandidateFilterSerializer(serializers.Serializer):
+    min_experience = serializers.IntegerField(
+        required=False, min_value=0, help_text="Total experience in years"
+    )
+    designation = serializers.CharField(
+        required=False, help_text="Latest designation starts with"
+    )
+
+
+class CandidateFilterBackend(BaseFilterBackend):
+    """
+    Experience filters for the candidate list, both read the summary
+    columns on candidate_info (see selectors.refresh_experience_summaries)
+    through their index instead of aggregating work_experience.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        serializer = CandidateFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        if "min_experience" in params:
+            queryset = queryset.filter(
+                experience_years__gte=params["min_experience"]
+            )
+        if params.get("designation", None):
+            queryset = queryset.filter(
+                latest_designation__istartswith=params["designation"]
+            )
+        return queryset
@@ -0,0 +1,79 @@
+"""
+Ids of an auto-increment column are allocated when a row is inserted,
+not when its transaction commits, so reading the column in id order can
+see id 12 before a slower transaction commits id 11. SequenceGaps
+remembers the ids skipped below the highest one read and keeps reading
+them again until they show up or `timeout` seconds pass, after which a
+missing id is taken for a rolled back insert.
+"""
+from django.db.models import Q
+
+# Gaps tracked at most, reading stops short of an id that would open
+# one more until older gaps fill or time out.
+MAX_GAPS = 100
+
+
+class SequenceGaps:
+
+    def __init__(self, high=0, gaps=(), timeout=300):
+        self.high = high
+        # [first, last, since]: ids first..last are missing, since the
+        # timestamp they were first found missing at
+        self.gaps = [list(gap) for gap in gaps]
+        self.timeout = timeout
+
+    @property
+    def floor(self):
+        """Every id up to it was read or given up on."""
+        # gaps are kept in id order
+        return self.gaps[0][0] - 1 if self.gaps else self.high
+
+    def expire(self, now):
+        """Gives up on the gaps found missing more than `timeout` ago."""
+        self.gaps = [gap for gap in self.gaps if gap[2] > now - self.timeout]
+
+    def unread(self, field="id"):
+        """Q for the rows after the highest id read or inside a gap."""
+        query = Q(**{f"{field}__gt": self.high})
+        for first, last, _ in self.gaps:
+            query |= Q(**{f"{field}__range": (first, last)})
+        return query
+
+    def add(self, sequence, now):
+        """
+        Marks `sequence` as read, ids must come in ascending order.
+        Returns False, changing nothing, when it would open a gap past
+        MAX_GAPS, the caller stops reading there.
+        """
+        if sequence > self.high:
+            if sequence > self.high + 1:
+                if len(self.gaps) >= MAX_GAPS:
+                    return False
+                self.gaps.append([self.high + 1, sequence - 1, now])
+            self.high = sequence
+            return True
+        for index, (first, last, since) in enumerate(self.gaps):
+            if first <= sequence <= last:
+                self.gaps[index:index + 1] = [
+                    gap for gap in (
+                        [first, sequence - 1, since],
+                        [sequence + 1, last, since]
+                    ) if gap[0] <= gap[1]
+                ]
+                break
+        return True
+
+    def skip_to(self, after, sequences, now):
+        """
+        Starts reading after `after` with the ascending `sequences`
+        above it read, the ids missing among them become gaps. A reader
+        starting at the newest row passes the ids of the last `timeout`
+        seconds and, as `after`, the newest id older than those.
+        """
+        self.high, self.gaps = after, []
+        for sequence in sequences:
+            if not self.add(sequence, now):
+                break
+
+    def to_list(self):
+        return [list(gap) for gap in self.gaps]
@@ -0,0 +1,58 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apis.archive import archive_interviews, get_archivable_interviews
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves closed interviews older than --days, with their rounds, to "
+        "the archive tables, one transaction per chunk. Safe to stop and "
+        "run again, it carries on with what is left."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int,
+            default=getattr(settings, "ARCHIVE_AFTER_DAYS", 365),
+            help="Archive interviews closed more than this many days ago."
+        )
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument(
+            "--max-chunks", type=int, default=None,
+            help="Stop after this many chunks."
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=0,
+            help="Seconds to pause between chunks, eases replication lag."
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Only count the interviews that would be archived."
+        )
+
+    def handle(self, *args, **options):
+        archivable = get_archivable_interviews(options["days"])
+        if options["dry_run"]:
+            self.stdout.write(
+                f"{archivable.count()} interview(s) would be archived."
+            )
+            return
+        total = chunks = last_id = 0
+        while options["max_chunks"] is None or chunks < options["max_chunks"]:
+            interview_ids = list(archivable.filter(
+                id__gt=last_id
+            ).order_by("id").values_list(
+                "id", flat=True
+            )[:options["chunk_size"]])
+            if not interview_ids:
+                break
+            last_id = interview_ids[-1]
+            total += archive_interviews(interview_ids)
+            chunks += 1
+            self.stdout.write(f"Archived {total} interview(s), up to id {last_id}.")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {total} interview(s) in {chunks} chunk(s)."
+        ))
@@ -0,0 +1,126 @@
+import csv
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from apis.dedupe import KEY_FIELDS, build_blocking_keys, score_match
+from apis.models import CandidateInfo
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports likely duplicate candidates. Candidates are only compared "
+        "inside blocks sharing a blocking key, so the run time grows with "
+        "the number of candidates and not with the number of pairs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild-keys", action="store_true",
+            help="Recompute the blocking keys of every candidate first."
+        )
+        parser.add_argument(
+            "--output", help="Write the CSV report to this file "
+                             "instead of stdout."
+        )
+        parser.add_argument(
+            "--min-score", type=float,
+            default=getattr(settings, "DEDUPE_MIN_SCORE", 0.6)
+        )
+        parser.add_argument(
+            "--max-block-size", type=int, default=200,
+            help="Skip blocks bigger than this, they are too common "
+                 "to tell anything (e.g. a popular name)."
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if options["rebuild_keys"]:
+            updated = self.rebuild_keys(chunk_size)
+            self.stderr.write(f"Rebuilt blocking keys of {updated} candidate(s).")
+        pairs = set()
+        candidate_keys = {}
+        for field in KEY_FIELDS:
+            self.collect_block_pairs(
+                field, options["max_block_size"], chunk_size,
+                pairs, candidate_keys
+            )
+        if options["output"]:
+            with open(options["output"], "w", newline="") as report:
+                total = self.write_report(
+                    report, pairs, candidate_keys, options["min_score"]
+                )
+        else:
+            total = self.write_report(
+                self.stdout, pairs, candidate_keys, options["min_score"]
+            )
+        self.stderr.write(self.style.SUCCESS(
+            f"Found {total} likely duplicate pair(s)."
+        ))
+
+    @staticmethod
+    def rebuild_keys(chunk_size):
+        updated, last_pk = 0, 0
+        fields = ("id", "email", "first_name", "last_name", "mobile_no") + KEY_FIELDS
+        while True:
+            chunk = list(CandidateInfo.objects.filter(
+                pk__gt=last_pk
+            ).order_by("pk").only(*fields)[:chunk_size])
+            if not chunk:
+                return updated
+            changed = []
+            for candidate in chunk:
+                keys = build_blocking_keys(
+                    candidate.email, candidate.first_name,
+                    candidate.last_name, candidate.mobile_no
+                )
+                if any(getattr(candidate, f) != v for f, v in keys.items()):
+                    for field, value in keys.items():
+                        setattr(candidate, field, value)
+                    changed.append(candidate)
+            CandidateInfo.objects.bulk_update(changed, KEY_FIELDS)
+            updated += len(changed)
+            last_pk = chunk[-1].pk
+
+    @staticmethod
+    def collect_block_pairs(field, max_block_size, chunk_size,
+                            pairs, candidate_keys):
+        block_values = list(CandidateInfo.objects.exclude(
+            **{f"{field}__isnull": True}
+        ).exclude(**{field: ""}).values(field).annotate(
+            size=Count("id")
+        ).filter(
+            size__gt=1, size__lte=max_block_size
+        ).values_list(field, flat=True))
+        for start in range(0, len(block_values), chunk_size):
+            members = CandidateInfo.objects.filter(**{
+                f"{field}__in": block_values[start:start + chunk_size]
+            }).order_by(field, "id").values("id", "email", *KEY_FIELDS)
+            block, current = [], None
+            for row in members.iterator():
+                if row[field] != current:
+                    block, current = [], row[field]
+                candidate_keys[row["id"]] = row
+                for other in block:
+                    pairs.add((other["id"], row["id"]))
+                block.append(row)
+
+    @staticmethod
+    def write_report(stream, pairs, candidate_keys, min_score):
+        writer = csv.writer(stream)
+        writer.writerow([
+            "candidate_id", "email", "duplicate_id",
+            "duplicate_email", "score", "matched_on"
+        ])
+        total = 0
+        for (first_id, second_id) in sorted(pairs):
+            first, second = candidate_keys[first_id], candidate_keys[second_id]
+            score, matched_on = score_match(first, second)
+            if score < min_score:
+                continue
+            writer.writerow([
+                first_id, first["email"], second_id,
+                second["email"], score, "|".join(matched_on)
+            ])
+            total += 1
+        return total
@@ -0,0 +1,69 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apis.outbox import OutboxDispatcher
+
+
+class Command(BaseCommand):
+    help = (
+        "Delivers pending outbox events to the notification webhook "
+        "(OUTBOX_WEBHOOK_URL or --url, e.g. a local HTTP stub)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url", default=getattr(settings, "OUTBOX_WEBHOOK_URL", "")
+        )
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--max-attempts", type=int,
+            default=getattr(settings, "OUTBOX_MAX_ATTEMPTS", 8)
+        )
+        parser.add_argument(
+            "--retry-base", type=float,
+            default=getattr(settings, "OUTBOX_RETRY_BASE_SECONDS", 5),
+            help="First retry delay in seconds, doubled on every attempt."
+        )
+        parser.add_argument("--timeout", type=float, default=10)
+        parser.add_argument(
+            "--lease", type=float, default=None,
+            help="Seconds a claimed batch stays hidden from other "
+                 "dispatchers, defaults to the longest the batch can take "
+                 "plus a margin."
+        )
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep polling for new events instead of exiting "
+                 "once the outbox is drained."
+        )
+        parser.add_argument("--poll-interval", type=float, default=2)
+
+    def handle(self, *args, **options):
+        if not options["url"]:
+            raise CommandError("Set OUTBOX_WEBHOOK_URL or pass --url.")
+        try:
+            dispatcher = OutboxDispatcher(
+                url=options["url"],
+                batch_size=options["batch_size"],
+                concurrency=options["concurrency"],
+                max_attempts=options["max_attempts"],
+                timeout=options["timeout"],
+                lease=options["lease"],
+                retry_base=options["retry_base"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        total_sent = total_failed = 0
+        while True:
+            claimed, sent, failed = dispatcher.dispatch_batch()
+            total_sent += sent
+            total_failed += failed
+            if claimed:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["poll_interval"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Sent {total_sent} event(s), {total_failed} failed permanently."
+        ))
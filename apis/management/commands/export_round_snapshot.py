@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from apis.analytics import RoundSnapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports the interview rounds as a columnar NumPy snapshot "
+        "(SNAPSHOT_DIR/rounds/*.npy), archived rounds included. Only the "
+        "rounds of the interviews changed since the last export are read "
+        "again, unless --full."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full", action="store_true",
+            help="Rebuild the whole snapshot, also done once the change "
+                 "log entries after the last export were pruned."
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        snapshot = RoundSnapshot()
+        if snapshot.exists() and not options["full"]:
+            snapshot.load()
+        read = snapshot.build(
+            full=options["full"], chunk_size=options["chunk_size"]
+        )
+        snapshot.save()
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot of {len(snapshot)} round(s) written to {snapshot.path} "
+            f"({read} read)."
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from microservice.schema import get_schema_version, write_schema_artifacts
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes the versioned OpenAPI schema artifacts served by /openapi/, "
+        "run it once per deploy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schema-version", dest="schema_version", default=None,
+            help="Artifact version, defaults to OPENAPI_SCHEMA_VERSION."
+        )
+
+    def handle(self, *args, **options):
+        version = options["schema_version"] or get_schema_version()
+        for path in write_schema_artifacts(version):
+            self.stdout.write(f"Wrote {path} (+ {path.name}.gz)")
+        self.stdout.write(self.style.SUCCESS(
+            f"OpenAPI schema {version} generated."
+        ))
@@ -0,0 +1,76 @@
+import csv
+from django.core.management.base import BaseCommand, CommandError
+from apis.analytics import RoundSnapshot, calibration_report
+from apis.models import Employee, Skill
+
+REPORT_FIELDS = (
+    "interviewer",
+    "skill",
+    "rounds",
+    "mean_rating",
+    "variance",
+    "z_score",
+    "pass_rate",
+    "pass_rate_delta",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports per interviewer, and per interviewer and skill, how their "
+        "ratings and pass rate compare with every interviewer. "
+        "Reads the snapshot written by export_round_snapshot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--refresh", action="store_true",
+            help="Update the snapshot before reporting."
+        )
+        parser.add_argument(
+            "--min-rounds", type=int, default=5,
+            help="Leave out groups with fewer closed rounds than this."
+        )
+        parser.add_argument(
+            "--output", help="Write the CSV report to this file "
+                             "instead of stdout."
+        )
+
+    def handle(self, *args, **options):
+        snapshot = RoundSnapshot()
+        if options["refresh"]:
+            if snapshot.exists():
+                snapshot.load()
+            snapshot.build()
+            snapshot.save()
+        if not snapshot.exists():
+            raise CommandError(
+                "No round snapshot yet, run export_round_snapshot first."
+            )
+        snapshot.load()
+        report = calibration_report(snapshot, options["min_rounds"])
+        usernames = dict(Employee.objects.filter(
+            pk__in={row["interviewer_id"] for row in report}
+        ).values_list("id", "username"))
+        skill_names = dict(Skill.objects.filter(
+            pk__in={row["skill_id"] for row in report if row["skill_id"]}
+        ).values_list("id", "name"))
+        if options["output"]:
+            with open(options["output"], "w", newline="") as output:
+                self.write_report(output, report, usernames, skill_names)
+        else:
+            self.write_report(self.stdout, report, usernames, skill_names)
+        self.stderr.write(self.style.SUCCESS(
+            f"{len(report)} row(s) from the snapshot of {snapshot.built_at}."
+        ))
+
+    @staticmethod
+    def write_report(output, report, usernames, skill_names):
+        writer = csv.writer(output)
+        writer.writerow(REPORT_FIELDS)
+        for row in report:
+            writer.writerow([
+                usernames.get(row["interviewer_id"], row["interviewer_id"]),
+                skill_names.get(row["skill_id"], "") if row["skill_id"] else "",
+                *(row[field] for field in REPORT_FIELDS[2:])
+            ])
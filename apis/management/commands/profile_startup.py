@@ -0,0 +1,183 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Boots the project in a fresh interpreter (run with -X importtime) the way
+# a worker does, and prints the phase and per app timings as JSON.
+BOOT_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from django.apps.config import AppConfig
+
+apps = {}
+create = AppConfig.create.__func__
+import_models = AppConfig.import_models
+
+
+def timed_create(cls, entry):
+    start = time.perf_counter()
+    config = create(cls, entry)
+    timings = apps.setdefault(config.label, {"name": config.name})
+    timings["import_ms"] = (time.perf_counter() - start) * 1000
+    ready = config.ready
+
+    def timed_ready():
+        start = time.perf_counter()
+        ready()
+        timings["ready_ms"] = (time.perf_counter() - start) * 1000
+
+    config.ready = timed_ready
+    return config
+
+
+def timed_import_models(self):
+    start = time.perf_counter()
+    import_models(self)
+    apps[self.label]["models_ms"] = (time.perf_counter() - start) * 1000
+
+
+AppConfig.create = classmethod(timed_create)
+AppConfig.import_models = timed_import_models
+
+phases = {}
+mark = time.perf_counter()
+from django.conf import settings
+settings.INSTALLED_APPS
+phases["settings"] = (time.perf_counter() - mark) * 1000
+mark = time.perf_counter()
+import django
+django.setup(set_prefix=False)
+phases["apps"] = (time.perf_counter() - mark) * 1000
+mark = time.perf_counter()
+from django.core.handlers.wsgi import WSGIHandler
+WSGIHandler()
+phases["middleware"] = (time.perf_counter() - mark) * 1000
+mark = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+phases["urls"] = (time.perf_counter() - mark) * 1000
+phases["total"] = (time.perf_counter() - started) * 1000
+print(json.dumps({"phases": phases, "apps": apps}))
+"""
+
+
+def parse_importtime(stderr):
+    """Returns {module: (self_us, cumulative_us)} from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        module = parts[2].strip()
+        modules[module] = (int(parts[0]), int(parts[1]))
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        "Boots the project in fresh interpreters and reports the cold start "
+        "time per phase, per installed app and the slowest imports. "
+        "Exits non-zero when the median boot exceeds the budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs", type=int, default=3,
+            help="Number of cold boots, the median is reported."
+        )
+        parser.add_argument(
+            "--top", type=int, default=15,
+            help="Number of top level packages to list by import time."
+        )
+        parser.add_argument(
+            "--budget", type=int, default=None,
+            help="Cold start budget in ms, defaults to STARTUP_BUDGET_MS."
+        )
+        parser.add_argument(
+            "--json", action="store_true",
+            help="Print the report as JSON."
+        )
+
+    def boot(self):
+        env = dict(os.environ)
+        env.pop("PYTHONPROFILEIMPORTTIME", None)
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT],
+            env=env, capture_output=True, text=True
+        )
+        if result.returncode:
+            raise CommandError(f"Project boot failed:\n{result.stderr[-2000:]}")
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        report["imports"] = parse_importtime(result.stderr)
+        return report
+
+    def handle(self, *args, **options):
+        runs = [self.boot() for _ in range(max(options["runs"], 1))]
+        budget = options["budget"] or getattr(settings, "STARTUP_BUDGET_MS", 1500)
+        median = statistics.median(run["phases"]["total"] for run in runs)
+        phases = {
+            phase: statistics.median(run["phases"][phase] for run in runs)
+            for phase in runs[0]["phases"]
+        }
+        apps = {}
+        for label, timings in runs[0]["apps"].items():
+            apps[label] = {
+                key: statistics.median(
+                    run["apps"].get(label, {}).get(key, 0) for run in runs
+                )
+                for key in ("import_ms", "models_ms", "ready_ms")
+            }
+            apps[label]["name"] = timings["name"]
+        packages = defaultdict(list)
+        for run in runs:
+            self_times = defaultdict(int)
+            for module, (self_us, _) in run["imports"].items():
+                self_times[module.split(".")[0]] += self_us
+            for package, self_us in self_times.items():
+                packages[package].append(self_us / 1000)
+        slowest = sorted(
+            ((package, statistics.median(values))
+             for package, values in packages.items()),
+            key=lambda item: item[1], reverse=True
+        )[:options["top"]]
+        if options["json"]:
+            self.stdout.write(json.dumps({
+                "budget_ms": budget,
+                "total_ms": median,
+                "phases": phases,
+                "apps": apps,
+                "imports": dict(slowest),
+            }, indent=2))
+        else:
+            self.write_report(phases, apps, slowest)
+        message = f"Cold start {median:.0f} ms (budget {budget} ms, {len(runs)} runs)."
+        if median > budget:
+            raise CommandError(f"{message} Over budget.")
+        self.stdout.write(self.style.SUCCESS(message))
+
+    def write_report(self, phases, apps, slowest):
+        self.stdout.write("Phases (ms)")
+        for phase, duration in phases.items():
+            self.stdout.write(f"  {phase:<12} {duration:8.1f}")
+        self.stdout.write("\nApps (ms)        import   models    ready")
+        for label, timings in sorted(
+            apps.items(),
+            key=lambda item: -sum(
+                value for key, value in item[1].items() if key != "name"
+            )
+        ):
+            self.stdout.write(
+                f"  {label:<14} {timings['import_ms']:7.1f}  "
+                f"{timings['models_ms']:7.1f}  {timings['ready_ms']:7.1f}"
+            )
+        self.stdout.write("\nImport time per top level package (ms)")
+        for module, duration in slowest:
+            self.stdout.write(f"  {module:<30} {duration:8.1f}")
+        self.stdout.write("")
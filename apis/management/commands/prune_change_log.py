@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apis.changes import get_retention, prune_changes
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes change feed entries older than CHANGE_LOG_RETENTION_DAYS, "
+        "cursors from before that get a 410 and have to resync."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        deleted = prune_changes(
+            timezone.now() - get_retention(), options["chunk_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted} change log entries."
+        ))
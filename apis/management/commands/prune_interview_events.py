@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apis.streams import get_event_retention, prune_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes interview events older than STREAM_EVENT_RETENTION_DAYS, "
+        "streams resuming from before that miss them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        deleted = prune_events(
+            timezone.now() - get_event_retention(), options["chunk_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted} interview events."
+        ))
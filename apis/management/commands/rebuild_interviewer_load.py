@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from apis.models import EmployeeProfile, InterviewRound
+
+
+class Command(BaseCommand):
+    help = "Recomputes EmployeeProfile.open_rounds from the interview rounds."
+
+    def handle(self, *args, **options):
+        open_counts = dict(InterviewRound.objects.filter(
+            status__isnull=True,
+            interviewer__isnull=False
+        ).values("interviewer_id").annotate(
+            total=Count("id")
+        ).values_list("interviewer_id", "total"))
+        changed = []
+        for profile in EmployeeProfile.objects.only("id", "user_id", "open_rounds"):
+            expected = open_counts.get(profile.user_id, 0)
+            if profile.open_rounds != expected:
+                profile.open_rounds = expected
+                changed.append(profile)
+        EmployeeProfile.objects.bulk_update(
+            changed, ["open_rounds"], batch_size=500
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated {len(changed)} interviewer load counter(s)."
+        ))
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from apis.models import CandidateInfo
+from apis.selectors import (
+    EXPERIENCE_SUMMARY_FIELDS,
+    get_experience_summary_expressions,
+    refresh_experience_summaries
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the candidate experience summary columns that no longer "
+        "match their work experiences (or were never filled)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Only count the candidates that would be repaired"
+        )
+
+    def handle(self, *args, **options):
+        expressions = {
+            f"expected_{field}": expression
+            for field, expression in get_experience_summary_expressions().items()
+        }
+        last_id, repaired = 0, 0
+        while True:
+            rows = list(CandidateInfo.objects.filter(
+                id__gt=last_id
+            ).order_by("id").annotate(**expressions).values(
+                "id",
+                *EXPERIENCE_SUMMARY_FIELDS,
+                *expressions.keys()
+            )[:options["chunk_size"]])
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+            stale_ids = [
+                row["id"] for row in rows
+                if any(
+                    row[field] != row[f"expected_{field}"]
+                    for field in EXPERIENCE_SUMMARY_FIELDS
+                )
+            ]
+            if stale_ids and not options["dry_run"]:
+                refresh_experience_summaries(stale_ids)
+            repaired += len(stale_ids)
+        verb = "Would repair" if options["dry_run"] else "Repaired"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {repaired} candidate experience summaries."
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+from apis.archive import restore_interviews
+
+
+class Command(BaseCommand):
+    help = "Moves archived interviews back to the live tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("job_ids", nargs="+", metavar="job_id")
+
+    def handle(self, *args, **options):
+        restored = restore_interviews(options["job_ids"])
+        if not restored:
+            raise CommandError("No archived interview found.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Restored {restored} interview(s)."
+        ))
@@ -5,18 +5,28 @@ from django.core.validators import (
     FileExtensionValidator,
     RegexValidator
 )
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
 from .selectors import (
     get_first_interview_round,
     check_candidate_failed_any_round,
     create_interview_round,
     get_interview_round,
-    get_latest_interview_round
+    get_latest_interview_round,
+    adjust_interviewer_load,
+    allocate_sequence_values,
+    release_interviewer_load
 )
+from .dedupe import build_blocking_keys
+from .exceptions import ConcurrentUpdateError
+from .outbox import enqueue_interview_event
+from .streams import record_interview_event
 from .validators import validate_alphabets_only
 
 
 User = get_user_model()
+JOB_ID_SEQUENCE = "interview.job_id"
 
 
 class Employee(User):  # Using Django Auth Model only, just using proxy model only.
@@ -46,11 +56,28 @@ class EmployeeProfile(models.Model):
         max_length=14,
         choices=Role.choices
     )
+    skills = models.ManyToManyField(
+        to="Skill",
+        related_name="employee_profiles",
+        blank=True
+    )
+    open_rounds = models.PositiveIntegerField(
+        verbose_name="Open Interview Rounds",
+        default=0,
+        editable=False,
+        help_text="Rounds assigned to this employee that have no status yet"
+    )
 
     class Meta:
         verbose_name = "Employee Profile"
         verbose_name_plural = "Employee Profiles"
         db_table = "employee_profile"
+        indexes = [
+            models.Index(
+                fields=["role", "open_rounds"],
+                name="emp_profile_role_load_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.role}"
@@ -72,6 +99,23 @@ class Skill(models.Model):
         return f"{self.name}"
 
 
+class SkillAlias(models.Model):  # Matched by the skill autocomplete, apis/skills.py
+    alias = models.CharField(unique=True, max_length=80)
+    skill = models.ForeignKey(
+        to=Skill,
+        related_name="aliases",
+        on_delete=models.CASCADE
+    )
+
+    class Meta:
+        verbose_name = "Skill Alias"
+        verbose_name_plural = "Skill Aliases"
+        db_table = "skill_alias"
+
+    def __str__(self):
+        return f"{self.alias} - {self.skill}"
+
+
 class Gender(models.TextChoices):
     MALE = "Male"
     FEMALE = "Female"
@@ -79,16 +123,20 @@ class Gender(models.TextChoices):
 
 
 class CandidateInfo(models.Model):
-    email = models.EmailField(verbose_name="Email Address", max_length=120)
+    email = models.EmailField(
+        verbose_name="Email Address", max_length=120, db_index=True
+    )
     first_name = models.CharField(
         verbose_name="First Name",
         max_length=70,
-        validators=[validate_alphabets_only]
+        validators=[validate_alphabets_only],
+        db_index=True
     )
     last_name = models.CharField(
         verbose_name="Last Name",
         max_length=50,
-        validators=[validate_alphabets_only]
+        validators=[validate_alphabets_only],
+        db_index=True
     )
     gender = models.CharField(
         verbose_name="Gender", choices=Gender.choices, max_length=6
@@ -101,7 +149,8 @@ class CandidateInfo(models.Model):
         validators=[phone_regex],
         max_length=13,
         null=True,
-        blank=False
+        blank=False,
+        db_index=True
     )
     skills = models.ManyToManyField(to=Skill)
     resume = models.FileField(
@@ -111,6 +160,30 @@ class CandidateInfo(models.Model):
             )
         ]
     )
+    # Summary of the work experiences for filtering and ranking, kept in
+    # sync by selectors.refresh_experience_summaries
+    experience_years = models.PositiveIntegerField(
+        default=0, editable=False, db_index=True,
+        help_text="Sum of the work experiences in years"
+    )
+    latest_designation = models.CharField(
+        max_length=50, null=True, blank=True, editable=False, db_index=True,
+        help_text="Designation of the last added work experience"
+    )
+    experience_count = models.PositiveSmallIntegerField(
+        default=0, editable=False
+    )
+    # Blocking keys used by duplicate detection, see apis/dedupe.py
+    phone_key = models.CharField(
+        max_length=16, null=True, blank=True, editable=False, db_index=True
+    )
+    email_key = models.CharField(
+        max_length=120, null=True, blank=True, editable=False, db_index=True
+    )
+    name_key = models.CharField(
+        max_length=8, null=True, blank=True, editable=False, db_index=True
+    )
+    modified_at = models.DateTimeField(auto_now=True, null=True, db_index=True)
 
     class Meta:
         verbose_name = "Candidate Information"
@@ -120,6 +193,17 @@ class CandidateInfo(models.Model):
     def __str__(self):
         return f"{self.first_name} - {self.email}"
 
+    def refresh_blocking_keys(self):
+        keys = build_blocking_keys(
+            self.email, self.first_name, self.last_name, self.mobile_no
+        )
+        for field, value in keys.items():
+            setattr(self, field, value)
+
+    def save(self, *args, **kwargs):
+        self.refresh_blocking_keys()
+        super().save(*args, **kwargs)
+
 
 class WorkExperience(models.Model):
     candidate = models.ForeignKey(
@@ -150,17 +234,50 @@ class WorkExperience(models.Model):
         return f"{self.candidate}"
 
 
+class VersionedModel(models.Model):
+    """
+    Optimistic concurrency control: save() of an existing row runs
+    `UPDATE ... SET version = version + 1 WHERE id = ? AND version = ?`
+    and raises ConcurrentUpdateError when the row was changed since it
+    was read. Queryset updates must bump `version` themselves.
+    """
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields,
+                   forced_update):
+        version_field = self._meta.get_field("version")
+        values = [value for value in values if value[0] is not version_field]
+        values.append((version_field, None, self.version + 1))
+        updated = super()._do_update(
+            base_qs.filter(version=self.version), using, pk_val, values,
+            update_fields, forced_update
+        )
+        if updated:
+            self.version += 1
+            return True
+        if base_qs.filter(pk=pk_val).exists():
+            raise ConcurrentUpdateError(
+                f"{self._meta.object_name} {pk_val} was changed "
+                f"after version {self.version} was read."
+            )
+        return False
+
+
 class InterviewStatus(models.TextChoices):
     SELECT = "SELECT"
     REJECT = "REJECT"
 
 
-class Interview(models.Model):  # Sort of Interview history of candidate
+class Interview(VersionedModel):  # Sort of Interview history of candidate
     job_id = models.CharField(
         max_length=200,
         editable=False,
         null=True,
-        blank=False
+        blank=False,
+        db_index=True
     )
     employee = models.ForeignKey(
         to=Employee,
@@ -179,11 +296,31 @@ class Interview(models.Model):  # Sort of Interview history of candidate
         null=True,
         blank=True
     )
+    created_at = models.DateTimeField(
+        default=timezone.now, editable=False, db_index=True
+    )
+    closed_at = models.DateTimeField(
+        null=True, blank=True, editable=False, db_index=True,
+        help_text="When the interview got its SELECT/REJECT status"
+    )
 
     class Meta:
         verbose_name = "Interview"
         verbose_name_plural = "Interviews"
         db_table = "interview"
+        # one index per filter/ordering shape of the interview list,
+        # see apis/filters.py
+        indexes = [
+            models.Index(fields=["status", "id"], name="interview_status_idx"),
+            models.Index(
+                fields=["employee", "status", "id"],
+                name="interview_hr_status_idx"
+            ),
+            models.Index(
+                fields=["overall_rating", "id"],
+                name="interview_rating_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.job_id}"
@@ -259,11 +396,20 @@ class Interview(models.Model):  # Sort of Interview history of candidate
                        "candidate is already marked SELECT.")
         if err:
             return False, err
-        self.status = InterviewStatus.REJECT.value
-        self.save()
-        InterviewRound.objects.filter(
-            interview=self, status__isnull=True
-        ).update(status=InterviewRoundStatus.FAIL.value, remarks=remarks)
+        with transaction.atomic():
+            self.status = InterviewStatus.REJECT.value
+            self.save()
+            pending_rounds = InterviewRound.objects.filter(
+                interview=self, status__isnull=True
+            )
+            release_interviewer_load(pending_rounds)
+            pending_rounds.update(
+                status=InterviewRoundStatus.FAIL.value,
+                remarks=remarks,
+                version=F("version") + 1
+            )
+            enqueue_interview_event("interview.rejected", self, remarks)
+            record_interview_event("interview.rejected", self)
         return True, []
 
     def action_select(self, remarks=None):
@@ -289,13 +435,16 @@ class Interview(models.Model):  # Sort of Interview history of candidate
                        " cannot proceed selection")
         if err:
             return False, err
-        last_round.status = InterviewRoundStatus.PASS.value
-        last_round.remarks = remarks
-        last_round.save()
-        if self.status == InterviewStatus.SELECT.value:
-            return True, []
-        self.status = InterviewStatus.SELECT.value
-        self.save()
+        with transaction.atomic():
+            last_round.status = InterviewRoundStatus.PASS.value
+            last_round.remarks = remarks
+            last_round.save()
+            if self.status == InterviewStatus.SELECT.value:
+                return True, []
+            self.status = InterviewStatus.SELECT.value
+            self.save()
+            enqueue_interview_event("interview.selected", self, remarks)
+            record_interview_event("interview.selected", self)
         return True, []
 
     def action_recommend(self, remarks=None):
@@ -322,10 +471,17 @@ class Interview(models.Model):  # Sort of Interview history of candidate
 
     # endregion
 
+    @staticmethod
+    def build_job_id(number):
+        date_time = datetime.now().strftime("%d-%m-%Y")
+        return f"INT{date_time}-{number}"
+
     def generate_job_id(self):
+        # the pk doesn't exist yet on the first save, job ids take their
+        # number from a sequence instead (bulk creates reserve a block)
         if not self.job_id:
-            date_time = datetime.now().strftime("%d-%m-%Y")
-            self.job_id = f"INT{date_time}-{self.pk}"
+            number, = allocate_sequence_values(JOB_ID_SEQUENCE)
+            self.job_id = self.build_job_id(number)
 
     def calculate_overall_rating(self):
         if self.status == InterviewStatus.SELECT.value:
@@ -340,9 +496,16 @@ class Interview(models.Model):  # Sort of Interview history of candidate
                 overall_rating = round(sum(ratings)) / len(ratings)
                 self.overall_rating = overall_rating
 
+    def update_closed_at(self):
+        if not self.status:
+            self.closed_at = None
+        elif not self.closed_at:
+            self.closed_at = timezone.now()
+
     def save(self, *args, **kwargs):
         self.generate_job_id()
         self.calculate_overall_rating()
+        self.update_closed_at()
         super().save(*args, **kwargs)
 
 
@@ -352,7 +515,7 @@ class InterviewRoundStatus(models.TextChoices):
     RECOMMEND = "RECOMMEND"
 
 
-class InterviewRound(models.Model):
+class InterviewRound(VersionedModel):
     interview = models.ForeignKey(
         related_name="interview_round",
         to=Interview,
@@ -388,11 +551,276 @@ class InterviewRound(models.Model):
         null=True
     )
     is_final_round = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         verbose_name = "Interview Round"
         verbose_name_plural = "Interview Rounds"
         db_table = "interview_round"
+        indexes = [
+            models.Index(
+                fields=["interview", "round_no", "status"],
+                name="round_interview_no_idx"
+            ),
+            models.Index(
+                fields=["interviewer", "date"],
+                name="round_interviewer_date_idx"
+            ),
+            models.Index(fields=["date"], name="round_date_idx"),
+            models.Index(
+                fields=["round_no", "status"],
+                name="round_no_status_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.interview} - Round {self.round_no}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_open_interviewer_id = instance.open_interviewer_id
+        instance._loaded_rating = instance.rating
+        return instance
+
+    @property
+    def open_interviewer_id(self):
+        """Interviewer this round counts against while it has no status."""
+        if self.status is None and self.interviewer_id:
+            return self.interviewer_id
+        return None
+
+    def save(self, *args, **kwargs):
+        previous = getattr(self, "_loaded_open_interviewer_id", None)
+        current = self.open_interviewer_id
+        rated = self.rating != getattr(self, "_loaded_rating", self.rating)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if previous != current:
+                adjust_interviewer_load(previous, -1)
+                adjust_interviewer_load(current, 1)
+            if rated:
+                record_interview_event("round.rated", self.interview, self)
+        self._loaded_open_interviewer_id = current
+        self._loaded_rating = self.rating
+
+
+class IdSequence(models.Model):  # See selectors.allocate_sequence_values
+    name = models.CharField(max_length=60, primary_key=True)
+    next_value = models.PositiveBigIntegerField(default=1)
+
+    class Meta:
+        verbose_name = "Id Sequence"
+        verbose_name_plural = "Id Sequences"
+        db_table = "id_sequence"
+
+    def __str__(self):
+        return f"{self.name} - {self.next_value}"
+
+
+class ArchivedInterview(models.Model):  # Written by apis/archive.py
+    id = models.IntegerField(primary_key=True)  # id it had in `interview`
+    job_id = models.CharField(max_length=200, null=True, db_index=True)
+    employee = models.ForeignKey(
+        to=Employee,
+        related_name="archived_interviews",
+        on_delete=models.CASCADE
+    )
+    candidate = models.ForeignKey(
+        CandidateInfo,
+        related_name="archived_interviews",
+        on_delete=models.CASCADE,
+    )
+    overall_rating = models.PositiveSmallIntegerField(null=True, blank=True)
+    status = models.CharField(
+        max_length=6,
+        choices=InterviewStatus.choices,
+        null=True,
+        blank=True
+    )
+    created_at = models.DateTimeField()
+    closed_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        verbose_name = "Archived Interview"
+        verbose_name_plural = "Archived Interviews"
+        db_table = "archived_interview"
+
+    def __str__(self):
+        return f"{self.job_id}"
+
+
+class ArchivedInterviewRound(models.Model):  # Written by apis/archive.py
+    id = models.IntegerField(primary_key=True)  # id it had in `interview_round`
+    interview = models.ForeignKey(
+        related_name="interview_round",
+        to=ArchivedInterview,
+        on_delete=models.CASCADE
+    )
+    round_no = models.PositiveSmallIntegerField(null=True, blank=True)
+    interviewer = models.ForeignKey(
+        to=Employee,
+        related_name="archived_interview_rounds",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True
+    )
+    status = models.CharField(
+        max_length=9,
+        choices=InterviewRoundStatus.choices,
+        null=True,
+        blank=True
+    )
+    remarks = models.TextField(null=True, blank=True)
+    skills = models.ManyToManyField(
+        to=Skill, related_name="archived_interview_rounds", blank=True
+    )
+    rating = models.PositiveSmallIntegerField(default=0)
+    date = models.DateField(blank=True, null=True)
+    is_final_round = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        verbose_name = "Archived Interview Round"
+        verbose_name_plural = "Archived Interview Rounds"
+        db_table = "archived_interview_round"
 
     def __str__(self):
         return f"{self.interview} - Round {self.round_no}"
+
+
+class AuditLog(models.Model):  # Append only, written through apis/audit.py
+    actor = models.ForeignKey(
+        to=Employee,
+        related_name="audit_logs",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+    actor_username = models.CharField(max_length=150, blank=True, default="")
+    action = models.CharField(max_length=40)
+    job_id = models.CharField(max_length=200, null=True, blank=True)
+    round_no = models.PositiveSmallIntegerField(null=True, blank=True)
+    changes = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        verbose_name = "Audit Log"
+        verbose_name_plural = "Audit Logs"
+        db_table = "audit_log"
+        indexes = [
+            models.Index(fields=["job_id", "-id"], name="audit_log_job_idx"),
+            models.Index(
+                fields=["actor_username", "-id"], name="audit_log_actor_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.actor_username} - {self.action} - {self.job_id}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Audit log entries can't be changed.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Audit log entries can't be deleted.")
+
+
+class OutboxStatus(models.TextChoices):
+    PENDING = "PENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+
+class OutboxEvent(models.Model):  # Drained by the dispatch_outbox command
+    event_type = models.CharField(max_length=60)
+    idempotency_key = models.CharField(max_length=255, unique=True)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=7,
+        choices=OutboxStatus.choices,
+        default=OutboxStatus.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Outbox Event"
+        verbose_name_plural = "Outbox Events"
+        db_table = "outbox_event"
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="outbox_event_due_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} - {self.idempotency_key}"
+
+
+class RevokedToken(models.Model):  # See apis/authentication.py
+    session_id = models.CharField(max_length=32, unique=True)
+    expires_at = models.DateTimeField(
+        db_index=True,
+        help_text="Tokens of the session are expired anyway after this"
+    )
+    revoked_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        verbose_name = "Revoked Token"
+        verbose_name_plural = "Revoked Tokens"
+        db_table = "revoked_token"
+
+    def __str__(self):
+        return f"{self.session_id}"
+
+
+class ChangeResource(models.TextChoices):
+    INTERVIEW = "interview"
+    CANDIDATE = "candidate"
+
+
+class ChangeLogEntry(models.Model):  # Written through apis/changes.py
+    # the id is the change sequence the feed is ordered and paged by
+    id = models.BigAutoField(primary_key=True)
+    resource = models.CharField(max_length=10, choices=ChangeResource.choices)
+    object_id = models.PositiveIntegerField()
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name = "Change Log Entry"
+        verbose_name_plural = "Change Log Entries"
+        db_table = "change_log"
+
+    def __str__(self):
+        return f"{self.id} - {self.resource} {self.object_id}"
+
+
+class InterviewEvent(models.Model):  # Written and streamed by apis/streams.py
+    # the id is the SSE event id clients resume from (Last-Event-ID)
+    id = models.BigAutoField(primary_key=True)
+    event_type = models.CharField(max_length=40)
+    interview_id = models.PositiveIntegerField()
+    job_id = models.CharField(max_length=200)
+    employee_id = models.PositiveIntegerField(
+        null=True, blank=True, help_text="HR of the interview"
+    )
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name = "Interview Event"
+        verbose_name_plural = "Interview Events"
+        db_table = "interview_event"
+
+    def __str__(self):
+        return f"{self.id} - {self.event_type} {self.job_id}"
@@ -0,0 +1,175 @@
+import json
+import math
+import random
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.db import connection, transaction
+from django.utils import timezone
+from apis import models
+
+# HTTP statuses worth retrying, any other 4xx is a permanent failure.
+RETRYABLE_STATUSES = {408, 425, 429}
+
+# Added to the longest a batch can take for the default lease, covers
+# the claim and the final bulk_update.
+LEASE_MARGIN_SECONDS = 30
+
+
+def enqueue_event(event_type, idempotency_key, payload):
+    """
+    Writes an outbox event, call it inside the transaction changing
+    the state so the event exists if and only if the change commits.
+    """
+    event, _ = models.OutboxEvent.objects.get_or_create(
+        idempotency_key=idempotency_key,
+        defaults={"event_type": event_type, "payload": payload}
+    )
+    return event
+
+
+def enqueue_interview_event(event_type, interview, remarks=None):
+    """
+    Call it after saving the change, the interview version in the key
+    keeps a later change of the same type (e.g. rejected again once
+    reopened) from being taken for a retry of this one.
+    """
+    return enqueue_event(
+        event_type,
+        f"{event_type}:{interview.pk}:{interview.version}",
+        {
+            "job_id": interview.job_id,
+            "status": interview.status,
+            "overall_rating": interview.overall_rating,
+            "employee_id": interview.employee_id,
+            "candidate_id": interview.candidate_id,
+            "candidate_email": interview.candidate.email,
+            "remarks": remarks,
+        }
+    )
+
+
+def enqueue_round_created_event(interview_round):
+    return enqueue_event(
+        "round.created",
+        f"round.created:{interview_round.pk}",
+        {
+            "job_id": interview_round.interview.job_id,
+            "round_no": interview_round.round_no,
+            "candidate_id": interview_round.interview.candidate_id,
+        }
+    )
+
+
+class OutboxDispatcher:
+    """
+    Drains due outbox events in batches: claims a batch by pushing its
+    next_attempt_at forward by `lease` seconds, POSTs the events
+    concurrently with an Idempotency-Key header and reschedules the
+    failed ones with exponential backoff.
+
+    A batch is sent in ceil(batch_size / concurrency) waves of requests
+    of up to `timeout` seconds each. The lease must outlast that, or
+    another dispatcher claims the events again while they are still
+    being sent. It defaults to the batch duration plus
+    LEASE_MARGIN_SECONDS, a shorter one raises ValueError.
+    """
+
+    def __init__(self, url, batch_size=100, concurrency=8, max_attempts=8,
+                 timeout=10, lease=None, retry_base=5, retry_max=3600):
+        self.url = url
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        batch_seconds = self.max_batch_seconds()
+        if lease is None:
+            lease = batch_seconds + LEASE_MARGIN_SECONDS
+        elif lease < batch_seconds:
+            raise ValueError(
+                f"A lease of {lease}s is shorter than a batch can take: "
+                f"{batch_seconds}s for {batch_size} events, {concurrency} "
+                f"at a time with a {timeout}s timeout."
+            )
+        self.lease = lease
+
+    def max_batch_seconds(self):
+        return self.timeout * math.ceil(self.batch_size / self.concurrency)
+
+    def claim_batch(self):
+        now = timezone.now()
+        with transaction.atomic():
+            due = models.OutboxEvent.objects.filter(
+                status=models.OutboxStatus.PENDING,
+                next_attempt_at__lte=now
+            ).order_by("next_attempt_at", "id")
+            if connection.features.has_select_for_update_skip_locked:
+                due = due.select_for_update(skip_locked=True)
+            events = list(due[:self.batch_size])
+            models.OutboxEvent.objects.filter(
+                pk__in=[event.pk for event in events]
+            ).update(next_attempt_at=now + timedelta(seconds=self.lease))
+        return events
+
+    def send(self, event):
+        """Returns (delivered, retryable, error)."""
+        body = json.dumps({
+            "id": event.pk,
+            "type": event.event_type,
+            "idempotency_key": event.idempotency_key,
+            "created_at": event.created_at.isoformat(),
+            "payload": event.payload,
+        }).encode("utf-8")
+        request = urllib.request.Request(
+            self.url,
+            data=body,
+            method="POST",
+            headers={
+                "Content-Type": "application/json",
+                "Idempotency-Key": event.idempotency_key,
+            }
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                return True, False, None
+        except urllib.error.HTTPError as e:
+            retryable = e.code >= 500 or e.code in RETRYABLE_STATUSES
+            return False, retryable, f"HTTP {e.code}: {e.reason}"
+        except (urllib.error.URLError, OSError) as e:
+            return False, True, str(e)
+
+    def backoff(self, attempts):
+        delay = min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+        return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+    def dispatch_batch(self):
+        """Dispatches one batch, returns (claimed, sent, failed) counts."""
+        events = self.claim_batch()
+        if not events:
+            return 0, 0, 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = list(executor.map(self.send, events))
+        now = timezone.now()
+        sent = failed = 0
+        for event, (delivered, retryable, error) in zip(events, results):
+            event.attempts += 1
+            if delivered:
+                event.status = models.OutboxStatus.SENT
+                event.sent_at = now
+                event.last_error = None
+                sent += 1
+                continue
+            event.last_error = error
+            if not retryable or event.attempts >= self.max_attempts:
+                event.status = models.OutboxStatus.FAILED
+                failed += 1
+            else:
+                event.next_attempt_at = now + self.backoff(event.attempts)
+        models.OutboxEvent.objects.bulk_update(
+            events,
+            ["status", "attempts", "sent_at", "last_error", "next_attempt_at"]
+        )
+        return len(events), sent, failed
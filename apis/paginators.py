@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+from apis.selectors import estimate_row_count
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator using the table statistics instead of COUNT(*) for
+    unfiltered querysets over tables bigger than
+    ESTIMATED_COUNT_THRESHOLD rows, filtered ones are counted exactly.
+    """
+    is_approximate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.where:
+            estimate = estimate_row_count(queryset.model, using=queryset.db)
+            threshold = getattr(settings, "ESTIMATED_COUNT_THRESHOLD", 100000)
+            if estimate is not None and estimate >= threshold:
+                self.is_approximate = True
+                return estimate
+        return super().count
+
+
+class ApproximateCountPaginator(EstimatedCountPaginator):
+    """
+    Also caps the count of filtered querysets at APPROXIMATE_COUNT_CAP
+    rows, `is_approximate` tells whether the count is exact.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet) or not queryset.query.where:
+            return super().count
+        cap = getattr(settings, "APPROXIMATE_COUNT_CAP", 10000)
+        count = queryset.order_by()[:cap + 1].count()
+        self.is_approximate = count > cap
+        return min(count, cap)
+
+
+class ApproximateCountPagination(PageNumberPagination):
+    """
+    Page number pagination where ?approx_count=true swaps the exact
+    COUNT(*) for table statistics or a capped count. Opt-in: requests
+    without ?page=, ?page_size= or ?approx_count= get the plain list
+    existing clients expect.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not any(
+            param in request.query_params for param in (
+                self.page_query_param,
+                self.page_size_query_param,
+                'approx_count'
+            )
+        ):
+            return None
+        approx_count = request.query_params.get('approx_count', '')
+        self.approximate = approx_count.lower() in ('1', 'true')
+        if self.approximate:
+            self.django_paginator_class = ApproximateCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.approximate:
+            response.data['count_is_approximate'] = (
+                self.page.paginator.is_approximate
+            )
+        return response
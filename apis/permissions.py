@@ -1,4 +1,5 @@
 from rest_framework.permissions import BasePermission
+from .authentication import get_employee_role
 from .models import Role
 
 
@@ -17,8 +18,7 @@ class IsHrEmployee(BasePermission):
         user = request.user
         if not user.is_authenticated:
             return False
-        emp = user.emp_profile.first()
-        if emp and emp.role == Role.HR.value:
+        if get_employee_role(user) == Role.HR.value:
             return True
         return False
 
@@ -31,7 +31,6 @@ class IsAdminOrHrEmployee(BasePermission):
             return False
         if user.is_superuser:
             return True
-        emp = user.emp_profile.first()
-        if emp and emp.role == Role.HR.value:
+        if get_employee_role(user) == Role.HR.value:
             return True
         return False
@@ -0,0 +1,167 @@
+import cProfile
+import pstats
+import time
+import traceback
+import uuid
+from collections import deque
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from apis.authentication import SignedTokenAuthentication
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+PROFILE_PARAM = "_profile"
+
+# last profiled requests of this process, newest last
+profiles = deque(maxlen=getattr(settings, "REQUEST_PROFILER_BUFFER_SIZE", 50))
+
+
+def get_profile(profile_id):
+    for entry in profiles:
+        if entry["id"] == profile_id:
+            return entry
+    return None
+
+
+def get_stack_origin(limit=5):
+    """Innermost project frames (no third party code) of the current stack."""
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()[:-2]
+        if frame.filename.startswith(base_dir)
+        and "site-packages" not in frame.filename
+        and frame.filename != __file__
+    ]
+    return [
+        f"{frame.filename[len(base_dir) + 1:]}:{frame.lineno} in {frame.name}"
+        for frame in frames[-limit:]
+    ]
+
+
+class QueryRecorder:
+    """connection.execute_wrapper recording every statement with its timing."""
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                "database": self.alias,
+                "sql": sql,
+                "many": many,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                "origin": get_stack_origin(),
+            })
+
+
+def get_top_functions(profiler, limit):
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+    return [
+        {
+            "function": f"{filename}:{line}({name})",
+            "calls": calls,
+            "primitive_calls": primitive_calls,
+            "own_ms": round(own_time * 1000, 3),
+            "cumulative_ms": round(cumulative_time * 1000, 3),
+        }
+        for (filename, line, name), (
+            primitive_calls, calls, own_time, cumulative_time, _
+        ) in rows[:limit]
+    ]
+
+
+def is_profiler_allowed(request):
+    """
+    Only superusers can profile a request. The API authenticates inside
+    the view, so a Bearer token is read here too: its claims carry
+    `su`, checking them needs no query and no password hashing.
+    """
+    if request.user.is_superuser:
+        return True
+    try:
+        result = SignedTokenAuthentication().authenticate(Request(request))
+    except AuthenticationFailed:
+        return False
+    return result is not None and result[0].is_superuser
+
+
+class ProfilerMiddleware:
+    """
+    Runs the request under cProfile and records its SQL statements when a
+    superuser asks for it with the X-Profile header or ?_profile=1. The
+    result is kept in `profiles` and its id returned in X-Profile-Id.
+    Other requests only pay for the header / query string lookup.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_PROFILER_ENABLED", False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.top_functions = getattr(settings, "REQUEST_PROFILER_TOP_FUNCTIONS", 40)
+        self.top_queries = getattr(settings, "REQUEST_PROFILER_TOP_QUERIES", 20)
+
+    def __call__(self, request):
+        if not self.is_requested(request) or not is_profiler_allowed(request):
+            return self.get_response(request)
+        return self.profile(request)
+
+    @staticmethod
+    def is_requested(request):
+        if request.META.get(PROFILE_HEADER):
+            return True
+        return (
+            PROFILE_PARAM in request.META.get("QUERY_STRING", "")
+            and bool(request.GET.get(PROFILE_PARAM))
+        )
+
+    def profile(self, request):
+        recorders = [QueryRecorder(connection.alias) for connection in connections.all()]
+        profiler = cProfile.Profile()
+        started_at = timezone.now()
+        with ExitStack() as stack:
+            for connection, recorder in zip(connections.all(), recorders):
+                stack.enter_context(connection.execute_wrapper(recorder))
+            start = time.perf_counter()
+            try:
+                profiler.enable()
+            except ValueError:
+                # another profiler is already running in this interpreter
+                profiler = None
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                duration = time.perf_counter() - start
+        queries = [query for recorder in recorders for query in recorder.queries]
+        entry = {
+            "id": uuid.uuid4().hex,
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status_code": response.status_code,
+            "user": request.user.get_username(),
+            "started_at": started_at.isoformat(),
+            "duration_ms": round(duration * 1000, 3),
+            "query_count": len(queries),
+            "query_ms": round(sum(query["duration_ms"] for query in queries), 3),
+            "queries": sorted(
+                queries, key=lambda query: query["duration_ms"], reverse=True
+            )[:self.top_queries],
+            "functions": (
+                get_top_functions(profiler, self.top_functions)
+                if profiler is not None else []
+            ),
+        }
+        profiles.append(entry)
+        response["X-Profile-Id"] = entry["id"]
+        return response
@@ -0,0 +1,236 @@
+import copy
+import threading
+import time
+from datetime import timedelta
+import numpy as np
+from django.conf import settings
+from django.db.models import Max
+from apis import models
+
+# Rows saved while a refresh is reading can commit with an older
+# modified_at, re-reading a small window makes sure they are not missed.
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+class CandidateSkillMatrix:
+    """
+    Candidate x skill matrix kept in memory as NumPy arrays.
+
+    Candidates are rows (`candidate_ids` sorted, `experience` per row) and
+    skills are stored column wise: the rows having skill `s` are
+    `entry_rows[skill_indptr[s]:skill_indptr[s + 1]]`, so scoring a profile
+    only touches the entries of the requested skills.
+    """
+
+    def __init__(self):
+        self.candidate_ids = np.empty(0, dtype=np.int64)
+        self.experience = np.empty(0, dtype=np.float32)
+        self.entry_candidates = np.empty(0, dtype=np.int64)
+        self.entry_skills = np.empty(0, dtype=np.int32)
+        self.entry_rows = np.empty(0, dtype=np.int64)
+        self.skill_indptr = np.zeros(1, dtype=np.int64)
+        self.watermark = None
+        self.loaded_at = None
+        self.refreshed_at = None
+
+    def __len__(self):
+        return len(self.candidate_ids)
+
+    @staticmethod
+    def fetch_candidates(candidates):
+        rows = list(candidates.order_by("id").values_list(
+            "id", "experience_years"
+        ))
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        experience = np.fromiter(
+            (row[1] for row in rows), dtype=np.float32, count=len(rows)
+        )
+        return ids, experience
+
+    @staticmethod
+    def fetch_entries(candidate_ids=None):
+        through = models.CandidateInfo.skills.through.objects.all()
+        if candidate_ids is not None:
+            through = through.filter(candidateinfo_id__in=candidate_ids.tolist())
+        entries = np.array(
+            list(through.values_list("candidateinfo_id", "skill_id")),
+            dtype=np.int64
+        ).reshape(-1, 2)
+        return entries[:, 0], entries[:, 1].astype(np.int32)
+
+    def load(self):
+        started = time.monotonic()
+        watermark = models.CandidateInfo.objects.aggregate(
+            latest=Max("modified_at")
+        )["latest"]
+        self.candidate_ids, self.experience = self.fetch_candidates(
+            models.CandidateInfo.objects.all()
+        )
+        self.entry_candidates, self.entry_skills = self.fetch_entries()
+        self.build_skill_index()
+        self.watermark = watermark
+        self.loaded_at = self.refreshed_at = started
+
+    def refresh(self):
+        """Applies the candidates saved since the last load or refresh."""
+        started = time.monotonic()
+        changed = models.CandidateInfo.objects.all()
+        if self.watermark:
+            changed = changed.filter(
+                modified_at__gte=self.watermark - REFRESH_OVERLAP
+            )
+        watermark = changed.aggregate(latest=Max("modified_at"))["latest"]
+        changed_ids, changed_experience = self.fetch_candidates(changed)
+        if len(changed_ids):
+            positions = np.searchsorted(self.candidate_ids, changed_ids)
+            positions = np.minimum(positions, max(len(self.candidate_ids) - 1, 0))
+            known = (
+                self.candidate_ids[positions] == changed_ids
+                if len(self.candidate_ids) else
+                np.zeros(len(changed_ids), dtype=bool)
+            )
+            # a copy, readers of the matrix this one was copied from
+            # keep seeing the arrays as they were
+            self.experience = self.experience.copy()
+            self.experience[positions[known]] = changed_experience[known]
+            if not known.all():
+                candidate_ids = np.concatenate(
+                    [self.candidate_ids, changed_ids[~known]]
+                )
+                experience = np.concatenate(
+                    [self.experience, changed_experience[~known]]
+                )
+                order = np.argsort(candidate_ids, kind="stable")
+                self.candidate_ids = candidate_ids[order]
+                self.experience = experience[order]
+            kept = ~np.isin(self.entry_candidates, changed_ids)
+            new_candidates, new_skills = self.fetch_entries(changed_ids)
+            self.entry_candidates = np.concatenate(
+                [self.entry_candidates[kept], new_candidates]
+            )
+            self.entry_skills = np.concatenate(
+                [self.entry_skills[kept], new_skills]
+            )
+            self.build_skill_index()
+        if watermark:
+            self.watermark = watermark
+        self.refreshed_at = started
+
+    def refreshed(self):
+        """Copy of the matrix with `refresh()` applied, self is left as is."""
+        matrix = copy.copy(self)
+        matrix.refresh()
+        return matrix
+
+    def build_skill_index(self):
+        # entries are read after the candidates, those of a candidate
+        # created in between wait for the refresh that loads it
+        rows = np.searchsorted(self.candidate_ids, self.entry_candidates)
+        loaded = rows < len(self.candidate_ids)
+        loaded[loaded] = (
+            self.candidate_ids[rows[loaded]] == self.entry_candidates[loaded]
+        )
+        self.entry_candidates = self.entry_candidates[loaded]
+        self.entry_skills = self.entry_skills[loaded]
+        order = np.lexsort((self.entry_candidates, self.entry_skills))
+        self.entry_candidates = self.entry_candidates[order]
+        self.entry_skills = self.entry_skills[order]
+        self.entry_rows = np.searchsorted(
+            self.candidate_ids, self.entry_candidates
+        )
+        max_skill_id = int(self.entry_skills.max()) if len(self.entry_skills) else 0
+        counts = np.bincount(self.entry_skills, minlength=max_skill_id + 1)
+        self.skill_indptr = np.concatenate([[0], np.cumsum(counts)])
+
+    def skill_rows(self, skill_id):
+        if skill_id + 1 >= len(self.skill_indptr):
+            return self.entry_rows[:0]
+        start, end = self.skill_indptr[skill_id], self.skill_indptr[skill_id + 1]
+        return self.entry_rows[start:end]
+
+    def score(self, skill_weights, experience_weight=1.0,
+              require_skill_match=True):
+        """
+        Returns the score of every row for {skill_id: weight}:
+        sum of the weights of the matched skills plus
+        experience_weight * total years of experience.
+        """
+        skill_score = np.zeros(len(self), dtype=np.float32)
+        for skill_id, weight in skill_weights.items():
+            skill_score[self.skill_rows(skill_id)] += weight
+        scores = skill_score + np.float32(experience_weight) * self.experience
+        if require_skill_match:
+            scores[skill_score <= 0] = -np.inf
+        return scores
+
+    def top_k(self, skill_weights, k=50, experience_weight=1.0,
+              require_skill_match=True):
+        """Returns [(candidate_id, score)] of the k best rows, best first."""
+        scores = self.score(skill_weights, experience_weight, require_skill_match)
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        best = best[np.isfinite(scores[best])]
+        return [
+            (int(self.candidate_ids[row]), float(scores[row])) for row in best
+        ]
+
+
+_matrix = CandidateSkillMatrix()
+_matrix_lock = threading.Lock()
+# held by the one thread loading or refreshing the matrix
+_build_lock = threading.Lock()
+
+
+def get_candidate_matrix():
+    """
+    Process wide matrix, fully reloaded every RANKING_FULL_REFRESH_SECONDS
+    (picks up deleted candidates) and incrementally refreshed at most
+    every RANKING_REFRESH_SECONDS in between.
+
+    The new matrix is built aside and swapped in under `_matrix_lock`,
+    like the skill trie: while one thread reads the database the others
+    keep ranking with the current matrix, only the first load is waited
+    for.
+    """
+    global _matrix
+    full_refresh = getattr(settings, "RANKING_FULL_REFRESH_SECONDS", 3600)
+    refresh = getattr(settings, "RANKING_REFRESH_SECONDS", 30)
+
+    def due(matrix):
+        now = time.monotonic()
+        if matrix.loaded_at is None or now - matrix.loaded_at >= full_refresh:
+            return "load"
+        if now - matrix.refreshed_at >= refresh:
+            return "refresh"
+        return None
+
+    with _matrix_lock:
+        matrix = _matrix
+    if not due(matrix):
+        return matrix
+    if not _build_lock.acquire(blocking=matrix.loaded_at is None):
+        return matrix
+    try:
+        # swapped in by another thread while this one waited
+        with _matrix_lock:
+            matrix = _matrix
+        action = due(matrix)
+        if action == "load":
+            matrix = CandidateSkillMatrix()
+            matrix.load()
+        elif action == "refresh":
+            matrix = matrix.refreshed()
+        with _matrix_lock:
+            _matrix = matrix
+    finally:
+        _build_lock.release()
+    return matrix
+
+
+def rank_candidates(skill_weights, limit=50, experience_weight=1.0):
+    return get_candidate_matrix().top_k(
+        skill_weights, k=limit, experience_weight=experience_weight
+    )
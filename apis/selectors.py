@@ -1,4 +1,21 @@
+from django.db import connections, transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    IntegerField,
+    Max,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+    When
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
 from apis import models
+from apis.outbox import enqueue_round_created_event
+from apis.streams import record_interview_event
 
 
 def get_interview_round(interview, round_no):
@@ -20,9 +37,12 @@ def check_candidate_failed_any_round(interview):
 
 
 def create_interview_round(round_no, interview):
-    models.InterviewRound.objects.create(
-        round_no=round_no, interview=interview
-    )
+    with transaction.atomic():
+        interview_round = models.InterviewRound.objects.create(
+            round_no=round_no, interview=interview
+        )
+        enqueue_round_created_event(interview_round)
+        record_interview_event("round.created", interview, interview_round)
 
 
 def get_latest_interview_round(interview):
@@ -30,3 +50,140 @@ def get_latest_interview_round(interview):
         interview=interview
     ).order_by("-round_no").first()
 
+
+def apply_interviewer_load_deltas(deltas):
+    """
+    Applies {interviewer_id: delta} to EmployeeProfile.open_rounds
+    in a single UPDATE, never letting a counter drop below zero.
+    """
+    deltas = {
+        user_id: delta for user_id, delta in deltas.items()
+        if user_id and delta
+    }
+    if not deltas:
+        return
+    delta_case = Case(
+        *[When(user_id=user_id, then=Value(delta))
+          for user_id, delta in deltas.items()],
+        default=Value(0),
+        output_field=IntegerField()
+    )
+    models.EmployeeProfile.objects.filter(
+        user_id__in=deltas.keys()
+    ).update(open_rounds=Greatest(F("open_rounds") + delta_case, Value(0)))
+
+
+def adjust_interviewer_load(interviewer_id, delta):
+    apply_interviewer_load_deltas({interviewer_id: delta})
+
+
+def release_interviewer_load(rounds):
+    """
+    Releases the load held by the open rounds of the given queryset,
+    call it before closing those rounds with a queryset update.
+    """
+    open_counts = rounds.filter(
+        status__isnull=True,
+        interviewer__isnull=False
+    ).values("interviewer_id").annotate(total=Count("id"))
+    apply_interviewer_load_deltas({
+        row["interviewer_id"]: -row["total"] for row in open_counts
+    })
+
+
+EXPERIENCE_SUMMARY_FIELDS = (
+    "experience_years",
+    "latest_designation",
+    "experience_count",
+)
+
+
+def get_experience_summary_expressions():
+    """CandidateInfo experience summary columns computed from work_experience."""
+    experiences = models.WorkExperience.objects.filter(
+        candidate=OuterRef("pk")
+    ).order_by().values("candidate")
+    return {
+        "experience_years": Coalesce(Subquery(experiences.annotate(
+            total=Sum("total_experience")
+        ).values("total")), 0),
+        "experience_count": Coalesce(Subquery(experiences.annotate(
+            total=Count("id")
+        ).values("total")), 0),
+        "latest_designation": Subquery(models.WorkExperience.objects.filter(
+            candidate=OuterRef("pk")
+        ).order_by("-id").values("designation")[:1]),
+    }
+
+
+def refresh_experience_summaries(candidate_ids):
+    """
+    Recomputes the experience summary of the candidates with one UPDATE,
+    call it in the transaction writing their work experiences.
+    """
+    candidate_ids = {candidate_id for candidate_id in candidate_ids if candidate_id}
+    if not candidate_ids:
+        return 0
+    # modified_at moves too, the ranking matrix refreshes from it
+    return models.CandidateInfo.objects.filter(
+        pk__in=candidate_ids
+    ).update(modified_at=timezone.now(), **get_experience_summary_expressions())
+
+
+def allocate_sequence_values(name, count=1):
+    """
+    Reserves `count` consecutive numbers of the named sequence, returns
+    them as a range. The sequence row stays locked until the caller's
+    transaction ends, so numbers are never handed out twice.
+    """
+    with transaction.atomic():
+        sequence = models.IdSequence.objects.select_for_update().filter(
+            name=name
+        ).first()
+        if sequence is None:
+            models.IdSequence.objects.get_or_create(
+                name=name, defaults={"next_value": get_sequence_start(name)}
+            )
+            sequence = models.IdSequence.objects.select_for_update().get(
+                name=name
+            )
+        first = sequence.next_value
+        models.IdSequence.objects.filter(name=name).update(
+            next_value=F("next_value") + count
+        )
+    return range(first, first + count)
+
+
+def get_sequence_start(name):
+    if name == models.JOB_ID_SEQUENCE:
+        # continue after the numbers job ids used to take from the pk
+        latest = models.Interview.objects.aggregate(latest=Max("id"))["latest"]
+        return (latest or 0) + 1
+    return 1
+
+
+def estimate_row_count(model, using="default"):
+    """
+    Row count of the model table from the database statistics,
+    None when the backend doesn't keep a cheap estimate.
+    """
+    table = model._meta.db_table
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == "mysql":
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [table]
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [table]
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
@@ -1,15 +1,97 @@
+from django.contrib.auth import authenticate
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
+from django.db.models import (
+    Avg,
+    Count,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery
+)
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
-from rest_framework.exceptions import ValidationError, APIException
+from rest_framework.exceptions import (
+    APIException,
+    AuthenticationFailed,
+    ValidationError
+)
 
+from apis.assignment import auto_assign_interviewer
+from apis.dedupe import build_blocking_keys, find_duplicates
 from apis.models import (
+    ArchivedInterview,
+    ArchivedInterviewRound,
+    AuditLog,
     Skill,
     Employee,
     CandidateInfo,
     WorkExperience, Interview, InterviewRound,
+    Role,
+)
+from apis.selectors import (
+    EXPERIENCE_SUMMARY_FIELDS,
+    refresh_experience_summaries
 )
-from apis.utils import candidate_exists, is_hr_employee, validate_skills
+from apis.utils import (
+    apply_m2m_diff,
+    build_missing_skills_error,
+    candidate_exists,
+    is_hr_employee,
+    validate_skills
+)
+
+
+def parse_field_list(value):
+    if value is None:
+        return None
+    return {field.strip() for field in value.split(",") if field.strip()}
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets for GET requests: ?fields=a,b keeps only the listed
+    fields and ?expand=x,y keeps only the listed nested relations
+    (`expandable_fields`), relations named in ?fields are always kept.
+    `optimize_queryset` applies only the select_related / prefetch_related
+    lookups (`related_lookups`) of the fields that will be rendered.
+    """
+    expandable_fields = ()
+    select_related_lookups = {}
+    prefetch_related_lookups = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request", None)
+        kept = self.get_rendered_field_names(request, self.fields.keys())
+        for field_name in set(self.fields.keys()) - kept:
+            self.fields.pop(field_name)
+
+    @classmethod
+    def get_rendered_field_names(cls, request, field_names):
+        field_names = set(field_names)
+        if request is None or request.method != "GET":
+            return field_names
+        fields = parse_field_list(request.query_params.get("fields", None))
+        expand = parse_field_list(request.query_params.get("expand", None))
+        if fields is not None:
+            field_names &= fields | (expand or set())
+        if expand is not None:
+            field_names -= set(cls.expandable_fields) - expand - (fields or set())
+        return field_names
+
+    @classmethod
+    def optimize_queryset(cls, queryset, request):
+        rendered = cls.get_rendered_field_names(request, cls.Meta.fields)
+        select_related, prefetch_related = [], []
+        for field_name in rendered:
+            select_related += cls.select_related_lookups.get(field_name, [])
+            prefetch_related += cls.prefetch_related_lookups.get(field_name, [])
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
 
 
 class SkillSerializer(serializers.ModelSerializer):
@@ -85,11 +167,22 @@ class SkillListSerializer(SkillSerializer):
         return instance.name
 
 
-class CandidateInfoSerializer(serializers.ModelSerializer):
+class CandidateInfoSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     skills = SkillListSerializer(many=True, read_only=True)
     experience = WorkExperienceSerializer(
         source='experiences', many=True, read_only=True
     )
+    expandable_fields = ('skills', 'experience')
+    prefetch_related_lookups = {
+        'skills': ['skills'],
+        'experience': ['experiences'],
+    }
+    allow_duplicate = serializers.BooleanField(
+        write_only=True,
+        required=False,
+        default=False,
+        help_text="Create the candidate even if a likely duplicate exists"
+    )
 
     class Meta:
         model = CandidateInfo
@@ -102,9 +195,13 @@ class CandidateInfoSerializer(serializers.ModelSerializer):
             'gender',
             'skills',
             'resume',
-            'experience'
+            'experience',
+            'experience_years',
+            'latest_designation',
+            'experience_count',
+            'allow_duplicate'
         )
-        read_only_fields = ('id',)
+        read_only_fields = ('id',) + EXPERIENCE_SUMMARY_FIELDS
 
     def validate_email(self, email):
         if self.instance:
@@ -118,29 +215,91 @@ class CandidateInfoSerializer(serializers.ModelSerializer):
         return email
 
     def validate(self, attrs):
-        experience = self.initial_data.get('experience', [])
-        if experience:
-            exp_serializer = WorkExperienceSerializer(
-                data=experience, many=True
-            )
-            try:
-                exp_serializer.is_valid(raise_exception=True)
-            except Exception as e:
-                raise ValidationError(detail=f"'experience' : {e.__str__()}")
+        # left out, the experiences stay as they are, an empty list
+        # removes them all on PUT
+        if 'experience' in self.initial_data:
             attrs.update({
-                'experience': experience,
+                'experience': self.validate_experience_rows(
+                    self.initial_data['experience']
+                ),
             })
         skills = self.initial_data.get('skills', [])
         validate_skills(self.instance, attrs, skills)
+        allow_duplicate = attrs.pop('allow_duplicate', False)
+        if not self.instance and not allow_duplicate:
+            self.check_duplicates(attrs)
         return attrs
 
+    def validate_experience_rows(self, experience):
+        exp_serializer = WorkExperienceSerializer(data=experience, many=True)
+        try:
+            exp_serializer.is_valid(raise_exception=True)
+        except Exception as e:
+            raise ValidationError(detail=f"'experience' : {e.__str__()}")
+        id_field = serializers.IntegerField(min_value=1)
+        rows = []
+        for item, row in zip(experience, exp_serializer.validated_data):
+            if item.get('id'):
+                try:
+                    row = dict(row, id=id_field.run_validation(item['id']))
+                except ValidationError as e:
+                    raise ValidationError(
+                        detail=f"'experience' : id {item['id']!r}, "
+                               f"{' '.join(e.detail)}"
+                    )
+            rows.append(row)
+        exp_ids = {row['id'] for row in rows if 'id' in row}
+        if exp_ids and self.instance:
+            missing = exp_ids - set(WorkExperience.objects.filter(
+                candidate=self.instance, pk__in=exp_ids
+            ).values_list('pk', flat=True))
+            if missing:
+                raise ValidationError(
+                    detail=f"'experience' : Work experience with id: "
+                           f"{', '.join(map(str, sorted(missing)))} not found."
+                )
+        return rows
+
+    @staticmethod
+    def check_duplicates(attrs):
+        keys = build_blocking_keys(
+            attrs.get('email'),
+            attrs.get('first_name'),
+            attrs.get('last_name'),
+            attrs.get('mobile_no')
+        )
+        duplicates = find_duplicates(keys, limit=5)
+        if duplicates:
+            raise ValidationError({
+                "detail": "Candidate looks like a duplicate of an existing "
+                          "candidate, send allow_duplicate=true to create "
+                          "it anyway.",
+                "duplicates": [
+                    {
+                        "id": match.candidate_id,
+                        "email": match.email,
+                        "score": match.score,
+                        "matched_on": match.matched_on
+                    } for match in duplicates
+                ]
+            })
+
     @transaction.atomic()
     def create(self, validated_data):
         experiences = validated_data.pop('experience', [])
+        skills = validated_data.pop('skills', None)
         try:
             candidate = super().create(validated_data)
-            for experience in experiences:
-                WorkExperience.objects.create(candidate=candidate, **experience)
+            if skills is not None:
+                apply_m2m_diff(CandidateInfo.skills, {candidate.pk: skills})
+            WorkExperience.objects.bulk_create([
+                WorkExperience(
+                    candidate=candidate,
+                    **{k: v for k, v in experience.items() if k != 'id'}
+                ) for experience in experiences
+            ])
+            if experiences:
+                self.refresh_experience_summary(candidate)
         except Exception as e:
             raise APIException(
                 detail=f"Candidate not created, error: {e.__str__()}"
@@ -149,28 +308,91 @@ class CandidateInfoSerializer(serializers.ModelSerializer):
 
     @transaction.atomic()
     def update(self, instance, validated_data):
-        experiences = validated_data.pop('experience', [])
+        experiences = validated_data.pop('experience', None)
+        skills = validated_data.pop('skills', None)
         try:
             instance = super().update(instance, validated_data)
-            for experience in experiences:
-                if "id" not in experience.keys():
-                    WorkExperience.objects.create(
-                        candidate=instance, **experience
-                    )
-                else:
-                    exp_id = experience.pop("id")
-                    exp_obj = WorkExperience.objects.get(
-                        candidate=instance, id=exp_id
-                    )
-                    for field, value in experience.items():
-                        setattr(exp_obj, field, value)
-                    exp_obj.save()
+            if skills is not None:
+                apply_m2m_diff(CandidateInfo.skills, {instance.pk: skills})
+            if experiences is not None:
+                self.apply_experience_diff(instance, experiences)
+                self.refresh_experience_summary(instance)
         except Exception as e:
             raise APIException(
                 detail=f"Candidate not updated, error: {e.__str__()}"
             )
+        # related rows were written around the managers,
+        # drop what the view prefetched so the response is fresh.
+        getattr(instance, '_prefetched_objects_cache', {}).clear()
         return instance
 
+    @staticmethod
+    def refresh_experience_summary(instance):
+        refresh_experience_summaries([instance.pk])
+        instance.refresh_from_db(fields=EXPERIENCE_SUMMARY_FIELDS)
+
+    def apply_experience_diff(self, instance, experiences):
+        """
+        Loads the candidate experiences once and applies the incoming rows
+        as one bulk_create, one bulk_update and (on PUT) one delete for
+        the experiences left out of the payload.
+        """
+        existing = {
+            exp.pk: exp for exp in
+            WorkExperience.objects.filter(candidate=instance)
+        }
+        to_create, to_update, seen = [], [], set()
+        update_fields = set()
+        for experience in experiences:
+            experience = dict(experience)
+            exp_id = experience.pop('id', None)
+            if not exp_id:
+                to_create.append(
+                    WorkExperience(candidate=instance, **experience)
+                )
+                continue
+            exp_obj = existing.get(exp_id)
+            if not exp_obj:
+                raise WorkExperience.DoesNotExist(
+                    f"Work experience with id: {exp_id} not found."
+                )
+            seen.add(exp_obj.pk)
+            changed = False
+            for field, value in experience.items():
+                if getattr(exp_obj, field) != value:
+                    setattr(exp_obj, field, value)
+                    update_fields.add(field)
+                    changed = True
+            if changed:
+                to_update.append(exp_obj)
+        WorkExperience.objects.bulk_create(to_create)
+        if to_update:
+            WorkExperience.objects.bulk_update(to_update, list(update_fields))
+        stale_ids = existing.keys() - seen
+        if stale_ids and not self.partial:
+            WorkExperience.objects.filter(pk__in=stale_ids).delete()
+
+
+class CandidateRankingSerializer(serializers.Serializer):
+    skills = serializers.DictField(
+        child=serializers.FloatField(min_value=0),
+        allow_empty=False,
+        help_text="Required skills as {skill name: weight}"
+    )
+    experience_weight = serializers.FloatField(default=1.0, min_value=0)
+    limit = serializers.IntegerField(default=50, min_value=1, max_value=1000)
+
+    def validate_skills(self, skills):
+        skill_ids = dict(
+            Skill.objects.filter(
+                name__in=skills.keys()
+            ).values_list("name", "id")
+        )
+        missing_skills = [name for name in skills if name not in skill_ids]
+        if missing_skills:
+            raise ValidationError(build_missing_skills_error(missing_skills))
+        return {skill_ids[name]: weight for name, weight in skills.items()}
+
 
 class HRAssignInterviewSerializer(serializers.ModelSerializer):
     employee = serializers.CharField()
@@ -216,6 +438,72 @@ class HRAssignInterviewSerializer(serializers.ModelSerializer):
         return candidate
 
 
+class HRBulkAssignInterviewSerializer(serializers.Serializer):
+    max_candidates = 1000
+    candidates = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        help_text="Candidate ids or emails"
+    )
+    employees = serializers.ListField(
+        child=serializers.CharField(),
+        required=False,
+        allow_empty=False,
+        help_text="HR ids or usernames, candidates are shared round-robin. "
+                  "Defaults to every active HR."
+    )
+
+    def validate_candidates(self, candidates):
+        if len(candidates) > self.max_candidates:
+            raise ValidationError(
+                detail=f"At most {self.max_candidates} candidates per request."
+            )
+        if len(set(candidates)) != len(candidates):
+            raise ValidationError(detail="Candidates are listed more than once.")
+        found = {}
+        for candidate in CandidateInfo.objects.filter(
+            self.get_identifier_lookup(candidates, "email")
+        ):
+            found[str(candidate.pk)] = found[candidate.email] = candidate
+        missing = [value for value in candidates if value not in found]
+        if missing:
+            raise ValidationError(
+                detail=f"Candidates not Found: {', '.join(missing)}."
+            )
+        return [found[value] for value in candidates]
+
+    def validate_employees(self, employees):
+        found = {}
+        for employee in Employee.objects.filter(
+            self.get_identifier_lookup(employees, "username"),
+            emp_profile__role=Role.HR
+        ).distinct():
+            found[str(employee.pk)] = found[employee.username] = employee
+        missing = [value for value in employees if value not in found]
+        if missing:
+            raise ValidationError(
+                detail=f"HR employees not Found: {', '.join(missing)}."
+            )
+        return list({found[value].pk: found[value] for value in employees}.values())
+
+    def validate(self, attrs):
+        if "employees" not in attrs:
+            attrs["employees"] = list(Employee.objects.filter(
+                is_active=True, emp_profile__role=Role.HR
+            ).distinct().order_by("id"))
+            if not attrs["employees"]:
+                raise ValidationError(detail="There is no HR employee.")
+        return attrs
+
+    @staticmethod
+    def get_identifier_lookup(values, lookup_key):
+        """Matches ids for numeric values and `lookup_key` otherwise."""
+        ids = [value for value in values if value.isnumeric()]
+        return Q(id__in=ids) | Q(**{
+            f"{lookup_key}__in": [value for value in values if not value.isnumeric()]
+        })
+
+
 class InterviewActionSerializer(serializers.Serializer):
     action = serializers.CharField()
     remarks = serializers.CharField(
@@ -223,9 +511,14 @@ class InterviewActionSerializer(serializers.Serializer):
         help_text="Reason or remarks for selecting|rejecting"
                   "|recommending|moving to next round"
     )
+    version = serializers.IntegerField(
+        required=False,
+        help_text="Interview version the action is based on, "
+                  "the If-Match header can be sent instead"
+    )
 
 
-class InterviewRoundSerializer(serializers.ModelSerializer):
+class InterviewRoundSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     skills = SkillListSerializer(many=True, read_only=True)
     interviewer = serializers.CharField(
         source="interviewer.username",
@@ -236,6 +529,12 @@ class InterviewRoundSerializer(serializers.ModelSerializer):
         input_formats=["%d-%m-%Y"]
     )
     interview = serializers.StringRelatedField()
+    auto_assign = serializers.BooleanField(
+        write_only=True,
+        required=False,
+        default=False,
+        help_text="Pick the least loaded interviewer matching the skills"
+    )
 
     class Meta:
         model = InterviewRound
@@ -249,17 +548,23 @@ class InterviewRoundSerializer(serializers.ModelSerializer):
             "remarks",
             "skills",
             "date",
-            "is_final_round"
+            "is_final_round",
+            "version",
+            "auto_assign"
         )
         read_only_fields = (
             "id",
             "interview",
             "status",
+            "version",
         )
 
     def validate(self, attrs):
         skills = self.initial_data.get('skills', [])
         validate_skills(self.instance, attrs, skills)
+        if attrs.pop("auto_assign", False):
+            attrs.update({"interviewer": self.get_auto_interviewer(attrs)})
+            return attrs
         interviewer = self.initial_data.get('interviewer', None)
         if not self.instance and not interviewer:
             raise ValidationError(detail="interviewer is a required field.")
@@ -271,13 +576,58 @@ class InterviewRoundSerializer(serializers.ModelSerializer):
         attrs.update({"interviewer": interviewer_obj})
         return attrs
 
+    def get_auto_interviewer(self, attrs):
+        if self.instance and self.instance.interviewer_id:
+            raise ValidationError(
+                detail="Round already has an interviewer, "
+                       "auto assign is only for new rounds."
+            )
+        if "skills" in attrs:
+            skill_ids = attrs["skills"]
+        elif self.instance:
+            skill_ids = list(
+                self.instance.skills.values_list("id", flat=True)
+            )
+        else:
+            skill_ids = []
+        interviewer_obj = auto_assign_interviewer(skill_ids)
+        if not interviewer_obj:
+            raise ValidationError(
+                detail="No eligible interviewer found for the round skills."
+            )
+        return interviewer_obj
+
+
+class InterviewRoundReferenceSerializer(serializers.Serializer):
+    job_id = serializers.CharField()
+    round_no = serializers.IntegerField(min_value=1)
 
-class InterviewSerializer(serializers.ModelSerializer):
+
+class InterviewRoundAutoAssignSerializer(serializers.Serializer):
+    rounds = InterviewRoundReferenceSerializer(many=True, allow_empty=False)
+
+
+class InterviewSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     interview_rounds = InterviewRoundSerializer(
         source="interview_round", many=True, read_only=True
     )
     employee = serializers.CharField(source="employee.username")
     candidate = serializers.CharField(source="candidate.email")
+    expandable_fields = ("interview_rounds",)
+    select_related_lookups = {
+        "employee": ["employee"],
+        "candidate": ["candidate"],
+    }
+    prefetch_related_lookups = {
+        "interview_rounds": [
+            Prefetch(
+                "interview_round",
+                queryset=InterviewRound.objects.select_related(
+                    "interviewer"
+                ).prefetch_related("skills").order_by("round_no")
+            )
+        ],
+    }
 
     class Meta:
         model = Interview
@@ -288,5 +638,309 @@ class InterviewSerializer(serializers.ModelSerializer):
             "candidate",
             "status",
             "overall_rating",
+            "version",
             "interview_rounds"
         )
+
+
+class InterviewRoundBulkItemSerializer(InterviewRoundReferenceSerializer):
+    interviewer = serializers.CharField(required=False, allow_null=True)
+    rating = serializers.IntegerField(
+        required=False, min_value=0, max_value=10
+    )
+    remarks = serializers.CharField(
+        required=False, allow_null=True, allow_blank=True
+    )
+    skills = serializers.ListField(
+        child=serializers.CharField(), required=False
+    )
+    date = serializers.DateField(
+        required=False, allow_null=True, input_formats=["%d-%m-%Y"]
+    )
+    is_final_round = serializers.BooleanField(required=False)
+    version = serializers.IntegerField(
+        required=False,
+        help_text="Round version the change is based on, "
+                  "the row is rejected with 409 if it moved on"
+    )
+
+
+class InterviewRoundBulkUpdateSerializer(serializers.Serializer):
+    max_rounds = 200
+    rounds = InterviewRoundBulkItemSerializer(many=True, allow_empty=False)
+
+    def validate_rounds(self, rounds):
+        if len(rounds) > self.max_rounds:
+            raise ValidationError(
+                detail=f"At most {self.max_rounds} rounds per request."
+            )
+        return rounds
+
+
+class ArchivedInterviewRoundSerializer(InterviewRoundSerializer):
+    class Meta(InterviewRoundSerializer.Meta):
+        model = ArchivedInterviewRound
+        fields = tuple(
+            field for field in InterviewRoundSerializer.Meta.fields
+            if field != "auto_assign"
+        )
+        read_only_fields = fields
+
+
+class ArchivedInterviewSerializer(InterviewSerializer):
+    interview_rounds = ArchivedInterviewRoundSerializer(
+        source="interview_round", many=True, read_only=True
+    )
+    prefetch_related_lookups = {
+        "interview_rounds": [
+            Prefetch(
+                "interview_round",
+                queryset=ArchivedInterviewRound.objects.select_related(
+                    "interviewer"
+                ).prefetch_related("skills").order_by("round_no")
+            )
+        ],
+    }
+
+    class Meta(InterviewSerializer.Meta):
+        model = ArchivedInterview
+        fields = InterviewSerializer.Meta.fields + ("closed_at", "archived_at")
+        read_only_fields = fields
+
+
+class InterviewSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    ?view=summary of the interview list: the round figures are SQL
+    annotations (see `optimize_queryset`), a page is one query and no
+    round is loaded.
+    """
+    employee = serializers.CharField(source="employee.username")
+    candidate = serializers.CharField(source="candidate.email")
+    round_count = serializers.IntegerField(read_only=True)
+    latest_round_no = serializers.IntegerField(read_only=True)
+    latest_round_status = serializers.CharField(read_only=True)
+    current_interviewer = serializers.CharField(read_only=True)
+    average_rating = serializers.DecimalField(
+        max_digits=4, decimal_places=2, coerce_to_string=False,
+        read_only=True, help_text="Average rating of the rounds with a status"
+    )
+    round_model = InterviewRound
+    select_related_lookups = InterviewSerializer.select_related_lookups
+
+    class Meta:
+        model = Interview
+        fields = (
+            "id",
+            "job_id",
+            "employee",
+            "candidate",
+            "status",
+            "overall_rating",
+            "version",
+            "round_count",
+            "latest_round_no",
+            "latest_round_status",
+            "current_interviewer",
+            "average_rating"
+        )
+
+    @classmethod
+    def get_annotations(cls):
+        rounds = cls.round_model.objects.filter(
+            interview=OuterRef("pk")
+        ).order_by().values("interview")
+        latest_round = cls.round_model.objects.filter(
+            interview=OuterRef("pk")
+        ).order_by("-round_no", "-id")
+        return {
+            "round_count": Coalesce(
+                Subquery(rounds.annotate(count=Count("id")).values("count")), 0
+            ),
+            "latest_round_no": Subquery(latest_round.values("round_no")[:1]),
+            "latest_round_status": Subquery(latest_round.values("status")[:1]),
+            "current_interviewer": Subquery(
+                latest_round.values("interviewer__username")[:1]
+            ),
+            "average_rating": Subquery(
+                rounds.filter(status__isnull=False).annotate(
+                    average=Avg("rating")
+                ).values("average")
+            ),
+        }
+
+    @classmethod
+    def optimize_queryset(cls, queryset, request):
+        queryset = super().optimize_queryset(queryset, request)
+        rendered = cls.get_rendered_field_names(request, cls.Meta.fields)
+        return queryset.annotate(**{
+            name: annotation
+            for name, annotation in cls.get_annotations().items()
+            if name in rendered
+        })
+
+
+class ArchivedInterviewSummarySerializer(InterviewSummarySerializer):
+    round_model = ArchivedInterviewRound
+
+    class Meta(InterviewSummarySerializer.Meta):
+        model = ArchivedInterview
+        fields = InterviewSummarySerializer.Meta.fields + ("closed_at", "archived_at")
+        read_only_fields = fields
+
+
+class TimelineInterviewSerializer(serializers.ModelSerializer):
+    hr = serializers.CharField(source="employee.username")
+
+    class Meta:
+        model = Interview
+        fields = (
+            "id",
+            "job_id",
+            "hr",
+            "status",
+            "overall_rating",
+            "created_at"
+        )
+
+
+class TimelineRoundSerializer(serializers.ModelSerializer):
+    job_id = serializers.CharField(source="interview.job_id")
+    interviewer = serializers.CharField(
+        source="interviewer.username", default=None
+    )
+    skills = SkillListSerializer(many=True)
+    date = serializers.DateField(format="%d-%m-%Y")
+
+    class Meta:
+        model = InterviewRound
+        fields = (
+            "id",
+            "job_id",
+            "round_no",
+            "interviewer",
+            "status",
+            "rating",
+            "remarks",
+            "skills",
+            "date",
+            "is_final_round",
+            "created_at"
+        )
+
+
+class CandidateTimelineSerializer(serializers.Serializer):
+    """
+    Candidate with its interviews and interview rounds merged into one
+    chronological list of events, expects `get_timeline_queryset()`.
+    """
+
+    def to_representation(self, candidate):
+        entries = []
+        for interview in candidate.interviews.all():
+            entries.append(
+                (interview.created_at, interview.pk, 0, "interview", interview)
+            )
+            for interview_round in interview.interview_round.all():
+                entries.append((
+                    interview_round.created_at,
+                    interview.pk,
+                    interview_round.round_no or 0,
+                    "round",
+                    interview_round
+                ))
+        entries.sort(key=lambda entry: entry[:3])
+        serializers_by_type = {
+            "interview": TimelineInterviewSerializer,
+            "round": TimelineRoundSerializer,
+        }
+        return {
+            # no request in the context, the payload is cached as is
+            "candidate": CandidateInfoSerializer(
+                candidate, context={"request": None}
+            ).data,
+            "events": [
+                dict(type=event_type, **serializers_by_type[event_type](obj).data)
+                for *_, event_type, obj in entries
+            ],
+        }
+
+
+class AuditLogSerializer(serializers.ModelSerializer):
+    actor = serializers.CharField(source="actor_username")
+
+    class Meta:
+        model = AuditLog
+        fields = (
+            "id",
+            "actor",
+            "action",
+            "job_id",
+            "round_no",
+            "changes",
+            "created_at"
+        )
+
+
+class TokenObtainSerializer(serializers.Serializer):
+    username = serializers.CharField()
+    password = serializers.CharField(
+        write_only=True, style={"input_type": "password"}
+    )
+
+    def validate(self, attrs):
+        user = authenticate(
+            request=self.context.get("request", None),
+            username=attrs["username"],
+            password=attrs["password"]
+        )
+        if not user or not user.is_active:
+            raise AuthenticationFailed("Invalid username or password.")
+        attrs["user"] = user
+        return attrs
+
+
+class TokenRefreshSerializer(serializers.Serializer):
+    refresh = serializers.CharField(help_text="Refresh token of the session")
+
+
+class ChangeFeedQuerySerializer(serializers.Serializer):
+    cursor = serializers.CharField(
+        required=False,
+        help_text="next_cursor of the previous page, "
+                  "without it the feed starts at the oldest change kept"
+    )
+    start = serializers.ChoiceField(
+        choices=["now"],
+        required=False,
+        help_text="Only returns a cursor at the latest change, "
+                  "take it before a full download"
+    )
+    page_size = serializers.IntegerField(
+        default=500, min_value=1, max_value=1000
+    )
+
+
+class InterviewEventStreamQuerySerializer(serializers.Serializer):
+    token = serializers.CharField(
+        required=False,
+        help_text="Access token, for clients that can't set the "
+                  "Authorization header (EventSource)"
+    )
+    hr = serializers.CharField(
+        required=False, help_text="HR employee id or username"
+    )
+    job_id = serializers.CharField(required=False)
+    last_event_id = serializers.IntegerField(
+        required=False,
+        min_value=0,
+        help_text="Replays the events after this one, "
+                  "the Last-Event-ID header takes precedence"
+    )
+
+
+class SkillAutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(
+        max_length=80,
+        help_text="Prefix of a skill name or alias, case insensitive"
+    )
+    limit = serializers.IntegerField(default=10, min_value=1, max_value=50)
@@ -0,0 +1,129 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from apis.changes import record_candidate_changes, record_interview_changes
+from apis.models import (
+    CandidateInfo,
+    Interview,
+    InterviewRound,
+    Skill,
+    SkillAlias,
+    WorkExperience
+)
+from apis.skills import invalidate_skill_index
+from apis.timeline import (
+    invalidate_candidate_timelines,
+    invalidate_interview_timelines
+)
+
+
+# region Candidate timeline cache
+@receiver(post_save, sender=CandidateInfo)
+@receiver(post_delete, sender=CandidateInfo)
+def candidate_changed(sender, instance, **kwargs):
+    invalidate_candidate_timelines([instance.pk])
+
+
+@receiver(post_save, sender=WorkExperience)
+@receiver(post_delete, sender=WorkExperience)
+@receiver(post_save, sender=Interview)
+@receiver(post_delete, sender=Interview)
+def candidate_child_changed(sender, instance, **kwargs):
+    invalidate_candidate_timelines([instance.candidate_id])
+
+
+@receiver(post_save, sender=InterviewRound)
+@receiver(post_delete, sender=InterviewRound)
+def interview_round_changed(sender, instance, **kwargs):
+    invalidate_interview_timelines([instance.interview_id])
+
+
+@receiver(m2m_changed, sender=CandidateInfo.skills.through)
+def candidate_skills_changed(sender, instance, action, reverse, pk_set,
+                             **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        invalidate_candidate_timelines([instance.pk])
+    elif pk_set:
+        invalidate_candidate_timelines(pk_set)
+
+
+@receiver(m2m_changed, sender=InterviewRound.skills.through)
+def round_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        invalidate_interview_timelines([instance.interview_id])
+    elif pk_set:
+        invalidate_interview_timelines(
+            InterviewRound.objects.filter(
+                pk__in=pk_set
+            ).values_list("interview_id", flat=True)
+        )
+# endregion
+
+
+# region Change feed, see apis/changes.py
+@receiver(post_save, sender=CandidateInfo)
+@receiver(post_delete, sender=CandidateInfo)
+def candidate_change_recorded(sender, instance, **kwargs):
+    record_candidate_changes(
+        [instance.pk], deleted=kwargs["signal"] is post_delete
+    )
+
+
+@receiver(post_save, sender=WorkExperience)
+@receiver(post_delete, sender=WorkExperience)
+def work_experience_change_recorded(sender, instance, **kwargs):
+    record_candidate_changes([instance.candidate_id])
+
+
+@receiver(post_save, sender=Interview)
+@receiver(post_delete, sender=Interview)
+def interview_change_recorded(sender, instance, **kwargs):
+    record_interview_changes(
+        [instance.pk], deleted=kwargs["signal"] is post_delete
+    )
+
+
+@receiver(post_save, sender=InterviewRound)
+@receiver(post_delete, sender=InterviewRound)
+def interview_round_change_recorded(sender, instance, **kwargs):
+    record_interview_changes([instance.interview_id])
+
+
+@receiver(m2m_changed, sender=CandidateInfo.skills.through)
+def candidate_skills_change_recorded(sender, instance, action, reverse,
+                                     pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        record_candidate_changes([instance.pk])
+    elif pk_set:
+        record_candidate_changes(pk_set)
+
+
+@receiver(m2m_changed, sender=InterviewRound.skills.through)
+def round_skills_change_recorded(sender, instance, action, reverse, pk_set,
+                                 **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        record_interview_changes([instance.interview_id])
+    elif pk_set:
+        record_interview_changes(
+            InterviewRound.objects.filter(
+                pk__in=pk_set
+            ).values_list("interview_id", flat=True)
+        )
+# endregion
+
+
+# region Skill autocomplete, see apis/skills.py
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=SkillAlias)
+@receiver(post_delete, sender=SkillAlias)
+def skill_changed(sender, instance, **kwargs):
+    invalidate_skill_index()
+# endregion
@@ -0,0 +1,167 @@
+import difflib
+import re
+import threading
+import time
+from collections import Counter
+from django.conf import settings
+from django.db.models import Count, F
+from apis import models
+
+# IdSequence row bumped by every skill or alias change, see get_skill_index
+SKILL_INDEX_SEQUENCE = "skill.index_version"
+# a term is also reachable from the start of each of its words
+WORD_START = re.compile(r"(?<=[\s\-_/.,+#])(?=\w)")
+
+
+def normalize(term):
+    return " ".join(str(term).lower().split())
+
+
+class SkillTrie:
+    """
+    Case-insensitive prefix trie over the skill names and aliases. Every
+    node keeps the ids of its `node_size` most used skills, best first, so
+    completing a prefix only walks the prefix. Terms are inserted from the
+    most to the least used skill, which is what orders those lists.
+    """
+
+    def __init__(self, node_size=20):
+        self.node_size = node_size
+        self.root = {}
+        self.skills = {}  # id -> (name, usage count)
+        self.terms = {}  # normalized name or alias -> skill id
+        self.version = None
+        self.built_at = None
+
+    @staticmethod
+    def fetch_usage():
+        """How many candidates, rounds and employees use each skill."""
+        usage = Counter()
+        for descriptor in (
+            models.CandidateInfo.skills,
+            models.InterviewRound.skills,
+            models.EmployeeProfile.skills,
+        ):
+            skill_attr = f"{descriptor.field.m2m_reverse_field_name()}_id"
+            usage.update(dict(descriptor.through.objects.values(
+                skill_attr
+            ).annotate(total=Count("pk")).values_list(skill_attr, "total")))
+        return usage
+
+    def build(self, version):
+        """Rebuilds the trie aside and swaps it in, readers never see half of it."""
+        started = time.monotonic()
+        usage = self.fetch_usage()
+        skills = {
+            skill_id: (name, usage[skill_id])
+            for skill_id, name in models.Skill.objects.values_list("id", "name")
+        }
+        terms = {
+            normalize(name): skill_id for skill_id, (name, _) in skills.items()
+        }
+        for alias, skill_id in models.SkillAlias.objects.values_list(
+            "alias", "skill_id"
+        ):
+            terms.setdefault(normalize(alias), skill_id)
+
+        def popularity(item):
+            name, count = skills[item[1]]
+            return -count, name, item[0]
+
+        root = {}
+        for term, skill_id in sorted(terms.items(), key=popularity):
+            self.insert(root, term, skill_id)
+        self.root, self.skills, self.terms = root, skills, terms
+        self.version = version
+        self.built_at = started
+
+    def insert(self, root, term, skill_id):
+        starts = [0] + [match.start() for match in WORD_START.finditer(term)]
+        for start in starts:
+            node = root
+            for char in term[start:]:
+                node = node.setdefault(char, {"": []})
+                top = node[""]
+                if skill_id not in top and len(top) < self.node_size:
+                    top.append(skill_id)
+
+    def complete(self, prefix, limit=10):
+        """[(skill id, name, usage count)] starting with `prefix`, most used first."""
+        node, skills = self.root, self.skills
+        for char in normalize(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+        return [
+            (skill_id, *skills[skill_id])
+            for skill_id in node.get("", [])[:limit] if skill_id in skills
+        ]
+
+    def suggest(self, value, limit=3):
+        """Names of the skills closest to a value that isn't a skill name."""
+        term = normalize(value)
+        suggestions = []
+        if term in self.terms:
+            suggestions.append(self.terms[term])
+        suggestions += [skill_id for skill_id, _, _ in self.complete(term, limit)]
+        suggestions += [
+            self.terms[match] for match in difflib.get_close_matches(
+                term, self.terms.keys(), n=limit, cutoff=0.6
+            )
+        ]
+        names = []
+        for skill_id in suggestions:
+            name = self.skills[skill_id][0] if skill_id in self.skills else None
+            if name and name not in names:
+                names.append(name)
+        return names[:limit]
+
+
+_index = SkillTrie()
+_index_lock = threading.Lock()
+
+
+def get_skill_index():
+    """
+    Process wide trie, rebuilt when a skill or alias changed (the version
+    kept in the database, so every worker sees it) and every
+    SKILL_INDEX_REFRESH_SECONDS so usage counts stay current.
+    """
+    refresh = getattr(settings, "SKILL_INDEX_REFRESH_SECONDS", 300)
+    version = models.IdSequence.objects.filter(
+        name=SKILL_INDEX_SEQUENCE
+    ).values_list("next_value", flat=True).first() or 0
+    with _index_lock:
+        if (
+            _index.built_at is None
+            or _index.version != version
+            or time.monotonic() - _index.built_at >= refresh
+        ):
+            _index.node_size = getattr(settings, "SKILL_INDEX_NODE_SIZE", 20)
+            _index.build(version)
+        return _index
+
+
+def invalidate_skill_index():
+    """
+    Makes every process rebuild its trie, call it inside the transaction
+    changing the skills: the version only moves if the change commits.
+    """
+    sequence = models.IdSequence.objects.filter(name=SKILL_INDEX_SEQUENCE)
+    if sequence.update(next_value=F("next_value") + 1):
+        return
+    _, created = models.IdSequence.objects.get_or_create(
+        name=SKILL_INDEX_SEQUENCE, defaults={"next_value": 1}
+    )
+    if not created:
+        sequence.update(next_value=F("next_value") + 1)
+
+
+def autocomplete_skills(prefix, limit=10):
+    return get_skill_index().complete(prefix, limit)
+
+
+def suggest_skills(names, limit=3):
+    """{name: closest skill names} for names that aren't skills."""
+    index = get_skill_index()
+    return {name: index.suggest(name, limit) for name in names}
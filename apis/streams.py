@@ -0,0 +1,467 @@
+import asyncio
+import json
+import logging
+from datetime import timedelta
+from urllib.parse import parse_qsl
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from apis import models
+from apis.authentication import ACCESS, SignedTokenAuthentication, read_token
+from apis.gaps import SequenceGaps
+
+logger = logging.getLogger("apps.streams")
+
+STREAM_PATH = "/api/v1/interviews/events/"
+EVENT_FIELDS = (
+    "id", "event_type", "interview_id", "job_id", "employee_id",
+    "payload", "created_at"
+)
+
+
+# region Recording
+
+def build_interview_event(event_type, interview, interview_round=None):
+    payload = {
+        "status": interview.status,
+        "overall_rating": interview.overall_rating,
+        "candidate_id": interview.candidate_id,
+    }
+    if interview_round is not None:
+        payload.update({
+            "round_no": interview_round.round_no,
+            "round_status": interview_round.status,
+            "rating": interview_round.rating,
+            "interviewer_id": interview_round.interviewer_id,
+        })
+    return models.InterviewEvent(
+        event_type=event_type,
+        interview_id=interview.pk,
+        job_id=interview.job_id,
+        employee_id=interview.employee_id,
+        payload=payload
+    )
+
+
+def record_interview_events(events):
+    """
+    Writes the events, call it inside the transaction making the change.
+    Streams of this process get them as soon as it commits, the other
+    processes on their next poll.
+    """
+    events = list(events)
+    if not events:
+        return
+    models.InterviewEvent.objects.bulk_create(events, batch_size=500)
+    transaction.on_commit(broker.notify)
+
+
+def record_interview_event(event_type, interview, interview_round=None):
+    record_interview_events(
+        [build_interview_event(event_type, interview, interview_round)]
+    )
+
+# endregion
+
+
+def get_event_retention():
+    return timedelta(days=getattr(settings, "STREAM_EVENT_RETENTION_DAYS", 7))
+
+
+def prune_events(before, chunk_size=10000):
+    """Deletes the events older than `before` in chunks, returns how many."""
+    total = 0
+    while True:
+        ids = list(models.InterviewEvent.objects.filter(
+            created_at__lt=before
+        ).order_by("id").values_list("id", flat=True)[:chunk_size])
+        if not ids:
+            return total
+        total += models.InterviewEvent.objects.filter(
+            id__in=ids
+        ).delete()[0]
+
+
+def database_call(func):
+    """
+    Runs `func` in a worker thread, not in the one serving the sync
+    views, and closes its connection afterwards like a request would.
+    """
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return sync_to_async(wrapper, thread_sensitive=False)
+
+
+def read_events(after, limit, **filters):
+    return list(models.InterviewEvent.objects.filter(
+        id__gt=after, **filters
+    ).order_by("id").values(*EVENT_FIELDS)[:limit])
+
+
+def read_unread_events(unread, limit):
+    return list(models.InterviewEvent.objects.filter(
+        unread
+    ).order_by("id").values(*EVENT_FIELDS)[:limit])
+
+
+def get_start_gaps():
+    """
+    Starts after the newest event, with the ids missing among the events
+    of the last STREAM_GAP_TIMEOUT_SECONDS as gaps, see InterviewEventBroker.
+    """
+    now = timezone.now()
+    gaps = SequenceGaps(
+        timeout=getattr(settings, "STREAM_GAP_TIMEOUT_SECONDS", 300)
+    )
+    recent = list(models.InterviewEvent.objects.filter(
+        created_at__gte=now - timedelta(seconds=gaps.timeout)
+    ).order_by("id").values_list("id", flat=True))
+    before = models.InterviewEvent.objects.order_by("-id")
+    if recent:
+        before = before.filter(id__lt=recent[0])
+    gaps.skip_to(
+        before.values_list("id", flat=True).first() or 0,
+        recent,
+        int(now.timestamp())
+    )
+    return gaps
+
+
+def get_employee_id(hr):
+    if hr.isnumeric():
+        return int(hr)
+    return models.Employee.objects.filter(
+        username=hr
+    ).values_list("id", flat=True).first()
+
+
+class Subscription:
+    """
+    An open stream: its filters and a bounded queue of (event, floor)
+    the broker hands out. A client that doesn't keep up overflows the
+    queue, which is then dropped and `replay_after` set, the stream
+    catches up from the database instead of buffering without limit.
+    """
+
+    def __init__(self, employee_id=None, job_id=None):
+        self.filters = {}
+        if employee_id is not None:
+            self.filters["employee_id"] = employee_id
+        if job_id is not None:
+            self.filters["job_id"] = job_id
+        self.queue = asyncio.Queue(
+            maxsize=getattr(settings, "STREAM_QUEUE_SIZE", 100)
+        )
+        # every matching event up to safe_point has been sent
+        self.safe_point = 0
+        self.replay_after = None
+        self.sent = set()
+
+    def matches(self, event):
+        return all(
+            event[field] == value for field, value in self.filters.items()
+        )
+
+    def offer(self, event, floor):
+        if not self.matches(event):
+            return
+        try:
+            self.queue.put_nowait((event, floor))
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.request_replay(self.safe_point)
+
+    def request_replay(self, after):
+        if self.replay_after is None or after < self.replay_after:
+            self.replay_after = after
+
+    def mark_sent(self, event, floor=None):
+        self.sent.add(event["id"])
+        if floor is not None and floor > self.safe_point:
+            self.safe_point = floor
+            self.sent = {
+                event_id for event_id in self.sent if event_id > floor
+            }
+
+
+class InterviewEventBroker:
+    """
+    Fans interview events out to the streams of this process. One poller
+    per process reads the new events from the database and offers each
+    to every subscription: right away when a transaction of this process
+    recorded events, every STREAM_POLL_SECONDS for the ones written by
+    other processes. Ids are allocated before their transaction commits,
+    so an event can show up after a higher id was read: the poller keeps
+    reading the ids it skipped for STREAM_GAP_TIMEOUT_SECONDS, see
+    apis/gaps.py, and hands such an event out late rather than never.
+    `floor` is the id every event up to which was handed out.
+    """
+
+    def __init__(self):
+        self.subscriptions = set()
+        self.loop = None
+        self.wakeup = None
+        self.ready = None
+        self.poller = None
+        self.gaps = None
+
+    @property
+    def floor(self):
+        return self.gaps.floor
+
+    def notify(self):
+        """Wakes the poller up, safe to call from any thread."""
+        loop, wakeup = self.loop, self.wakeup
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def subscribe(self, subscription):
+        if self.poller is None or self.poller.done():
+            self.loop = asyncio.get_running_loop()
+            self.wakeup = asyncio.Event()
+            self.ready = asyncio.Event()
+            self.gaps = None
+            self.poller = self.loop.create_task(self.poll())
+        self.subscriptions.add(subscription)
+
+    def unsubscribe(self, subscription):
+        self.subscriptions.discard(subscription)
+
+    async def poll(self):
+        interval = getattr(settings, "STREAM_POLL_SECONDS", 2)
+        while self.subscriptions:
+            try:
+                if self.gaps is None:
+                    self.gaps = await database_call(get_start_gaps)()
+                    self.ready.set()
+                else:
+                    await self.dispatch()
+            except Exception:
+                # the next poll reads the same unread ids again
+                logger.exception("Could not read the interview events.")
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+
+    async def dispatch(self):
+        batch_size = getattr(settings, "STREAM_BATCH_SIZE", 500)
+        now = int(timezone.now().timestamp())
+        self.gaps.expire(now)
+        floor = self.floor
+        while True:
+            events = await database_call(read_unread_events)(
+                self.gaps.unread(), batch_size
+            )
+            for event in events:
+                if not self.gaps.add(event["id"], now):
+                    # too many gaps, the rest waits for them to fill
+                    return
+                for subscription in list(self.subscriptions):
+                    subscription.offer(event, floor)
+            if len(events) < batch_size:
+                return
+
+
+broker = InterviewEventBroker()
+
+
+def format_event(event):
+    data = dict(
+        event["payload"],
+        id=event["id"],
+        type=event["event_type"],
+        interview_id=event["interview_id"],
+        job_id=event["job_id"],
+        employee_id=event["employee_id"],
+        created_at=event["created_at"],
+    )
+    return (
+        f"id: {event['id']}\n"
+        f"event: {event['event_type']}\n"
+        f"data: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+    ).encode()
+
+
+class InterviewEventStream:
+    """
+    ASGI app serving interview events as Server-Sent Events to admins and
+    HR employees, optionally filtered with ?hr=<id or username> and
+    ?job_id=. Authenticated like the API with a Bearer access token, which
+    EventSource clients (they can't set headers) pass as ?token=.
+    Reconnects replay what was missed from the Last-Event-ID header (or
+    ?last_event_id=). The stream is closed after STREAM_MAX_SECONDS so
+    the token gets checked again.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["method"] != "GET":
+            return await self.respond(send, 405, {
+                "detail": f"Method \"{scope['method']}\" not allowed."
+            }, [(b"allow", b"GET")])
+        headers = {
+            name.decode("latin-1").lower(): value.decode("latin-1")
+            for name, value in scope["headers"]
+        }
+        query = dict(parse_qsl(scope["query_string"].decode("latin-1")))
+        if "last-event-id" in headers:
+            query["last_event_id"] = headers["last-event-id"]
+        # circular import, the serializers import the models
+        from apis.serializers import InterviewEventStreamQuerySerializer
+        serializer = InterviewEventStreamQuerySerializer(data=query)
+        if not serializer.is_valid():
+            return await self.respond(send, 400, serializer.errors)
+        params = serializer.validated_data
+        try:
+            claims = await database_call(self.authenticate)(
+                headers, params.get("token")
+            )
+        except AuthenticationFailed as exc:
+            return await self.respond(send, 401, {"detail": exc.detail}, [
+                (b"www-authenticate", SignedTokenAuthentication.keyword.encode())
+            ])
+        if not claims["su"] and claims["role"] != models.Role.HR.value:
+            return await self.respond(send, 403, {
+                "detail": "You do not have permission to perform this action."
+            })
+        employee_id = None
+        if params.get("hr"):
+            employee_id = await database_call(get_employee_id)(params["hr"])
+            if employee_id is None:
+                return await self.respond(send, 400, {
+                    "hr": ["Employee(HR) not Found."]
+                })
+        subscription = Subscription(employee_id, params.get("job_id"))
+        await self.stream(subscription, params.get("last_event_id"), receive, send)
+
+    @staticmethod
+    def authenticate(headers, token):
+        auth = headers.get("authorization", "").split()
+        if auth and auth[0].lower() == SignedTokenAuthentication.keyword.lower():
+            if len(auth) != 2:
+                raise AuthenticationFailed(
+                    "Invalid token header, the token must not contain spaces."
+                )
+            token = auth[1]
+        if not token:
+            raise AuthenticationFailed(
+                "Authentication credentials were not provided."
+            )
+        return read_token(token, ACCESS)
+
+    @staticmethod
+    async def respond(send, status, data, headers=()):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), *headers],
+        })
+        await send({
+            "type": "http.response.body",
+            "body": json.dumps(data).encode(),
+        })
+
+    async def stream(self, subscription, last_event_id, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream"),
+                (b"cache-control", b"no-cache"),
+                # nginx would buffer the events otherwise
+                (b"x-accel-buffering", b"no"),
+            ],
+        })
+        retry_ms = getattr(settings, "STREAM_RETRY_MS", 3000)
+        await self.write(send, f"retry: {retry_ms}\n\n".encode())
+        broker.subscribe(subscription)
+        writer = disconnect = None
+        try:
+            await broker.ready.wait()
+            subscription.safe_point = broker.floor
+            if last_event_id is not None:
+                subscription.request_replay(last_event_id)
+            writer = asyncio.ensure_future(self.write_events(subscription, send))
+            disconnect = asyncio.ensure_future(self.wait_for_disconnect(receive))
+            done, _ = await asyncio.wait(
+                [writer, disconnect],
+                timeout=getattr(settings, "STREAM_MAX_SECONDS", 900),
+                return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            broker.unsubscribe(subscription)
+            for task in (writer, disconnect):
+                if task is not None:
+                    task.cancel()
+        if writer in done:
+            writer.result()
+        elif not done:
+            # STREAM_MAX_SECONDS is up, the client reconnects
+            await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    async def write(send, body):
+        # waits while the server's send buffer is full, a slow client
+        # stops this loop and overflows its subscription queue
+        await send({"type": "http.response.body", "body": body, "more_body": True})
+
+    async def write_events(self, subscription, send):
+        heartbeat = getattr(settings, "STREAM_HEARTBEAT_SECONDS", 15)
+        while True:
+            if subscription.replay_after is not None:
+                await self.replay(subscription, send)
+                continue
+            try:
+                event, floor = await asyncio.wait_for(
+                    subscription.queue.get(), heartbeat
+                )
+            except asyncio.TimeoutError:
+                await self.write(send, b": keepalive\n\n")
+                continue
+            if event["id"] not in subscription.sent:
+                await self.write(send, format_event(event))
+            subscription.mark_sent(event, floor)
+
+    async def replay(self, subscription, send):
+        batch_size = getattr(settings, "STREAM_BATCH_SIZE", 500)
+        after, subscription.replay_after = subscription.replay_after, None
+        while True:
+            events = await database_call(read_events)(
+                after, batch_size, **subscription.filters
+            )
+            for event in events:
+                if event["id"] not in subscription.sent:
+                    await self.write(send, format_event(event))
+                    subscription.mark_sent(event)
+            if len(events) < batch_size:
+                return
+            after = events[-1]["id"]
+
+    @staticmethod
+    async def wait_for_disconnect(receive):
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+
+
+class EventStreamRouter:
+    """Serves STREAM_PATH and hands every other request to `application`."""
+
+    def __init__(self, application):
+        self.application = application
+        self.stream = InterviewEventStream()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == STREAM_PATH:
+            return await self.stream(scope, receive, send)
+        return await self.application(scope, receive, send)
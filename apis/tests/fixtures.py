@@ -0,0 +1,213 @@
+"""
+Test data. The small factories below build just what a test needs,
+`Fixtures` seeds a bit of everything for the query budget harness.
+"""
+import json
+import tempfile
+from datetime import date
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APIClient
+from apis import profiling
+from apis.authentication import issue_tokens
+from apis.models import (
+    AuditLog,
+    CandidateInfo,
+    Employee,
+    Interview,
+    InterviewRound,
+    InterviewRoundStatus,
+    Role,
+    Skill,
+    WorkExperience
+)
+from apis.selectors import refresh_experience_summaries
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def create_employee(username, role=None, is_superuser=False, skills=()):
+    """An employee with a profile of `role`, or none without one."""
+    employee = Employee.objects.create(
+        username=username,
+        email=f"{username}@example.com",
+        is_superuser=is_superuser
+    )
+    if role is not None:
+        employee.emp_profile.create(role=role).skills.set(skills)
+    return employee
+
+
+def create_candidate(email, skills=(), experience=(), **fields):
+    """
+    A candidate with `skills` and a work experience per
+    (designation, years) in `experience`, summaries refreshed.
+    """
+    candidate = CandidateInfo.objects.create(**dict({
+        "email": email,
+        "first_name": "Candidate",
+        "last_name": "Tester",
+        "gender": "Male",
+        "resume": "resume.pdf",
+    }, **fields))
+    candidate.skills.set(skills)
+    if experience:
+        WorkExperience.objects.bulk_create([
+            WorkExperience(
+                candidate=candidate,
+                designation=designation,
+                total_experience=years
+            ) for designation, years in experience
+        ])
+        refresh_experience_summaries([candidate.pk])
+        candidate.refresh_from_db()
+    return candidate
+
+
+def create_interview(hr, candidate, rounds=(), **fields):
+    """
+    An interview with a round per dict of fields in `rounds`, numbered
+    from 1, a "skills" key is set on the round.
+    """
+    interview = Interview.objects.create(employee=hr, candidate=candidate, **fields)
+    for round_no, round_fields in enumerate(rounds, 1):
+        round_fields = dict(round_fields)
+        skills = round_fields.pop("skills", ())
+        InterviewRound.objects.create(
+            interview=interview, round_no=round_no, **round_fields
+        ).skills.set(skills)
+    return interview
+
+
+def api_client(employee):
+    """An APIClient sending a bearer token of `employee`."""
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {issue_tokens(employee)['access']}"
+    )
+    return client
+
+
+class Fixtures:
+    """
+    `size` candidates with skills, experiences and an interview (round 1
+    passed, round 2 open without interviewer), `size` more candidates
+    without interview, `size` interviewers and 2 HRs.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.admin = Employee.objects.create(
+            username="admin", email="admin@example.com", is_superuser=True
+        )
+        self.password = "password"
+        self.admin.set_password(self.password)
+        self.admin.save()
+        self.admin.emp_profile.create(role=Role.HR)
+        self.hrs = [
+            Employee.objects.create(username=f"hr{i}", email=f"hr{i}@example.com")
+            for i in range(2)
+        ]
+        self.interviewers = [
+            Employee.objects.create(
+                username=f"dev{i}", email=f"dev{i}@example.com"
+            ) for i in range(size)
+        ]
+        self.skills = [
+            Skill.objects.create(name=f"skill{i}") for i in range(size + 2)
+        ]
+        for hr in self.hrs:
+            hr.emp_profile.create(role=Role.HR)
+        for interviewer in self.interviewers:
+            interviewer.emp_profile.create(role=Role.DEV).skills.set(self.skills)
+        self.candidates = [
+            CandidateInfo.objects.create(
+                email=f"candidate{i}@example.com",
+                first_name="Candidate",
+                last_name=f"Number{'x' * i}",
+                gender="Male",
+                mobile_no=f"98765{i:05d}",
+                resume="resume.pdf"
+            ) for i in range(size * 2)
+        ]
+        for candidate in self.candidates:
+            candidate.skills.set(self.skills[:2])
+        WorkExperience.objects.bulk_create([
+            WorkExperience(
+                candidate=candidate,
+                designation=f"Engineer {i}",
+                description="Backend",
+                total_experience=i + 1
+            )
+            for candidate in self.candidates for i in range(2)
+        ])
+        refresh_experience_summaries(
+            candidate.pk for candidate in self.candidates
+        )
+        self.interviews = []
+        for i, candidate in enumerate(self.candidates[:size]):
+            interview = Interview.objects.create(
+                employee=self.hrs[i % 2], candidate=candidate
+            )
+            InterviewRound.objects.create(
+                interview=interview,
+                round_no=1,
+                interviewer=self.interviewers[i],
+                status=InterviewRoundStatus.PASS,
+                rating=7,
+                date=date(2021, 1, 1)
+            ).skills.set(self.skills[:2])
+            InterviewRound.objects.create(
+                interview=interview, round_no=2
+            ).skills.set(self.skills[:1])
+            self.interviews.append(interview)
+        AuditLog.objects.bulk_create([
+            AuditLog(
+                actor=self.admin,
+                actor_username=self.admin.username,
+                action="round.update",
+                job_id=interview.job_id,
+                round_no=1
+            ) for interview in self.interviews
+        ])
+        profiling.profiles.append({"id": "fixture", "queries": [], "functions": []})
+
+    @property
+    def interview(self):
+        return self.interviews[0]
+
+    @property
+    def candidate(self):
+        return self.candidates[0]
+
+    def open_rounds(self, **fields):
+        return [
+            dict(job_id=interview.job_id, round_no=2, **fields)
+            for interview in self.interviews
+        ]
+
+    def candidate_form(self, email):
+        return {
+            "email": email,
+            "first_name": "Someone",
+            "last_name": "Else",
+            "gender": "Female",
+            "mobile_no": "9123456789",
+            "resume": SimpleUploadedFile("resume.pdf", b"%PDF-1.4"),
+            "skills": json.dumps([skill.name for skill in self.skills]),
+            "experience": json.dumps([
+                {
+                    "designation": f"Engineer {i}",
+                    "description": "Backend",
+                    "total_experience": i
+                } for i in range(self.size)
+            ]),
+        }
+
+    def round_form(self):
+        return {
+            "interviewer": self.interviewers[-1].username,
+            "date": "01-02-2021",
+            "rating": 5,
+            "remarks": "Good",
+            "skills": [skill.name for skill in self.skills],
+        }
@@ -0,0 +1,86 @@
+from unittest import mock
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from apis.admin import InterviewAdminForm
+from apis.models import CandidateInfo, Interview, Role
+from apis.paginators import EstimatedCountPaginator
+from apis.tests.fixtures import create_candidate, create_employee, create_interview
+
+
+class AdminChangelistTestCase(TestCase):
+
+    def setUp(self):
+        self.admin = create_employee("admin", Role.HR, is_superuser=True)
+        self.admin.is_staff = True
+        self.admin.save()
+        self.client.force_login(self.admin)
+        self.candidate = create_candidate("first@example.com", first_name="Asha")
+        create_candidate("second@example.com", first_name="Ravi")
+        create_interview(self.admin, self.candidate)
+
+    def get(self, model, **params):
+        response = self.client.get(
+            reverse(f"admin:apis_{model}_changelist"), params
+        )
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_changelists(self):
+        for model in ("employee", "candidateinfo", "interview", "auditlog",
+                      "outboxevent", "archivedinterview", "skill"):
+            self.get(model)
+
+    def test_employee_roles_without_a_query_per_row(self):
+        counts = []
+        for size in (2, 6):
+            for i in range(size):
+                create_employee(f"dev{size}-{i}", Role.DEV)
+            with CaptureQueriesContext(connection) as context:
+                response = self.get("employee")
+            counts.append(len(context.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+        self.assertContains(response, Role.DEV.value)
+
+    def test_candidate_search_by_prefix(self):
+        response = self.get("candidateinfo", q="Ash")
+        self.assertEqual(
+            list(response.context["cl"].result_list), [self.candidate]
+        )
+        response = self.get("candidateinfo", q="sha")
+        self.assertEqual(list(response.context["cl"].result_list), [])
+
+    def test_interview_employee_must_be_hr(self):
+        candidate = CandidateInfo.objects.get(email="second@example.com")
+        form = InterviewAdminForm(data={
+            "employee": create_employee("dev", Role.DEV).pk,
+            "candidate": candidate.pk,
+        }, instance=Interview())
+        self.assertFalse(form.is_valid())
+        self.assertIn("employee", form.errors)
+
+
+@override_settings(ESTIMATED_COUNT_THRESHOLD=1000)
+class EstimatedCountPaginatorTestCase(TestCase):
+
+    def setUp(self):
+        create_candidate("first@example.com", first_name="Asha")
+
+    @mock.patch("apis.paginators.estimate_row_count", return_value=500000)
+    def test_unfiltered_count_from_the_table_statistics(self, estimate):
+        paginator = EstimatedCountPaginator(CandidateInfo.objects.order_by("id"), 50)
+        with self.assertNumQueries(0):
+            self.assertEqual(paginator.count, 500000)
+        self.assertTrue(paginator.is_approximate)
+        filtered = EstimatedCountPaginator(
+            CandidateInfo.objects.filter(first_name="Asha").order_by("id"), 50
+        )
+        self.assertEqual(filtered.count, 1)
+        self.assertFalse(filtered.is_approximate)
+
+    @mock.patch("apis.paginators.estimate_row_count", return_value=10)
+    def test_small_tables_are_counted(self, estimate):
+        paginator = EstimatedCountPaginator(CandidateInfo.objects.order_by("id"), 50)
+        self.assertEqual(paginator.count, 1)
+        self.assertFalse(paginator.is_approximate)
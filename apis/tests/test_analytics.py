@@ -0,0 +1,133 @@
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+from apis.analytics import RoundSnapshot, calibration_report
+from apis.archive import archive_interviews
+from apis.models import (
+    Interview,
+    InterviewRound,
+    InterviewRoundStatus,
+    InterviewStatus,
+    Role,
+    Skill
+)
+from apis.tests.fixtures import create_candidate, create_employee, create_interview
+
+
+class RoundSnapshotTestCase(TestCase):
+
+    def setUp(self):
+        hr = create_employee("hr", Role.HR)
+        self.interviewer = create_employee("dev", Role.DEV)
+        self.skill = Skill.objects.create(name="Python")
+        closed_round = {
+            "interviewer": self.interviewer,
+            "status": InterviewRoundStatus.PASS,
+            "rating": 7,
+            "skills": [self.skill],
+        }
+        self.interviews = [
+            create_interview(
+                hr, create_candidate(f"candidate{i}@example.com"),
+                rounds=[closed_round, {}]
+            ) for i in range(3)
+        ]
+        self.snapshot = RoundSnapshot(path="unused")
+        self.snapshot.build(chunk_size=2)
+
+    def assertMatchesFullBuild(self):
+        full = RoundSnapshot(path="unused")
+        full.build(full=True)
+        for name, values in full.columns.items():
+            np.testing.assert_array_equal(
+                np.sort(self.snapshot.columns[name]), np.sort(values), name
+            )
+        np.testing.assert_array_equal(
+            self.snapshot.columns["round_id"], full.columns["round_id"]
+        )
+
+    def test_incremental_build_reads_the_changed_interviews(self):
+        self.assertEqual(len(self.snapshot), 6)
+        self.assertEqual(self.snapshot.build(chunk_size=2), 0)
+        first, second, third = self.interviews
+        edited = InterviewRound.objects.get(interview=first, round_no=1)
+        edited.rating = 3
+        edited.save()
+        InterviewRound.objects.get(interview=second, round_no=2).delete()
+        third.interview_round.create(round_no=3)
+        self.assertEqual(self.snapshot.build(chunk_size=2), 6)
+        self.assertEqual(len(self.snapshot), 6)
+        self.assertIn(3, self.snapshot.columns["rating"])
+        self.assertMatchesFullBuild()
+
+    def test_archived_rounds_are_kept(self):
+        interview = self.interviews[0]
+        Interview.objects.filter(pk=interview.pk).update(
+            status=InterviewStatus.REJECT
+        )
+        self.assertEqual(archive_interviews([interview.pk]), 1)
+        self.assertEqual(self.snapshot.build(), 2)
+        self.assertEqual(len(self.snapshot), 6)
+        self.assertMatchesFullBuild()
+
+    def test_deleted_interview(self):
+        self.interviews[0].delete()
+        self.snapshot.build()
+        self.assertEqual(len(self.snapshot), 4)
+        self.assertEqual(len(self.snapshot.columns["skill_id"]), 2)
+        self.assertMatchesFullBuild()
+
+
+class CalibrationReportTestCase(SimpleTestCase):
+
+    def setUp(self):
+        # interviewer 1 rates 8 and passes, interviewer 2 rates 4 and
+        # passes half, skill 10 on rounds 1 and 3, round 5 is open
+        snapshot = RoundSnapshot(path="unused")
+        snapshot.columns = {
+            "round_id": np.array([1, 2, 3, 4, 5]),
+            "interview_id": np.array([1, 1, 2, 2, 3]),
+            "interviewer_id": np.array([1, 1, 2, 2, 1]),
+            "rating": np.array([8, 8, 4, 4, 0], dtype=np.int16),
+            "status": np.array([1, 3, 2, 1, 0], dtype=np.int8),
+            "skill_round_id": np.array([1, 3, 5, 2, 4]),
+            "skill_id": np.array([10, 10, 10, 20, 20]),
+        }
+        self.snapshot = snapshot
+
+    def rows(self, min_rounds):
+        return {
+            (row["interviewer_id"], row["skill_id"]): row
+            for row in calibration_report(self.snapshot, min_rounds)
+        }
+
+    def test_overall(self):
+        rows = self.rows(min_rounds=2)
+        self.assertEqual(set(rows), {(1, None), (2, None)})
+        # every closed round: mean 6, std 2, pass rate 0.75
+        self.assertEqual(rows[1, None], {
+            "interviewer_id": 1,
+            "skill_id": None,
+            "rounds": 2,
+            "mean_rating": 8.0,
+            "variance": 0.0,
+            "z_score": round(2 / (2 / np.sqrt(2)), 3),
+            "pass_rate": 1.0,
+            "pass_rate_delta": 0.25,
+        })
+        self.assertEqual(rows[2, None]["z_score"], -1.414)
+        self.assertEqual(rows[2, None]["pass_rate_delta"], -0.25)
+
+    def test_per_skill_against_the_skill(self):
+        rows = self.rows(min_rounds=1)
+        # skill 10: ratings 8 and 4, one pass out of two closed rounds
+        self.assertEqual(rows[1, 10]["rounds"], 1)
+        self.assertEqual(rows[1, 10]["z_score"], 1.0)
+        self.assertEqual(rows[1, 10]["pass_rate_delta"], 0.5)
+        self.assertEqual(rows[2, 10]["z_score"], -1.0)
+        self.assertEqual(rows[2, 10]["pass_rate_delta"], -0.5)
+        # skill 20: ratings 8 and 4, both passed
+        self.assertEqual(rows[2, 20]["pass_rate_delta"], 0.0)
+
+    def test_no_closed_rounds(self):
+        self.snapshot.columns["status"][:] = 0
+        self.assertEqual(calibration_report(self.snapshot), [])
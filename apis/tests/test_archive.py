@@ -0,0 +1,156 @@
+from django.db import connection, transaction
+from django.db.models.signals import post_delete
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from apis.archive import archive_interviews, restore_interviews
+from apis.models import (
+    ArchivedInterview,
+    ArchivedInterviewRound,
+    ChangeLogEntry,
+    ChangeResource,
+    EmployeeProfile,
+    Interview,
+    InterviewRound,
+    InterviewRoundStatus,
+    InterviewStatus,
+    Role,
+    Skill
+)
+from apis.tests.fixtures import (
+    api_client,
+    create_candidate,
+    create_employee,
+    create_interview
+)
+
+
+class ArchiveTestCase(TestCase):
+
+    def setUp(self):
+        self.hr = create_employee("hr", Role.HR)
+        self.interviewer = create_employee("dev", Role.DEV)
+        self.skills = [Skill.objects.create(name=name) for name in ("Go", "SQL")]
+        self.candidate = create_candidate("candidate@example.com")
+        self.interviews = [
+            self.create_interview() for _ in range(2)
+        ]
+        self.interview = self.interviews[0]
+        self.client = api_client(create_employee("admin", is_superuser=True))
+
+    def create_interview(self):
+        return create_interview(
+            self.hr, self.candidate, status=InterviewStatus.REJECT, rounds=[{
+                "interviewer": self.interviewer,
+                "status": InterviewRoundStatus.PASS,
+                "rating": 6,
+                "skills": self.skills,
+            }, {"interviewer": self.interviewer, "skills": self.skills[:1]}]
+        )
+
+    def interview_ids(self):
+        return [interview.pk for interview in self.interviews]
+
+    def test_archive_records_one_change_per_interview(self):
+        after = ChangeLogEntry.objects.order_by("-id").values_list(
+            "id", flat=True
+        ).first()
+        self.assertEqual(archive_interviews(self.interview_ids()), 2)
+        entries = ChangeLogEntry.objects.filter(id__gt=after)
+        self.assertEqual(
+            sorted(entries.values_list("resource", "object_id", "deleted")),
+            [(ChangeResource.INTERVIEW, pk, False) for pk in self.interview_ids()]
+        )
+
+    def test_archive_query_count_does_not_grow(self):
+        counts = []
+        for size in (2, 6):
+            with transaction.atomic():
+                interviews = [
+                    self.create_interview().pk for _ in range(size)
+                ]
+                with CaptureQueriesContext(connection) as context:
+                    archive_interviews(interviews)
+                counts.append(len(context.captured_queries))
+                transaction.set_rollback(True)
+        self.assertEqual(counts[0], counts[1])
+
+    def test_archive_moves_rows_without_delete_signals(self):
+        deleted = []
+
+        def receiver(sender, **kwargs):
+            deleted.append(sender)
+
+        post_delete.connect(receiver)
+        try:
+            archive_interviews(self.interview_ids())
+        finally:
+            post_delete.disconnect(receiver)
+        self.assertEqual(deleted, [])
+        self.assertFalse(Interview.objects.filter(
+            pk__in=self.interview_ids()
+        ).exists())
+        self.assertFalse(InterviewRound.objects.filter(
+            interview_id__in=self.interview_ids()
+        ).exists())
+        self.assertFalse(InterviewRound.skills.through.objects.exists())
+        self.assertEqual(ArchivedInterviewRound.objects.count(), 4)
+        self.assertEqual(ArchivedInterviewRound.skills.through.objects.count(), 6)
+        # the open rounds no longer count against the interviewer
+        self.assertEqual(EmployeeProfile.objects.get(
+            user=self.interviewer
+        ).open_rounds, 0)
+
+    def test_change_feed_renders_archived_interviews(self):
+        url = reverse("change-feed")
+        cursor = self.client.get(url, {"start": "now"}).data["next_cursor"]
+        archive_interviews(self.interview_ids())
+        response = self.client.get(url, {"cursor": cursor})
+        self.assertEqual(response.status_code, 200)
+        results = response.data["results"]
+        self.assertEqual(
+            sorted(result["id"] for result in results), self.interview_ids()
+        )
+        for result in results:
+            self.assertFalse(result["deleted"])
+            self.assertIsNotNone(result["data"]["archived_at"])
+            self.assertEqual(len(result["data"]["interview_rounds"]), 2)
+
+    def test_restore_round_trip(self):
+        interview = Interview.objects.get(pk=self.interview.pk)
+        interview.overall_rating = 8
+        interview.save()
+        round_one = InterviewRound.objects.get(interview=interview, round_no=1)
+        round_one.remarks = "Strong"
+        round_one.save()
+        rounds = list(InterviewRound.objects.filter(
+            interview=interview
+        ).order_by("round_no").values(
+            "id", "round_no", "interviewer_id", "status", "rating", "version"
+        ))
+        skills = set(InterviewRound.objects.get(
+            interview=interview, round_no=1
+        ).skills.values_list("id", flat=True))
+        archive_interviews([interview.pk])
+        self.assertFalse(Interview.objects.filter(pk=interview.pk).exists())
+        self.assertTrue(ArchivedInterview.objects.filter(pk=interview.pk).exists())
+        response = self.client.get(reverse(
+            "interview-list-retrieve-detail", kwargs={"job_id": interview.job_id}
+        ))
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.data["archived_at"])
+        self.assertEqual(response.data["version"], interview.version)
+
+        self.assertEqual(restore_interviews([interview.job_id]), 1)
+        self.assertFalse(ArchivedInterview.objects.filter(pk=interview.pk).exists())
+        self.assertEqual(
+            Interview.objects.get(pk=interview.pk).version, interview.version
+        )
+        self.assertEqual(list(InterviewRound.objects.filter(
+            interview_id=interview.pk
+        ).order_by("round_no").values(
+            "id", "round_no", "interviewer_id", "status", "rating", "version"
+        )), rounds)
+        self.assertEqual(set(InterviewRound.objects.get(
+            interview_id=interview.pk, round_no=1
+        ).skills.values_list("id", flat=True)), skills)
@@ -0,0 +1,135 @@
+from unittest import mock
+from django.db.models import Sum
+from django.test import TestCase
+from django.urls import reverse
+from apis import views
+from apis.assignment import InterviewerPool, bulk_auto_assign
+from apis.models import EmployeeProfile, InterviewRound, Role, Skill
+from apis.tests.fixtures import (
+    api_client,
+    create_candidate,
+    create_employee,
+    create_interview
+)
+
+
+class InterviewRoundAutoAssignTestCase(TestCase):
+
+    def setUp(self):
+        self.python, self.go = [
+            Skill.objects.create(name=name) for name in ("Python", "Go")
+        ]
+        self.pythonista = create_employee("dev0", Role.DEV, skills=[self.python])
+        self.polyglot = create_employee(
+            "dev1", Role.DEV, skills=[self.python, self.go]
+        )
+        hr = create_employee("hr", Role.HR)
+        self.interviews = [
+            create_interview(
+                hr,
+                create_candidate(f"candidate{i}@example.com"),
+                rounds=[{"skills": [self.python]}]
+            ) for i in range(3)
+        ]
+        self.client = api_client(hr)
+
+    @staticmethod
+    def open_rounds_load():
+        return dict(EmployeeProfile.objects.filter(
+            role=Role.DEV
+        ).values_list("user_id", "open_rounds"))
+
+    def refs(self, interviews=None):
+        return [
+            {"job_id": interview.job_id, "round_no": 1}
+            for interview in interviews or self.interviews
+        ]
+
+    def auto_assign(self, refs):
+        response = self.client.post(
+            reverse("round-auto-assign"), {"rounds": refs}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_least_loaded_then_larger_skill_overlap(self):
+        pool = InterviewerPool.load_eligible()
+        # equal loads, a Python and Go round overlaps the polyglot on both
+        self.assertEqual(
+            pool.pick([self.python.pk, self.go.pk]), self.polyglot.pk
+        )
+        self.assertEqual(pool.pick([self.python.pk]), self.pythonista.pk)
+        pool.charge(self.pythonista.pk)
+        self.assertEqual(pool.pick([self.python.pk]), self.polyglot.pk)
+        self.assertEqual(pool.pick([self.go.pk]), self.polyglot.pk)
+
+    def test_spreads_rounds_and_charges_the_counters(self):
+        data = self.auto_assign(self.refs())
+        self.assertEqual(data["errors"], [])
+        self.assertEqual(
+            sorted(row["interviewer"] for row in data["assigned"]),
+            ["dev0", "dev0", "dev1"]
+        )
+        self.assertEqual(
+            self.open_rounds_load(), {self.pythonista.pk: 2, self.polyglot.pk: 1}
+        )
+
+    def test_round_without_an_eligible_interviewer(self):
+        interview_round = InterviewRound.objects.get(interview=self.interviews[0])
+        interview_round.skills.set([Skill.objects.create(name="Rust")])
+        data = self.auto_assign(self.refs(self.interviews[:1]))
+        self.assertEqual(data["assigned"], [])
+        self.assertEqual(
+            data["errors"][0]["error"],
+            "No eligible interviewer found for the round skills."
+        )
+
+    def test_repeated_ref_is_assigned_once(self):
+        ref = self.refs()[0]
+        data = self.auto_assign([ref, ref])
+        self.assertEqual(len(data["assigned"]), 1)
+        self.assertEqual(data["errors"], [{
+            "job_id": ref["job_id"],
+            "round_no": ref["round_no"],
+            "error": "Round is listed more than once."
+        }])
+        self.assertEqual(sum(self.open_rounds_load().values()), 1)
+        self.assertEqual(
+            InterviewRound.objects.get(interview=self.interviews[0]).version, 2
+        )
+
+    def test_round_assigned_concurrently_is_reported_not_reassigned(self):
+        first_round = InterviewRound.objects.get(interview=self.interviews[0])
+
+        def race_then_assign(rounds):
+            # another request assigns the first round after this one
+            # read it and before it locks it
+            racer = InterviewRound.objects.get(pk=first_round.pk)
+            racer.interviewer = self.polyglot
+            racer.save()
+            return bulk_auto_assign(rounds)
+
+        with mock.patch.object(views, "bulk_auto_assign", race_then_assign):
+            data = self.auto_assign(self.refs(self.interviews[:2]))
+        self.assertEqual(
+            [row["job_id"] for row in data["assigned"]],
+            [self.interviews[1].job_id]
+        )
+        self.assertEqual(data["errors"], [{
+            "job_id": self.interviews[0].job_id,
+            "round_no": 1,
+            "error": "Round already has an interviewer."
+        }])
+        first_round.refresh_from_db()
+        self.assertEqual(
+            (first_round.interviewer_id, first_round.version),
+            (self.polyglot.pk, 2)
+        )
+        # one open round each, the raced round counted once
+        self.assertEqual(
+            self.open_rounds_load(), {self.pythonista.pk: 1, self.polyglot.pk: 1}
+        )
+        self.assertEqual(
+            EmployeeProfile.objects.aggregate(total=Sum("open_rounds"))["total"],
+            InterviewRound.objects.filter(interviewer__isnull=False).count()
+        )
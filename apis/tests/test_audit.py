@@ -0,0 +1,86 @@
+from unittest import mock
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from apis.audit import AuditBuffer, build_audit_entry, record_audit
+from apis.models import AuditLog, Role
+from apis.tests.fixtures import create_employee
+
+
+class AuditBufferTestCase(TestCase):
+
+    def setUp(self):
+        self.hr = create_employee("hr", Role.HR)
+
+    def entries(self, count, action="round.update"):
+        return [
+            build_audit_entry(self.hr, action, job_id=f"INT-{i}", round_no=1)
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def failing_inserts():
+        return mock.patch.object(
+            AuditLog.objects, "bulk_create", side_effect=DatabaseError("down")
+        )
+
+    def test_written_once_max_size_entries_wait(self):
+        buffer = AuditBuffer(max_size=3, flush_interval=0)
+        for entry in self.entries(2):
+            buffer.add(entry)
+        self.assertEqual(AuditLog.objects.count(), 0)
+        buffer.add(self.entries(1)[0])
+        self.assertEqual(AuditLog.objects.count(), 3)
+        self.assertEqual(len(buffer), 0)
+
+    def test_failed_batch_is_retried(self):
+        buffer = AuditBuffer(max_size=100, flush_interval=0)
+        for entry in self.entries(3):
+            buffer.add(entry)
+        with self.failing_inserts(), self.assertLogs("apps.audit", "ERROR"):
+            buffer.flush()
+        self.assertEqual(len(buffer), 3)
+        buffer.add(self.entries(1, "round.auto_assign")[0])
+        buffer.flush()
+        self.assertEqual(len(buffer), 0)
+        # the failed batch first, in order
+        self.assertEqual(
+            list(AuditLog.objects.order_by("id").values_list("action", flat=True)),
+            ["round.update"] * 3 + ["round.auto_assign"]
+        )
+
+    def test_flushes_wait_for_the_retry(self):
+        buffer = AuditBuffer(max_size=2, flush_interval=60)
+        self.addCleanup(buffer._take)
+        with self.failing_inserts(), self.assertLogs("apps.audit", "ERROR"):
+            buffer.flush()
+            for entry in self.entries(2):
+                buffer.add(entry)
+        # max_size reached, but the failed insert is retried in 60s
+        for entry in self.entries(2):
+            buffer.add(entry)
+        buffer.flush()
+        self.assertEqual(AuditLog.objects.count(), 0)
+        buffer.flush(force=True)
+        self.assertEqual(AuditLog.objects.count(), 4)
+
+    def test_backlog_is_bounded(self):
+        buffer = AuditBuffer(max_size=100, flush_interval=0, max_backlog=3)
+        for entry in self.entries(5):
+            buffer.add(entry)
+        with self.failing_inserts(), self.assertLogs("apps.audit", "ERROR") as logs:
+            buffer.flush()
+        self.assertIn("dropped the 2 oldest entries", logs.output[-1])
+        buffer.flush()
+        self.assertEqual(
+            sorted(AuditLog.objects.values_list("job_id", flat=True)),
+            ["INT-2", "INT-3", "INT-4"]
+        )
+
+    @override_settings(AUDIT_LOG_DURABILITY="sync")
+    def test_sync_durability_inserts_right_away(self):
+        record_audit(self.hr, "interview.reject", job_id="INT-1")
+        entry = AuditLog.objects.get()
+        self.assertEqual(
+            (entry.actor_username, entry.action, entry.job_id),
+            ("hr", "interview.reject", "INT-1")
+        )
@@ -0,0 +1,74 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apis.models import Role
+from apis.tests.fixtures import create_employee
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    REVOKED_TOKENS_CACHE_SECONDS=30
+)
+class TokenTestCase(TestCase):
+
+    def setUp(self):
+        self.admin = create_employee("admin", Role.HR, is_superuser=True)
+        self.admin.set_password("password")
+        self.admin.save()
+        self.client = APIClient()
+        response = self.client.post(reverse("token-obtain"), {
+            "username": self.admin.username, "password": "password",
+        }, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.tokens = response.data
+
+    def get_audit_log(self, access):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        return client.get(reverse("audit-log-list"))
+
+    def refresh(self, refresh):
+        return self.client.post(
+            reverse("token-refresh"), {"refresh": refresh}, format="json"
+        )
+
+    def test_wrong_password(self):
+        response = self.client.post(reverse("token-obtain"), {
+            "username": self.admin.username, "password": "wrong",
+        }, format="json")
+        self.assertEqual(response.status_code, 401)
+
+    def test_access_token_authenticates(self):
+        self.assertEqual(self.get_audit_log(self.tokens["access"]).status_code, 200)
+        response = self.get_audit_log(self.tokens["refresh"])
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], "Bearer")
+        self.assertEqual(self.get_audit_log("garbage").status_code, 401)
+
+    def test_refresh_token_is_good_for_one_refresh(self):
+        response = self.refresh(self.tokens["refresh"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_audit_log(response.data["access"]).status_code, 200)
+        # the old session is revoked, its refresh token can't be reused
+        self.assertEqual(self.refresh(self.tokens["refresh"]).status_code, 401)
+        self.assertEqual(self.get_audit_log(self.tokens["access"]).status_code, 401)
+
+    def test_refresh_rereads_the_employee(self):
+        self.admin.is_active = False
+        self.admin.save()
+        self.assertEqual(self.refresh(self.tokens["refresh"]).status_code, 401)
+
+    def test_revoke_ends_the_session(self):
+        response = self.client.post(
+            reverse("token-revoke"), {"refresh": self.tokens["refresh"]},
+            format="json"
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.get_audit_log(self.tokens["access"]).status_code, 401)
+        self.assertEqual(self.refresh(self.tokens["refresh"]).status_code, 401)
+
+    def test_expired_access_token(self):
+        with override_settings(ACCESS_TOKEN_SECONDS=-1):
+            response = self.get_audit_log(self.tokens["access"])
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data["detail"], "Token has expired.")
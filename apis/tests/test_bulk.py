@@ -0,0 +1,190 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from apis.models import (
+    AuditLog,
+    ChangeLogEntry,
+    ChangeResource,
+    EmployeeProfile,
+    Interview,
+    InterviewRound,
+    Role,
+    Skill
+)
+from apis.tests.fixtures import (
+    api_client,
+    create_candidate,
+    create_employee,
+    create_interview
+)
+
+
+@override_settings(AUDIT_LOG_DURABILITY="sync")
+class BulkRoundUpdateTestCase(TestCase):
+
+    def setUp(self):
+        hr = create_employee("hr", Role.HR)
+        self.interviewers = [
+            create_employee(f"dev{i}", Role.DEV) for i in range(2)
+        ]
+        self.skills = [Skill.objects.create(name=name) for name in ("Go", "SQL")]
+        self.interviews = [
+            create_interview(
+                hr, create_candidate(f"candidate{i}@example.com"), rounds=[{
+                    "interviewer": self.interviewers[0],
+                    "skills": self.skills[:1],
+                }]
+            ) for i in range(2)
+        ]
+        self.client = api_client(hr)
+        self.url = reverse("round-bulk-update")
+
+    def post(self, *rounds):
+        return self.client.post(self.url, {"rounds": list(rounds)}, format="json")
+
+    def row(self, index, **fields):
+        return dict(job_id=self.interviews[index].job_id, round_no=1, **fields)
+
+    def open_rounds(self):
+        return [
+            EmployeeProfile.objects.get(user=interviewer).open_rounds
+            for interviewer in self.interviewers
+        ]
+
+    def test_updates_every_row(self):
+        response = self.post(
+            self.row(0, interviewer="dev1", rating=7, skills=["SQL"], version=1),
+            self.row(1, remarks="Strong", date="01-02-2021"),
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            [row["version"] for row in response.data["updated"]], [2, 2]
+        )
+        first, second = (
+            InterviewRound.objects.get(interview=interview)
+            for interview in self.interviews
+        )
+        self.assertEqual(first.interviewer, self.interviewers[1])
+        self.assertEqual(first.rating, 7)
+        self.assertEqual(list(first.skills.all()), [self.skills[1]])
+        self.assertEqual(second.remarks, "Strong")
+        self.assertEqual(list(second.skills.all()), [self.skills[0]])
+        self.assertEqual(self.open_rounds(), [1, 1])
+        self.assertEqual(
+            AuditLog.objects.filter(action="round.bulk_update").count(), 2
+        )
+        self.assertEqual(
+            set(ChangeLogEntry.objects.values_list("object_id", flat=True)),
+            {interview.pk for interview in self.interviews}
+        )
+
+    def test_invalid_rows_reject_the_whole_request(self):
+        response = self.post(
+            self.row(0, rating=5),
+            self.row(1, interviewer="nobody", skills=["Cobol"]),
+            dict(job_id="missing", round_no=1),
+            self.row(1),
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [int(error["index"]) for error in response.data["errors"]],
+            [1, 2, 3]
+        )
+        self.assertEqual(len(response.data["errors"][0]["errors"]), 2)
+        self.assertEqual(
+            response.data["errors"][2]["errors"],
+            ["Round is listed more than once."]
+        )
+        self.assertFalse(InterviewRound.objects.filter(rating=5).exists())
+
+    def test_stale_version_is_409(self):
+        response = self.post(self.row(0, rating=5), self.row(1, version=2))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(int(response.data["errors"][0]["index"]), 1)
+        self.assertFalse(InterviewRound.objects.filter(rating=5).exists())
+
+    def test_row_limit(self):
+        response = self.post(*[self.row(0)] * 201)
+        self.assertEqual(response.status_code, 400)
+
+
+class BulkAssignInterviewTestCase(TestCase):
+
+    def setUp(self):
+        self.hrs = [create_employee(f"hr{i}", Role.HR) for i in range(2)]
+        self.candidates = [
+            create_candidate(f"candidate{i}@example.com") for i in range(3)
+        ]
+        self.client = api_client(create_employee("admin", is_superuser=True))
+        self.url = reverse("interview-bulk-create")
+
+    def post(self, **data):
+        return self.client.post(self.url, data, format="json")
+
+    def test_round_robin_over_the_given_hrs(self):
+        response = self.post(
+            candidates=[
+                str(self.candidates[0].pk),
+                self.candidates[1].email,
+                self.candidates[2].email,
+            ],
+            employees=["hr1", str(self.hrs[0].pk)]
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        created = response.data["created"]
+        self.assertEqual(
+            [(row["candidate"], row["employee"]) for row in created], [
+                (self.candidates[0].email, "hr1"),
+                (self.candidates[1].email, "hr0"),
+                (self.candidates[2].email, "hr1"),
+            ]
+        )
+        job_ids = [row["job_id"] for row in created]
+        self.assertEqual(len(set(job_ids)), 3)
+        self.assertEqual(
+            sorted(Interview.objects.values_list("job_id", flat=True)),
+            sorted(job_ids)
+        )
+        self.assertEqual(ChangeLogEntry.objects.filter(
+            resource=ChangeResource.INTERVIEW
+        ).count(), 3)
+
+    def test_every_active_hr_by_default(self):
+        self.hrs[1].is_active = False
+        self.hrs[1].save()
+        response = self.post(candidates=[
+            candidate.email for candidate in self.candidates
+        ])
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(
+            {row["employee"] for row in response.data["created"]}, {"hr0"}
+        )
+
+    def test_job_ids_continue_the_sequence(self):
+        single = create_interview(self.hrs[0], self.candidates[0])
+        response = self.post(candidates=[
+            self.candidates[1].email, self.candidates[2].email
+        ])
+        numbers = [
+            int(job_id.rsplit("-", 1)[1]) for job_id in [single.job_id] + [
+                row["job_id"] for row in response.data["created"]
+            ]
+        ]
+        self.assertEqual(numbers, list(range(numbers[0], numbers[0] + 3)))
+
+    def test_invalid(self):
+        developer = create_employee("dev", Role.DEV)
+        for data in (
+            {"candidates": ["nobody@example.com"]},
+            {"candidates": [self.candidates[0].email] * 2},
+            {"candidates": [self.candidates[0].email], "employees": ["dev"]},
+            {"candidates": [self.candidates[0].email],
+             "employees": [str(developer.pk)]},
+        ):
+            response = self.post(**data)
+            self.assertEqual(response.status_code, 400, data)
+        self.assertFalse(Interview.objects.exists())
+        # admins only
+        response = api_client(self.hrs[0]).post(self.url, {
+            "candidates": [self.candidates[0].email]
+        }, format="json")
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,38 @@
+from django.test import TestCase
+from django.urls import reverse
+from apis.models import Role
+from apis.tests.fixtures import api_client, create_candidate, create_employee
+
+
+class CandidateListTestCase(TestCase):
+
+    def setUp(self):
+        self.client = api_client(create_employee("hr", Role.HR))
+        self.senior = create_candidate("senior@example.com", experience=[
+            ("Engineer", 1), ("Engineer", 2), ("Architect", 7)
+        ])
+        self.junior = create_candidate("junior@example.com", experience=[
+            ("Engineer", 1), ("Engineer", 2)
+        ])
+        self.fresher = create_candidate("fresher@example.com")
+
+    def ids(self, **params):
+        response = self.client.get(reverse("candidates-list"), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return sorted(candidate["id"] for candidate in response.data)
+
+    def test_experience_summary(self):
+        response = self.client.get(
+            reverse("candidates-detail", kwargs={"pk": self.senior.pk})
+        )
+        self.assertEqual(response.data["experience_years"], 10)
+        self.assertEqual(response.data["latest_designation"], "Architect")
+        self.assertEqual(response.data["experience_count"], 3)
+
+    def test_experience_filters(self):
+        self.assertEqual(self.ids(min_experience=4), [self.senior.pk])
+        self.assertEqual(
+            self.ids(min_experience=3), sorted([self.senior.pk, self.junior.pk])
+        )
+        self.assertEqual(self.ids(designation="arch"), [self.senior.pk])
+        self.assertEqual(self.ids(designation="tect"), [])
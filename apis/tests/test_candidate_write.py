@@ -0,0 +1,114 @@
+import json
+import shutil
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from apis.models import ChangeLogEntry, ChangeResource, Role, Skill, WorkExperience
+from apis.tests.fixtures import (
+    MEDIA_ROOT,
+    api_client,
+    create_candidate,
+    create_employee
+)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class CandidateNestedWriteTestCase(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.python, self.go = [
+            Skill.objects.create(name=name) for name in ("Python", "Go")
+        ]
+        self.candidate = create_candidate(
+            "candidate@example.com",
+            skills=[self.python],
+            experience=[("Engineer", 2), ("Lead", 3)]
+        )
+        self.experiences = list(
+            self.candidate.experiences.order_by("id")
+        )
+        self.client = api_client(create_employee("hr", Role.HR))
+        self.url = reverse("candidates-detail", kwargs={"pk": self.candidate.pk})
+
+    def form(self, **fields):
+        form = {
+            "email": self.candidate.email,
+            "first_name": "Candidate",
+            "last_name": "Tester",
+            "gender": "Male",
+            "resume": SimpleUploadedFile("resume.pdf", b"%PDF-1.4"),
+            "skills": json.dumps(["Python"]),
+        }
+        form.update({
+            key: value if isinstance(value, str) else json.dumps(value)
+            for key, value in fields.items()
+        })
+        return form
+
+    def experience_rows(self):
+        return list(WorkExperience.objects.filter(
+            candidate=self.candidate
+        ).order_by("id").values_list("id", "designation", "total_experience"))
+
+    def test_left_out_experience_is_kept(self):
+        response = self.client.put(self.url, self.form(), format="multipart")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(len(self.experience_rows()), 2)
+
+    def test_empty_experience_removes_them_on_put(self):
+        response = self.client.put(
+            self.url, self.form(experience=[]), format="multipart"
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.experience_rows(), [])
+        self.assertEqual(response.data["experience_count"], 0)
+
+    def test_diff_updates_creates_and_removes(self):
+        kept, removed = self.experiences
+        response = self.client.put(self.url, self.form(experience=[
+            {"id": kept.pk, "designation": "Senior Engineer", "total_experience": 2},
+            {"designation": "Architect", "total_experience": 5},
+        ]), format="multipart")
+        self.assertEqual(response.status_code, 200, response.data)
+        rows = self.experience_rows()
+        self.assertEqual(rows[0], (kept.pk, "Senior Engineer", 2))
+        self.assertEqual(rows[1][1:], ("Architect", 5))
+        self.assertNotIn(removed.pk, [row[0] for row in rows])
+        self.assertEqual(response.data["experience_years"], 7)
+
+    def test_patch_keeps_the_experiences_left_out(self):
+        response = self.client.patch(self.url, {"experience": json.dumps([
+            {"designation": "Architect", "total_experience": 5},
+        ])}, format="multipart")
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(len(self.experience_rows()), 3)
+
+    def test_invalid_experience_ids_are_400(self):
+        other = create_candidate("other@example.com", experience=[("QA", 1)])
+        other_id = other.experiences.get().pk
+        for exp_id in ("abc", 1.5, -1, other_id):
+            response = self.client.patch(self.url, {"experience": json.dumps([
+                {"id": exp_id, "designation": "X", "total_experience": 1},
+            ])}, format="multipart")
+            self.assertEqual(response.status_code, 400, exp_id)
+        self.assertEqual(len(self.experience_rows()), 2)
+
+    def test_skill_diff_records_the_candidate_change(self):
+        after = ChangeLogEntry.objects.order_by("-id").first().pk
+        response = self.client.patch(
+            self.url, {"skills": json.dumps(["Go"])}, format="multipart"
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            list(self.candidate.skills.values_list("name", flat=True)), ["Go"]
+        )
+        self.assertTrue(ChangeLogEntry.objects.filter(
+            id__gt=after,
+            resource=ChangeResource.CANDIDATE,
+            object_id=self.candidate.pk
+        ).exists())
@@ -0,0 +1,172 @@
+from datetime import timedelta
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from apis import gaps
+from apis.changes import encode_cursor
+from apis.gaps import SequenceGaps
+from apis.models import ChangeLogEntry, ChangeResource, Role, WorkExperience
+from apis.tests.fixtures import api_client, create_candidate, create_employee
+
+
+@override_settings(CHANGE_LOG_RETENTION_DAYS=30)
+class ChangeFeedTestCase(TestCase):
+
+    def setUp(self):
+        self.candidates = [
+            create_candidate(f"candidate{i}@example.com") for i in range(4)
+        ]
+        self.client = api_client(create_employee("hr", Role.HR))
+        self.url = reverse("change-feed")
+        self.cursor = self.client.get(
+            self.url, {"start": "now"}
+        ).data["next_cursor"]
+
+    def read(self, cursor=None, **params):
+        if cursor:
+            params["cursor"] = cursor
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    @staticmethod
+    def changes(page):
+        return [
+            (result["resource"], result["id"], result["deleted"])
+            for result in page["results"]
+        ]
+
+    @staticmethod
+    def record_at(sequence, candidate):
+        """A change with an id picked by the test, as allocated earlier."""
+        ChangeLogEntry.objects.create(
+            id=sequence, resource=ChangeResource.CANDIDATE, object_id=candidate.pk
+        )
+
+    @staticmethod
+    def latest_sequence():
+        return ChangeLogEntry.objects.order_by("-id").first().pk
+
+    def test_full_download_from_the_oldest_change(self):
+        page = self.read()
+        self.assertIn(
+            (ChangeResource.CANDIDATE, self.candidates[0].pk, False),
+            self.changes(page)
+        )
+        self.assertEqual(self.read(page["next_cursor"])["results"], [])
+
+    def test_cursor_continues_after_the_last_change(self):
+        self.assertEqual(self.read(self.cursor)["results"], [])
+        candidate = self.candidates[0]
+        WorkExperience.objects.create(
+            candidate=candidate, designation="Lead", total_experience=4
+        )
+        candidate.first_name = "Renamed"
+        candidate.save()
+        page = self.read(self.cursor)
+        # merged to the last change of the candidate
+        self.assertEqual(
+            self.changes(page), [(ChangeResource.CANDIDATE, candidate.pk, False)]
+        )
+        self.assertEqual(page["results"][0]["data"]["first_name"], "Renamed")
+        self.assertFalse(page["has_more"])
+        self.assertEqual(self.read(page["next_cursor"])["results"], [])
+
+    def test_pages(self):
+        for candidate in self.candidates:
+            candidate.save()
+        first = self.read(self.cursor, page_size=3)
+        self.assertEqual(len(first["results"]), 3)
+        self.assertTrue(first["has_more"])
+        second = self.read(first["next_cursor"], page_size=3)
+        self.assertEqual(
+            [result["id"] for result in first["results"] + second["results"]],
+            [candidate.pk for candidate in self.candidates]
+        )
+
+    def test_deletes_are_tombstones(self):
+        candidate = self.candidates[-1]
+        candidate_id = candidate.pk
+        candidate.delete()
+        page = self.read(self.cursor)
+        self.assertEqual(
+            self.changes(page), [(ChangeResource.CANDIDATE, candidate_id, True)]
+        )
+        self.assertIsNone(page["results"][0]["data"])
+
+    def test_change_committed_after_a_newer_one_is_read(self):
+        latest = self.latest_sequence()
+        first, second = self.candidates[:2]
+        self.record_at(latest + 2, second)
+        page = self.read(self.cursor)
+        self.assertEqual(
+            self.changes(page), [(ChangeResource.CANDIDATE, second.pk, False)]
+        )
+        # the transaction holding latest + 1 commits long after
+        with override_settings(CHANGE_FEED_GAP_TIMEOUT_SECONDS=3600):
+            self.record_at(latest + 1, first)
+            page = self.read(page["next_cursor"])
+        self.assertEqual(
+            self.changes(page), [(ChangeResource.CANDIDATE, first.pk, False)]
+        )
+        self.assertEqual(self.read(page["next_cursor"])["results"], [])
+
+    def test_start_cursor_waits_for_the_gaps_below_the_newest_change(self):
+        latest = self.latest_sequence()
+        self.record_at(latest + 2, self.candidates[1])
+        cursor = self.read(start="now")["next_cursor"]
+        self.record_at(latest + 1, self.candidates[0])
+        self.assertEqual(
+            self.changes(self.read(cursor)),
+            [(ChangeResource.CANDIDATE, self.candidates[0].pk, False)]
+        )
+
+    @override_settings(CHANGE_FEED_GAP_TIMEOUT_SECONDS=0)
+    def test_gaps_time_out(self):
+        latest = self.latest_sequence()
+        self.record_at(latest + 2, self.candidates[1])
+        cursor = self.read(self.cursor)["next_cursor"]
+        self.record_at(latest + 1, self.candidates[0])
+        self.assertEqual(self.read(cursor)["results"], [])
+
+    def test_expired_cursor_is_410(self):
+        cursor = encode_cursor(
+            SequenceGaps(self.latest_sequence()),
+            timezone.now() - timedelta(days=31)
+        )
+        response = self.client.get(self.url, {"cursor": cursor})
+        self.assertEqual(response.status_code, 410)
+
+    def test_tampered_cursor_is_400(self):
+        response = self.client.get(self.url, {"cursor": self.cursor + "x"})
+        self.assertEqual(response.status_code, 400)
+
+
+class SequenceGapsTestCase(SimpleTestCase):
+
+    def test_gaps_fill_as_the_missing_ids_show_up(self):
+        sequence_gaps = SequenceGaps(high=1)
+        for sequence in (2, 5, 9):
+            self.assertTrue(sequence_gaps.add(sequence, now=100))
+        self.assertEqual(sequence_gaps.high, 9)
+        self.assertEqual(sequence_gaps.to_list(), [[3, 4, 100], [6, 8, 100]])
+        sequence_gaps.add(7, now=200)
+        sequence_gaps.add(3, now=200)
+        self.assertEqual(
+            sequence_gaps.to_list(), [[4, 4, 100], [6, 6, 100], [8, 8, 100]]
+        )
+
+    def test_expire(self):
+        sequence_gaps = SequenceGaps(gaps=[[1, 1, 100], [3, 3, 150]], timeout=60)
+        sequence_gaps.expire(now=170)
+        self.assertEqual(sequence_gaps.to_list(), [[3, 3, 150]])
+
+    def test_stops_short_of_too_many_gaps(self):
+        sequence_gaps = SequenceGaps()
+        for sequence in range(2, 2 * gaps.MAX_GAPS + 1, 2):
+            self.assertTrue(sequence_gaps.add(sequence, now=100))
+        high = sequence_gaps.high
+        self.assertFalse(sequence_gaps.add(high + 2, now=100))
+        self.assertEqual(sequence_gaps.high, high)
+        # the next id opens no gap
+        self.assertTrue(sequence_gaps.add(high + 1, now=100))
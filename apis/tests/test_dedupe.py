@@ -0,0 +1,95 @@
+from django.test import TestCase
+from apis.dedupe import (
+    build_blocking_keys,
+    find_duplicates,
+    normalize_email_local,
+    normalize_phone,
+    score_match,
+    soundex
+)
+from apis.models import CandidateInfo
+
+
+class BlockingKeyTestCase(TestCase):
+
+    def test_normalize_phone(self):
+        self.assertEqual(normalize_phone("098765 43210"), "+919876543210")
+        self.assertEqual(normalize_phone("+44 20 7946 0958"), "+442079460958")
+        self.assertIsNone(normalize_phone("n/a"))
+
+    def test_normalize_email_local(self):
+        self.assertEqual(
+            normalize_email_local("John.Doe+jobs@example.com"), "johndoe"
+        )
+        self.assertIsNone(normalize_email_local("not-an-email"))
+
+    def test_soundex(self):
+        self.assertEqual(soundex("Robert"), soundex("Rupert"))
+        self.assertEqual(soundex("Ashcraft"), "A261")
+
+    def test_score_match(self):
+        keys = build_blocking_keys(
+            "john.doe@example.com", "John", "Doe", "9876543210"
+        )
+        other = build_blocking_keys(
+            "johndoe@other.com", "Jon", "Doe", "+91 98765 43210"
+        )
+        self.assertEqual(
+            score_match(keys, other),
+            (2.0, ["phone_key", "email_key", "name_key"])
+        )
+        other = build_blocking_keys("jd@other.com", "Jon", "Doe", None)
+        self.assertEqual(score_match(keys, other), (0.4, ["name_key"]))
+
+
+class FindDuplicatesTestCase(TestCase):
+
+    @staticmethod
+    def create_candidate(email, first_name, last_name, mobile_no=None):
+        return CandidateInfo.objects.create(
+            email=email,
+            first_name=first_name,
+            last_name=last_name,
+            mobile_no=mobile_no,
+            gender="Male",
+            resume="resume.pdf"
+        )
+
+    def test_name_block_does_not_crowd_out_phone_match(self):
+        for i in range(10):
+            self.create_candidate(f"smith{i}@example.com", "John", "Smith")
+        phone_match = self.create_candidate(
+            "someone@example.com", "Someone", "Else", "9876543210"
+        )
+        keys = build_blocking_keys(
+            "john@example.com", "John", "Smith", "9876543210"
+        )
+        matches = find_duplicates(keys, min_score=0.4, limit=1)
+        self.assertEqual(
+            [(match.candidate_id, match.matched_on) for match in matches],
+            [(phone_match.pk, ["phone_key"])]
+        )
+
+    def test_name_only_match_corroborates(self):
+        namesake = self.create_candidate("smith@example.com", "John", "Smith")
+        keys = build_blocking_keys("john@example.com", "Jon", "Smith", None)
+        self.assertEqual(find_duplicates(keys), [])
+        self.assertEqual(
+            [match.candidate_id for match in find_duplicates(keys, min_score=0.4)],
+            [namesake.pk]
+        )
+        keys = build_blocking_keys("smith@other.com", "Jon", "Smith", None)
+        match, = find_duplicates(keys)
+        self.assertEqual(
+            (match.candidate_id, match.score, match.matched_on),
+            (namesake.pk, 1.0, ["email_key", "name_key"])
+        )
+
+    def test_excludes_the_candidate_itself(self):
+        candidate = self.create_candidate(
+            "john@example.com", "John", "Smith", "9876543210"
+        )
+        keys = build_blocking_keys(
+            "john@example.com", "John", "Smith", "9876543210"
+        )
+        self.assertEqual(find_duplicates(keys, exclude_pk=candidate.pk), [])
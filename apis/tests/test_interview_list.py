@@ -0,0 +1,122 @@
+from datetime import date
+from django.test import TestCase
+from django.urls import reverse
+from apis.models import InterviewRound, InterviewRoundStatus, Role
+from apis.tests.fixtures import (
+    api_client,
+    create_candidate,
+    create_employee,
+    create_interview
+)
+
+
+class InterviewListTestCase(TestCase):
+
+    def setUp(self):
+        self.hrs = [create_employee(f"hr{i}", Role.HR) for i in range(2)]
+        self.interviewers = [
+            create_employee(f"dev{i}", Role.DEV) for i in range(3)
+        ]
+        # round 1 passed on 01-01-2021, round 2 open
+        self.interviews = [
+            create_interview(
+                self.hrs[i % 2],
+                create_candidate(f"candidate{i}@example.com"),
+                rounds=[{
+                    "interviewer": self.interviewers[i],
+                    "status": InterviewRoundStatus.PASS,
+                    "rating": 7,
+                    "date": date(2021, 1, 1),
+                }, {}]
+            ) for i in range(3)
+        ]
+        self.client = api_client(self.hrs[0])
+        self.url = reverse("interview-list-retrieve-list")
+
+    def test_plain_list_without_page_params(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 3)
+
+    def test_paginated_on_request(self):
+        response = self.client.get(self.url, {"page_size": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+        response = self.client.get(self.url, {"page": 2, "page_size": 2})
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNone(response.data["next"])
+
+    def test_approximate_count_on_request(self):
+        response = self.client.get(self.url, {"approx_count": "true"})
+        self.assertEqual(response.data["count"], 3)
+        self.assertFalse(response.data["count_is_approximate"])
+
+    def job_ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return sorted(interview["job_id"] for interview in response.data)
+
+    def test_summary(self):
+        round_two = InterviewRound.objects.get(
+            interview=self.interviews[0], round_no=2
+        )
+        round_two.interviewer = self.interviewers[1]
+        round_two.save()
+        response = self.client.get(self.url, {"view": "summary"})
+        summary = {
+            interview["job_id"]: interview for interview in response.data
+        }[self.interviews[0].job_id]
+        self.assertEqual(summary["round_count"], 2)
+        self.assertEqual(summary["latest_round_no"], 2)
+        self.assertIsNone(summary["latest_round_status"])
+        self.assertEqual(
+            summary["current_interviewer"], self.interviewers[1].username
+        )
+        self.assertEqual(summary["average_rating"], 7)
+        self.assertNotIn("interview_rounds", summary)
+
+    def test_filters(self):
+        interviews = self.interviews
+        all_job_ids = sorted(interview.job_id for interview in interviews)
+        self.assertEqual(self.job_ids(status="PENDING"), all_job_ids)
+        self.assertEqual(self.job_ids(status="SELECT"), [])
+        self.assertEqual(
+            self.job_ids(hr=self.hrs[0].username),
+            sorted([interviews[0].job_id, interviews[2].job_id])
+        )
+        self.assertEqual(
+            self.job_ids(interviewer=self.interviewers[1].username),
+            [interviews[1].job_id]
+        )
+        self.assertEqual(self.job_ids(pending_round=2), all_job_ids)
+        self.assertEqual(self.job_ids(pending_round=1), [])
+        self.assertEqual(self.job_ids(round_date_from="02-01-2021"), [])
+        self.assertEqual(
+            self.job_ids(
+                round_date_from="01-01-2021", round_date_to="01-01-2021"
+            ), all_job_ids
+        )
+
+    def test_ordering(self):
+        response = self.client.get(self.url, {"ordering": "id"})
+        self.assertEqual(
+            [interview["job_id"] for interview in response.data],
+            [interview.job_id for interview in self.interviews]
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(
+            [interview["job_id"] for interview in response.data],
+            [interview.job_id for interview in reversed(self.interviews)]
+        )
+
+    def test_invalid_filters_are_400(self):
+        for params in (
+            {"ordering": "candidate"},
+            {"round_date_from": "02-01-2021", "round_date_to": "01-01-2021"},
+            {"view": "compact"},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
@@ -0,0 +1,136 @@
+import urllib.error
+from datetime import timedelta
+from unittest import mock
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+from apis.models import Interview, OutboxEvent, OutboxStatus, Role
+from apis.outbox import OutboxDispatcher, enqueue_event, enqueue_interview_event
+from apis.tests.fixtures import create_candidate, create_employee, create_interview
+
+
+class EnqueueInterviewEventTestCase(TestCase):
+
+    def setUp(self):
+        self.interview = create_interview(
+            create_employee("hr", Role.HR),
+            create_candidate("candidate@example.com"),
+            rounds=[{}]
+        )
+
+    def test_retry_of_the_same_change_is_one_event(self):
+        interview = self.interview
+        first = enqueue_interview_event("interview.rejected", interview, "No")
+        second = enqueue_interview_event("interview.rejected", interview, "No")
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+
+    def test_same_change_again_later_is_a_new_event(self):
+        interview = self.interview
+        self.assertTrue(interview.action_reject("Not a fit")[0])
+        interview = Interview.objects.get(pk=interview.pk)
+        interview.status = None
+        interview.save()
+        self.assertTrue(interview.action_reject("Still not a fit")[0])
+        events = OutboxEvent.objects.filter(
+            event_type="interview.rejected"
+        ).order_by("id")
+        self.assertEqual(
+            [event.payload["remarks"] for event in events],
+            ["Not a fit", "Still not a fit"]
+        )
+        self.assertEqual(len({event.idempotency_key for event in events}), 2)
+
+
+class OutboxDispatcherTestCase(TestCase):
+
+    def setUp(self):
+        self.dispatcher = OutboxDispatcher(
+            "http://hooks.example.com/", max_attempts=3, retry_base=5, retry_max=60
+        )
+        self.event = enqueue_event("test.event", "test:1", {"value": 1})
+
+    def dispatch(self, result):
+        with mock.patch.object(self.dispatcher, "send", return_value=result):
+            counts = self.dispatcher.dispatch_batch()
+        self.event.refresh_from_db()
+        return counts
+
+    def make_due(self):
+        OutboxEvent.objects.update(next_attempt_at=timezone.now())
+
+    def test_delivered(self):
+        self.assertEqual(self.dispatch((True, False, None)), (1, 1, 0))
+        self.assertEqual(self.event.status, OutboxStatus.SENT)
+        self.assertEqual(self.event.attempts, 1)
+        self.assertIsNotNone(self.event.sent_at)
+        self.assertEqual(self.dispatcher.dispatch_batch(), (0, 0, 0))
+
+    def test_retryable_failure_backs_off_until_max_attempts(self):
+        before = timezone.now()
+        self.assertEqual(self.dispatch((False, True, "HTTP 503")), (1, 0, 0))
+        self.assertEqual(self.event.status, OutboxStatus.PENDING)
+        self.assertEqual(self.event.last_error, "HTTP 503")
+        self.assertGreaterEqual(
+            self.event.next_attempt_at, before + timedelta(seconds=2.5)
+        )
+        # not due yet
+        self.assertEqual(self.dispatcher.dispatch_batch(), (0, 0, 0))
+        self.make_due()
+        self.dispatch((False, True, "HTTP 503"))
+        self.make_due()
+        self.assertEqual(self.dispatch((False, True, "HTTP 503")), (1, 0, 1))
+        self.assertEqual(self.event.status, OutboxStatus.FAILED)
+        self.assertEqual(self.event.attempts, 3)
+
+    def test_permanent_failure(self):
+        self.assertEqual(self.dispatch((False, False, "HTTP 400")), (1, 0, 1))
+        self.assertEqual(self.event.status, OutboxStatus.FAILED)
+
+    def test_lease_outlasts_the_batch(self):
+        dispatcher = OutboxDispatcher(
+            self.dispatcher.url, batch_size=100, concurrency=8, timeout=10
+        )
+        # 13 waves of 8 requests of up to 10s, plus the margin
+        self.assertEqual(dispatcher.lease, 160)
+        before = timezone.now()
+        self.assertEqual(dispatcher.claim_batch(), [self.event])
+        self.event.refresh_from_db()
+        self.assertGreaterEqual(
+            self.event.next_attempt_at, before + timedelta(seconds=130)
+        )
+        # claimed, not handed to a second dispatcher mid-batch
+        self.assertEqual(self.dispatcher.dispatch_batch(), (0, 0, 0))
+
+    def test_lease_shorter_than_the_batch_is_rejected(self):
+        with self.assertRaises(ValueError):
+            OutboxDispatcher(
+                self.dispatcher.url, batch_size=100, concurrency=8,
+                timeout=10, lease=60
+            )
+        with self.assertRaises(CommandError):
+            call_command(
+                "dispatch_outbox", url=self.dispatcher.url, lease=60
+            )
+
+    def test_backoff_doubles_up_to_retry_max(self):
+        for attempts, delay in ((1, 5), (2, 10), (3, 20), (10, 60)):
+            backoff = self.dispatcher.backoff(attempts).total_seconds()
+            self.assertGreaterEqual(backoff, delay / 2)
+            self.assertLessEqual(backoff, delay)
+
+    def test_send_classifies_http_errors(self):
+        for code, retryable in ((503, True), (429, True), (404, False)):
+            error = urllib.error.HTTPError(
+                self.dispatcher.url, code, "Error", {}, None
+            )
+            with mock.patch("urllib.request.urlopen", side_effect=error):
+                delivered, is_retryable, message = self.dispatcher.send(self.event)
+            self.assertFalse(delivered)
+            self.assertEqual(is_retryable, retryable, code)
+            self.assertEqual(message, f"HTTP {code}: Error")
+        with mock.patch(
+            "urllib.request.urlopen",
+            side_effect=urllib.error.URLError("connection refused")
+        ):
+            self.assertEqual(self.dispatcher.send(self.event)[:2], (False, True))
@@ -0,0 +1,69 @@
+import base64
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apis import profiling
+from apis.models import Role
+from apis.tests.fixtures import api_client, create_employee
+
+
+@override_settings(REQUEST_PROFILER_ENABLED=True)
+class ProfilerMiddlewareTestCase(TestCase):
+
+    def setUp(self):
+        profiling.profiles.clear()
+        self.admin = create_employee("admin", Role.HR, is_superuser=True)
+        self.admin.set_password("secret")
+        self.admin.save()
+        self.url = reverse("interview-list-retrieve-list")
+
+    def test_superuser_profile(self):
+        client = api_client(self.admin)
+        response = client.get(self.url, HTTP_X_PROFILE="1")
+        self.assertEqual(response.status_code, 200)
+        profile_id = response["X-Profile-Id"]
+        response = client.get(self.url, {"_profile": "1"})
+        self.assertIn("X-Profile-Id", response)
+
+        response = client.get(reverse(
+            "request-profile-detail", kwargs={"profile_id": profile_id}
+        ))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["path"], self.url)
+        self.assertEqual(response.data["status_code"], 200)
+        self.assertEqual(
+            response.data["query_count"], len(response.data["queries"])
+        )
+        self.assertGreater(response.data["query_count"], 0)
+        self.assertTrue(response.data["functions"])
+        response = client.get(reverse("request-profile-list"))
+        self.assertEqual(len(response.data), 2)
+        self.assertNotIn("queries", response.data[0])
+
+    def test_not_profiled(self):
+        client = api_client(create_employee("hr", Role.HR))
+        response = client.get(self.url, HTTP_X_PROFILE="1")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Id", response)
+        # not asked for
+        response = api_client(self.admin).get(self.url)
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(len(profiling.profiles), 0)
+
+    def test_only_bearer_tokens_are_read(self):
+        client = APIClient()
+        credentials = base64.b64encode(b"admin:secret").decode()
+        client.credentials(HTTP_AUTHORIZATION=f"Basic {credentials}")
+        response = client.get(self.url, HTTP_X_PROFILE="1")
+        self.assertNotIn("X-Profile-Id", response)
+        client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+        response = client.get(self.url, HTTP_X_PROFILE="1")
+        self.assertEqual(response.status_code, 401)
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(len(profiling.profiles), 0)
+
+    @override_settings(REQUEST_PROFILER_ENABLED=False)
+    def test_disabled(self):
+        response = api_client(self.admin).get(self.url, HTTP_X_PROFILE="1")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Id", response)
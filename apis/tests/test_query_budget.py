@@ -0,0 +1,299 @@
+"""
+Query budget of every route in apis/urls.py.
+
+Views declare `query_budget`, the most queries one request may run, as
+{action: count} on viewsets and {http method: count} on other views.
+Every route is requested against seeded data of each FIXTURE_SIZES
+(bulk payloads grow with it): the query count has to be the same for
+every size, an N+1 shows up as a difference, and within the budget.
+Requests carry a signed access token, authentication and permission
+checks are not part of the count.
+"""
+import re
+import shutil
+from collections import Counter
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, reverse
+from rest_framework.test import APIClient
+from apis import urls
+from apis.authentication import get_revoked_sessions, issue_tokens
+from apis.models import Role
+from apis.tests.fixtures import MEDIA_ROOT, Fixtures
+
+FIXTURE_SIZES = (2, 6)
+
+
+# url name -> {http method: fixtures -> request}, a request being
+# a dict with the url kwargs, data and format (json by default).
+# A tuple of builders checks every variant against the same budget.
+REQUESTS = {
+    "change-feed": {
+        "get": lambda f: {},
+    },
+    "token-obtain": {
+        "post": lambda f: {"data": {
+            "username": f.admin.username,
+            "password": f.password,
+        }},
+    },
+    "token-refresh": {
+        "post": lambda f: {"data": {
+            "refresh": issue_tokens(f.admin)["refresh"],
+        }},
+    },
+    "token-revoke": {
+        "post": lambda f: {"data": {
+            "refresh": issue_tokens(f.admin)["refresh"],
+        }},
+    },
+    "skill-create": {
+        "post": lambda f: {"data": {"name": "new-skill"}},
+    },
+    "skill-autocomplete": {
+        "get": lambda f: {"data": {"q": "Skill"}},
+    },
+    "interview-create": {
+        "post": lambda f: {"data": {
+            "employee": f.hrs[0].username,
+            "candidate": f.candidates[-1].email,
+        }},
+    },
+    "interview-bulk-create": {
+        "post": lambda f: {"data": {
+            "candidates": [
+                candidate.email for candidate in f.candidates[f.size:]
+            ],
+        }},
+    },
+    "employee-create": {
+        "post": lambda f: {"data": {
+            "email": "new@example.com",
+            "username": "new",
+            "first_name": "New",
+            "last_name": "Employee",
+            "is_active": True,
+            "role": Role.DEV,
+        }},
+    },
+    "employee-edit": {
+        "put": lambda f: {
+            "kwargs": {"pk": f.interviewers[0].pk},
+            "data": {
+                "email": "dev0@example.com",
+                "username": "dev0",
+                "first_name": "Dev",
+                "last_name": "Zero",
+                "is_active": True,
+                "role": Role.DEV,
+            },
+        },
+    },
+    "round-auto-assign": {
+        "post": lambda f: {"data": {"rounds": f.open_rounds()}},
+    },
+    "round-bulk-update": {
+        "post": lambda f: {"data": {"rounds": f.open_rounds(
+            interviewer=f.interviewers[-1].username,
+            rating=6,
+            skills=[skill.name for skill in f.skills]
+        )}},
+    },
+    "interview-action": {
+        "post": lambda f: {
+            "kwargs": {"job_id": f.interview.job_id},
+            "data": {"action": "move_to_next_round", "remarks": "Good"},
+        },
+    },
+    "round-detail-and-edit": {
+        method: lambda f: {
+            "kwargs": {"job_id": f.interview.job_id, "round_no": 2},
+            "data": f.round_form(),
+        } for method in ("get", "put", "patch")
+    },
+    "audit-log-list": {
+        "get": lambda f: {},
+    },
+    "request-profile-list": {
+        "get": lambda f: {},
+    },
+    "request-profile-detail": {
+        "get": lambda f: {"kwargs": {"profile_id": "fixture"}},
+    },
+    "candidates-list": {
+        "get": (
+            lambda f: {},
+            lambda f: {"data": {
+                "min_experience": 3,
+                "designation": "engineer",
+            }},
+        ),
+        "post": lambda f: {
+            "data": f.candidate_form("new@example.com"),
+            "format": "multipart",
+        },
+    },
+    "candidates-detail": {
+        "get": lambda f: {"kwargs": {"pk": f.candidate.pk}},
+        "put": lambda f: {
+            "kwargs": {"pk": f.candidate.pk},
+            "data": f.candidate_form(f.candidate.email),
+            "format": "multipart",
+        },
+        "patch": lambda f: {
+            "kwargs": {"pk": f.candidate.pk},
+            "data": f.candidate_form(f.candidate.email),
+            "format": "multipart",
+        },
+    },
+    "candidates-rank": {
+        "post": lambda f: {"data": {
+            "skills": {skill.name: 1 for skill in f.skills},
+        }},
+    },
+    "candidates-timeline": {
+        "get": lambda f: {"kwargs": {"pk": f.candidate.pk}},
+    },
+    "interview-list-retrieve-list": {
+        "get": (
+            lambda f: {},
+            lambda f: {"data": {"view": "summary"}},
+            lambda f: {"data": {"page": 1, "page_size": 2}},
+        ),
+    },
+    "interview-list-retrieve-detail": {
+        "get": (
+            lambda f: {"kwargs": {"job_id": f.interview.job_id}},
+            lambda f: {
+                "kwargs": {"job_id": f.interview.job_id},
+                "data": {"view": "summary"},
+            },
+        ),
+    },
+}
+
+
+def iter_routes(patterns=urls.urlpatterns):
+    """(url name, view function) of every route, includes flattened."""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern.name, pattern.callback
+
+
+def get_route_methods(callback):
+    """http method -> query_budget key (viewset action or the method)."""
+    view_class = get_view_class(callback)
+    actions = getattr(callback, "actions", None) or {
+        method: method for method in view_class.http_method_names
+        if hasattr(view_class, method)
+    }
+    return {
+        method: key for method, key in actions.items()
+        if method in view_class.http_method_names
+        and method not in ("head", "options")
+    }
+
+
+def get_view_class(callback):
+    return getattr(callback, "cls", None) or callback.view_class
+
+
+def get_builders(name, method):
+    builders = REQUESTS[name][method]
+    return builders if isinstance(builders, tuple) else (builders,)
+
+
+def duplicated_queries(queries):
+    """Statements run more than once once literals are masked."""
+    statements = Counter(
+        re.sub(r"'[^']*'|\b\d+\b", "?", query["sql"]) for query in queries
+    )
+    return "\n".join(
+        f"  {count} x {sql}" for sql, count in statements.most_common()
+        if count > 1
+    ) or "  (none)"
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    # the candidate matrix and skill trie are rebuilt on every request
+    RANKING_FULL_REFRESH_SECONDS=0,
+    SKILL_INDEX_REFRESH_SECONDS=0,
+    TIMELINE_CACHE_SECONDS=0,
+    AUDIT_LOG_DURABILITY="sync"
+)
+class QueryBudgetTestCase(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def request(self, name, method, size, build):
+        """Runs one request against fresh fixtures, rolled back after."""
+        with transaction.atomic():
+            fixtures = Fixtures(size)
+            spec = build(fixtures)
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f"Bearer {issue_tokens(fixtures.admin)['access']}"
+            )
+            get_revoked_sessions()
+            url = reverse(name, kwargs=spec.get("kwargs", None))
+            with CaptureQueriesContext(connection) as context:
+                response = getattr(client, method)(
+                    url,
+                    spec.get("data", None),
+                    format=spec.get("format", "json")
+                )
+            transaction.set_rollback(True)
+        self.assertLess(
+            response.status_code, 400,
+            f"{method.upper()} {url}: {getattr(response, 'data', response)}"
+        )
+        return context.captured_queries
+
+    def test_every_route_has_a_budget(self):
+        for name, callback in iter_routes():
+            for method, key in get_route_methods(callback).items():
+                with self.subTest(route=name, method=method):
+                    budget = getattr(get_view_class(callback), "query_budget", {})
+                    self.assertIn(key, budget, f"{name}: no query_budget")
+                    self.assertIn(
+                        method, REQUESTS.get(name, {}),
+                        f"{name}: no request in REQUESTS"
+                    )
+
+    def test_query_count_is_constant_and_within_budget(self):
+        for name, callback in iter_routes():
+            budget = getattr(get_view_class(callback), "query_budget", {})
+            for method, key in get_route_methods(callback).items():
+                if key not in budget or method not in REQUESTS.get(name, {}):
+                    continue
+                for variant, build in enumerate(get_builders(name, method)):
+                    with self.subTest(route=name, method=method, variant=variant):
+                        self.check_budget(name, method, build, budget[key])
+
+    def check_budget(self, name, method, build, budget):
+        runs = {
+            size: self.request(name, method, size, build)
+            for size in FIXTURE_SIZES
+        }
+        counts = {size: len(queries) for size, queries in runs.items()}
+        largest = runs[FIXTURE_SIZES[-1]]
+        self.assertEqual(
+            len(set(counts.values())), 1,
+            f"{name} {method.upper()} query count grows with the "
+            f"data {counts}, duplicated statements:\n"
+            f"{duplicated_queries(largest)}"
+        )
+        self.assertLessEqual(
+            len(largest), budget,
+            f"{name} {method.upper()} runs {len(largest)} queries, "
+            f"budget {budget}, duplicated statements:\n"
+            f"{duplicated_queries(largest)}"
+        )
@@ -0,0 +1,100 @@
+from unittest import mock
+from django.test import TestCase, override_settings
+from apis import ranking
+from apis.models import Skill, WorkExperience
+from apis.ranking import CandidateSkillMatrix, get_candidate_matrix
+from apis.selectors import refresh_experience_summaries
+from apis.tests.fixtures import create_candidate
+
+
+class CandidateSkillMatrixTestCase(TestCase):
+
+    def setUp(self):
+        self.skill = Skill.objects.create(name="Rust")
+        create_candidate(
+            "other@example.com", [Skill.objects.create(name="Java")],
+            experience=[("Engineer", 3)]
+        )
+
+    def create_candidate(self, email, years):
+        return create_candidate(
+            email, [self.skill], experience=[("Engineer", years)]
+        )
+
+    def test_orders_by_skill_weights_then_experience(self):
+        senior = self.create_candidate("senior@example.com", 9)
+        junior = self.create_candidate("junior@example.com", 1)
+        matrix = CandidateSkillMatrix()
+        matrix.load()
+        top = matrix.top_k({self.skill.pk: 10}, k=5)
+        self.assertEqual([candidate_id for candidate_id, _ in top], [senior.pk, junior.pk])
+        self.assertEqual([score for _, score in top], [19.0, 11.0])
+
+    def test_refresh_applies_new_candidates(self):
+        matrix = CandidateSkillMatrix()
+        matrix.load()
+        self.assertEqual(matrix.top_k({self.skill.pk: 1}), [])
+        candidate = self.create_candidate("new@example.com", 2)
+        matrix.refresh()
+        self.assertEqual(matrix.top_k({self.skill.pk: 1}), [(candidate.pk, 3.0)])
+
+    def test_refreshed_leaves_the_matrix_as_is(self):
+        candidate = self.create_candidate("candidate@example.com", 2)
+        matrix = CandidateSkillMatrix()
+        matrix.load()
+        WorkExperience.objects.filter(candidate=candidate).update(
+            total_experience=5
+        )
+        refresh_experience_summaries([candidate.pk])
+        self.create_candidate("new@example.com", 1)
+        refreshed = matrix.refreshed()
+        self.assertEqual(matrix.top_k({self.skill.pk: 1}), [(candidate.pk, 3.0)])
+        self.assertEqual(len(matrix), 2)
+        self.assertEqual(refreshed.top_k({self.skill.pk: 1}, k=1), [(candidate.pk, 6.0)])
+        self.assertEqual(len(refreshed), 3)
+
+    def test_candidate_created_between_the_two_reads_of_load(self):
+        fetch_entries = CandidateSkillMatrix.fetch_entries
+        created = []
+
+        def create_then_fetch(candidate_ids=None):
+            if not created:
+                created.append(self.create_candidate("racer@example.com", 4))
+            return fetch_entries(candidate_ids)
+
+        matrix = CandidateSkillMatrix()
+        with mock.patch.object(
+            CandidateSkillMatrix, "fetch_entries", staticmethod(create_then_fetch)
+        ):
+            matrix.load()
+        self.assertNotIn(created[0].pk, matrix.candidate_ids.tolist())
+        self.assertEqual(matrix.top_k({self.skill.pk: 1}), [])
+        scores = matrix.score(
+            {self.skill.pk: 1}, experience_weight=0, require_skill_match=False
+        )
+        self.assertEqual(scores.max(), 0)
+        matrix.refresh()
+        self.assertEqual(matrix.top_k({self.skill.pk: 1}), [(created[0].pk, 5.0)])
+
+
+@override_settings(RANKING_FULL_REFRESH_SECONDS=3600, RANKING_REFRESH_SECONDS=0)
+class CandidateMatrixSwapTestCase(TestCase):
+
+    def setUp(self):
+        ranking._matrix = CandidateSkillMatrix()
+        self.addCleanup(setattr, ranking, "_matrix", CandidateSkillMatrix())
+        create_candidate("candidate@example.com")
+
+    def test_built_aside_and_swapped_in(self):
+        matrix = get_candidate_matrix()
+        self.assertEqual(len(matrix), 1)
+        create_candidate("new@example.com")
+        refreshed = get_candidate_matrix()
+        self.assertIsNot(refreshed, matrix)
+        self.assertIs(ranking._matrix, refreshed)
+        self.assertEqual((len(matrix), len(refreshed)), (1, 2))
+
+    def test_current_matrix_served_while_another_thread_builds(self):
+        matrix = get_candidate_matrix()
+        with ranking._build_lock, self.assertNumQueries(0):
+            self.assertIs(get_candidate_matrix(), matrix)
@@ -0,0 +1,50 @@
+import gzip
+import json
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from microservice import schema
+
+
+@override_settings(OPENAPI_SCHEMA_DIR=tempfile.mkdtemp())
+class CachedSchemaViewTestCase(SimpleTestCase):
+
+    def setUp(self):
+        schema._documents.clear()
+        self.addCleanup(schema._documents.clear)
+        self.url = reverse("openapi-schema")
+
+    def test_generated_once_per_process(self):
+        with mock.patch.object(
+            schema, "render_schema", wraps=schema.render_schema
+        ) as render_schema:
+            first = self.client.get(self.url)
+            second = self.client.get(self.url, {"format": "yaml"})
+        self.assertEqual(render_schema.call_count, 1)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first["Content-Type"], schema.SCHEMA_FORMATS["json"])
+        self.assertIn("/api/v1/skill/add/", json.loads(first.content)["paths"])
+        self.assertEqual(second["Content-Type"], schema.SCHEMA_FORMATS["yaml"])
+        self.assertNotEqual(first["ETag"], second["ETag"])
+
+    def test_served_from_the_artifact(self):
+        call_command("generate_openapi_schema", stdout=StringIO())
+        artifact = schema.get_artifact_path("json").read_bytes()
+        with mock.patch.object(schema, "render_schema") as render_schema:
+            response = self.client.get(self.url)
+        render_schema.assert_not_called()
+        self.assertEqual(response.content, artifact)
+
+    def test_etag_and_gzip(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        body = gzip.decompress(response.content)
+        self.assertEqual(body, schema.get_schema_document("json").body)
+        self.assertIn("Accept-Encoding", response["Vary"])
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, 304)
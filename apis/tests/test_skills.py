@@ -0,0 +1,102 @@
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from apis import skills
+from apis.models import IdSequence, Role, Skill, SkillAlias
+from apis.skills import (
+    SKILL_INDEX_SEQUENCE,
+    SkillTrie,
+    autocomplete_skills,
+    get_skill_index
+)
+from apis.tests.fixtures import api_client, create_candidate, create_employee
+
+
+@override_settings(SKILL_INDEX_REFRESH_SECONDS=3600)
+class SkillIndexInvalidationTestCase(TestCase):
+
+    def setUp(self):
+        # the version restarts with every rolled back test, unlike in the
+        # database of a deployment, drop the trie the last test built
+        skills._index.built_at = None
+        self.skill = Skill.objects.create(name="Kubernetes")
+
+    @staticmethod
+    def names(prefix):
+        return [name for _, name, _ in autocomplete_skills(prefix)]
+
+    def test_rebuilt_when_a_skill_or_alias_changes(self):
+        self.assertEqual(self.names("k8"), [])
+        SkillAlias.objects.create(alias="k8s", skill=self.skill)
+        self.assertEqual(self.names("k8"), ["Kubernetes"])
+        Skill.objects.create(name="Kafka")
+        self.assertEqual(self.names("ka"), ["Kafka"])
+
+    def test_version_is_read_from_the_database(self):
+        get_skill_index()
+        # as a change committed by another worker
+        IdSequence.objects.update_or_create(
+            name=SKILL_INDEX_SEQUENCE, defaults={"next_value": 100}
+        )
+        self.assertEqual(get_skill_index().version, 100)
+
+    def test_rolled_back_change_keeps_the_version(self):
+        version = get_skill_index().version
+        with transaction.atomic():
+            Skill.objects.create(name="Kotlin")
+            transaction.set_rollback(True)
+        self.assertEqual(get_skill_index().version, version)
+        self.assertEqual(self.names("ko"), [])
+
+
+class SkillTrieTestCase(TestCase):
+
+    def setUp(self):
+        self.python = Skill.objects.create(name="Python")
+        self.pytorch = Skill.objects.create(name="PyTorch")
+        self.gcp = Skill.objects.create(name="Google Cloud Platform")
+        SkillAlias.objects.create(alias="GCP", skill=self.gcp)
+        for name in ("Scala", "Spark", "SQL"):
+            Skill.objects.create(name=name)
+        create_candidate("first@example.com", [self.pytorch, self.python])
+        for i in range(3):
+            create_candidate(f"candidate{i}@example.com", [self.pytorch])
+        self.trie = SkillTrie(node_size=2)
+        self.trie.build(version=0)
+
+    def names(self, prefix, limit=10):
+        return [name for _, name, _ in self.trie.complete(prefix, limit)]
+
+    def test_most_used_first(self):
+        self.assertEqual(self.names("py"), ["PyTorch", "Python"])
+        self.assertEqual(self.names("PYT"), ["PyTorch", "Python"])
+        self.assertEqual(self.names("pyth"), ["Python"])
+        self.assertEqual(self.names("py", limit=1), ["PyTorch"])
+        self.assertEqual(
+            self.trie.complete("pyto"), [(self.pytorch.pk, "PyTorch", 4)]
+        )
+
+    def test_word_starts_and_aliases(self):
+        self.assertEqual(self.names("cloud"), ["Google Cloud Platform"])
+        self.assertEqual(self.names("gc"), ["Google Cloud Platform"])
+        self.assertEqual(self.names("rust"), [])
+
+    def test_node_size_caps_the_completions(self):
+        # Scala, Spark and SQL
+        self.assertEqual(len(self.names("s")), 2)
+
+    def test_suggest(self):
+        self.assertEqual(self.trie.suggest("gcp"), ["Google Cloud Platform"])
+        self.assertEqual(self.trie.suggest("Pyhton")[0], "Python")
+        self.assertEqual(self.trie.suggest("PyTorc", limit=1), ["PyTorch"])
+        self.assertEqual(self.trie.suggest("zzz"), [])
+
+    def test_suggestions_in_skill_errors(self):
+        client = api_client(create_employee("hr", Role.HR))
+        response = client.post(reverse("candidates-rank"), {
+            "skills": {"Pyton": 1},
+        }, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data["skills"]["suggestions"]["Pyton"][0], "Python"
+        )
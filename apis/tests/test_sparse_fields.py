@@ -0,0 +1,77 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from apis.models import Role, Skill
+from apis.tests.fixtures import (
+    api_client,
+    create_candidate,
+    create_employee,
+    create_interview
+)
+
+
+class SparseFieldsetTestCase(TestCase):
+
+    def setUp(self):
+        hr = create_employee("hr", Role.HR)
+        skill = Skill.objects.create(name="Go")
+        self.candidate = create_candidate(
+            "candidate@example.com", [skill], experience=[("Engineer", 2)]
+        )
+        self.interview = create_interview(hr, self.candidate, rounds=[{
+            "interviewer": create_employee("dev", Role.DEV),
+            "skills": [skill],
+        }])
+        self.client = api_client(hr)
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data, len(context.captured_queries)
+
+    def test_interview_fields(self):
+        url = reverse("interview-list-retrieve-list")
+        full, full_queries = self.get(url)
+        self.assertIn("interview_rounds", full[0])
+        sparse, queries = self.get(url, fields="job_id,status")
+        self.assertEqual(sparse, [
+            {"job_id": self.interview.job_id, "status": None}
+        ])
+        # without the round and round skill prefetches
+        self.assertEqual(queries, full_queries - 2)
+
+    def test_interview_expand(self):
+        url = reverse(
+            "interview-list-retrieve-detail",
+            kwargs={"job_id": self.interview.job_id}
+        )
+        data, _ = self.get(url, expand="")
+        self.assertNotIn("interview_rounds", data)
+        self.assertEqual(data["candidate"], self.candidate.email)
+        data, _ = self.get(url, expand="interview_rounds")
+        self.assertEqual(len(data["interview_rounds"]), 1)
+        data, _ = self.get(
+            url, fields="job_id,interview_rounds", expand="interview_rounds"
+        )
+        self.assertEqual(set(data), {"job_id", "interview_rounds"})
+
+    def test_candidate_fields_and_expand(self):
+        url = reverse("candidates-detail", kwargs={"pk": self.candidate.pk})
+        data, _ = self.get(url, fields="email,skills")
+        self.assertEqual(set(data), {"email", "skills"})
+        self.assertEqual(len(data["skills"]), 1)
+        data, queries = self.get(url, expand="experience")
+        self.assertNotIn("skills", data)
+        self.assertEqual(len(data["experience"]), 1)
+        _, all_queries = self.get(url)
+        self.assertEqual(queries, all_queries - 1)
+
+    def test_ignored_by_writes(self):
+        url = reverse("candidates-detail", kwargs={"pk": self.candidate.pk})
+        response = self.client.patch(
+            f"{url}?fields=email", {"first_name": "Renamed"}, format="multipart"
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertIn("first_name", response.data)
@@ -0,0 +1,23 @@
+import json
+from io import StringIO
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+
+class ProfileStartupTestCase(SimpleTestCase):
+
+    def test_cold_start_within_budget(self):
+        # raises CommandError when the boot is over STARTUP_BUDGET_MS
+        stdout = StringIO()
+        call_command("profile_startup", runs=1, json=True, stdout=stdout)
+        # the report, then the summary line
+        report, _ = json.JSONDecoder().raw_decode(stdout.getvalue())
+        self.assertEqual(report["budget_ms"], settings.STARTUP_BUDGET_MS)
+        self.assertLessEqual(report["total_ms"], report["budget_ms"])
+        self.assertEqual(
+            set(report["phases"]),
+            {"settings", "apps", "middleware", "urls", "total"}
+        )
+        self.assertIn("apis", report["apps"])
+        self.assertIn("django", report["imports"])
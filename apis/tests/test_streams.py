@@ -0,0 +1,127 @@
+import asyncio
+import re
+import time
+from datetime import timedelta
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+from apis.authentication import issue_tokens
+from apis.models import InterviewEvent, Role
+from apis.streams import (
+    STREAM_PATH,
+    InterviewEventStream,
+    broker,
+    build_interview_event,
+    database_call,
+    record_interview_events
+)
+from apis.tests.fixtures import create_candidate, create_employee, create_interview
+
+
+def open_stream(query="", headers=(), until=None, during=None, timeout=5):
+    """
+    Requests the stream and disconnects once `until(body)` is true or
+    after `timeout` seconds, returns (status, body). `during` is called
+    in a worker thread once the stream is up.
+    """
+    async def main():
+        messages, disconnected = [], asyncio.Event()
+
+        def body():
+            return b"".join(
+                message.get("body", b"") for message in messages
+                if message["type"] == "http.response.body"
+            ).decode()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+            if until is not None and until(body()):
+                disconnected.set()
+
+        task = asyncio.ensure_future(InterviewEventStream()({
+            "type": "http",
+            "method": "GET",
+            "path": STREAM_PATH,
+            "query_string": query.encode(),
+            "headers": [(name.encode(), value.encode()) for name, value in headers],
+        }, receive, send))
+        if during is not None:
+            await asyncio.sleep(0.5)
+            await database_call(during)()
+        await asyncio.wait([task], timeout=timeout)
+        disconnected.set()
+        await asyncio.wait_for(task, timeout)
+        return messages[0]["status"], body()
+
+    return asyncio.run(main())
+
+
+def event_ids(body):
+    return [int(event_id) for event_id in re.findall(r"^id: (\d+)$", body, re.M)]
+
+
+@override_settings(STREAM_POLL_SECONDS=0.1, STREAM_HEARTBEAT_SECONDS=1)
+class InterviewEventStreamTestCase(TransactionTestCase):
+
+    def setUp(self):
+        hr = create_employee("hr", Role.HR)
+        self.token = issue_tokens(hr)["access"]
+        self.interviews = [
+            create_interview(hr, create_candidate(f"candidate{i}@example.com"))
+            for i in range(2)
+        ]
+        first, second = self.interviews
+        record_interview_events([
+            build_interview_event("round.updated", first),
+            build_interview_event("round.updated", second),
+            build_interview_event("interview.rejected", first),
+            build_interview_event("interview.selected", second),
+        ])
+
+    def test_replays_after_last_event_id(self):
+        events = list(InterviewEvent.objects.order_by("id"))
+        job_id = self.interviews[0].job_id
+        expected = [event.pk for event in events[1:] if event.job_id == job_id]
+        status, body = open_stream(
+            f"job_id={job_id}&token={self.token}",
+            [("last-event-id", str(events[0].pk))],
+            until=lambda body: expected[-1] in event_ids(body)
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(event_ids(body), expected)
+        self.assertIn("event: interview.rejected", body)
+
+    @override_settings(STREAM_GAP_TIMEOUT_SECONDS=3600)
+    def test_event_committed_after_a_newer_one_is_delivered(self):
+        latest = InterviewEvent.objects.order_by("-id").first().pk
+        # both allocated a minute ago, the transaction of the lower id
+        # commits last
+        allocated_at = timezone.now() - timedelta(minutes=1)
+
+        def commit_out_of_order():
+            for sequence in (latest + 2, latest + 1):
+                event = build_interview_event("round.updated", self.interviews[0])
+                event.id, event.created_at = sequence, allocated_at
+                event.save()
+                broker.notify()
+                time.sleep(0.5)
+
+        status, body = open_stream(
+            f"token={self.token}",
+            until=lambda body: latest + 1 in event_ids(body),
+            during=commit_out_of_order
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(event_ids(body), [latest + 2, latest + 1])
+
+    def test_authentication(self):
+        status, _ = open_stream()
+        self.assertEqual(status, 401)
+        developer = issue_tokens(create_employee("dev", Role.DEV))["access"]
+        status, _ = open_stream(f"token={developer}")
+        self.assertEqual(status, 403)
+        status, _ = open_stream(f"token={self.token}&hr=nobody")
+        self.assertEqual(status, 400)
@@ -0,0 +1,98 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from apis.models import InterviewRound, InterviewRoundStatus, Role, Skill
+from apis.tests.fixtures import (
+    api_client,
+    create_candidate,
+    create_employee,
+    create_interview
+)
+
+
+class CandidateTimelineTestCase(TestCase):
+
+    def setUp(self):
+        self.hr = create_employee("hr", Role.HR)
+        self.interviewer = create_employee("dev", Role.DEV)
+        self.skill = Skill.objects.create(name="Go")
+        self.candidate = create_candidate(
+            "candidate@example.com", [self.skill], experience=[("Engineer", 2)]
+        )
+        self.client = api_client(self.hr)
+        self.url = reverse("candidates-timeline", kwargs={"pk": self.candidate.pk})
+
+    def add_interview(self, created_at):
+        return create_interview(
+            self.hr, self.candidate, created_at=created_at, rounds=[{
+                "interviewer": self.interviewer,
+                "status": InterviewRoundStatus.PASS,
+                "rating": 8,
+                "skills": [self.skill],
+                "created_at": created_at + timedelta(days=round_no),
+            } for round_no in (1, 2)]
+        )
+
+    def test_events_in_chronological_order(self):
+        now = timezone.now()
+        later = self.add_interview(now)
+        earlier = self.add_interview(now - timedelta(days=30))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["candidate"]["email"], self.candidate.email)
+        self.assertEqual(
+            [(event["type"], event["job_id"]) for event in response.data["events"]],
+            [("interview", earlier.job_id)] + [("round", earlier.job_id)] * 2
+            + [("interview", later.job_id)] + [("round", later.job_id)] * 2
+        )
+        round_event = response.data["events"][1]
+        self.assertEqual(round_event["interviewer"], self.interviewer.username)
+        self.assertEqual(round_event["round_no"], 1)
+        self.assertEqual(round_event["rating"], 8)
+        self.assertEqual(round_event["skills"], [self.skill.name])
+        self.assertEqual(response.data["events"][0]["hr"], self.hr.username)
+
+    def test_query_count_does_not_grow(self):
+        self.add_interview(timezone.now())
+        with self.assertNumQueries(6):
+            self.client.get(self.url)
+        for _ in range(3):
+            self.add_interview(timezone.now())
+        with self.assertNumQueries(6):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data["events"]), 12)
+
+    def test_unknown_candidate(self):
+        response = self.client.get(
+            reverse("candidates-timeline", kwargs={"pk": self.candidate.pk + 1})
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(TIMELINE_CACHE_SECONDS=60)
+class CandidateTimelineCacheTestCase(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        hr = create_employee("hr", Role.HR)
+        self.candidate = create_candidate("candidate@example.com")
+        self.interview = create_interview(hr, self.candidate, rounds=[{}])
+        self.client = api_client(hr)
+        self.url = reverse("candidates-timeline", kwargs={"pk": self.candidate.pk})
+
+    def test_cached_until_a_change_commits(self):
+        first = self.client.get(self.url).data
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).data, first)
+        interview_round = InterviewRound.objects.get(interview=self.interview)
+        interview_round.rating = 9
+        interview_round.save()
+        events = self.client.get(self.url).data["events"]
+        self.assertEqual(events[-1]["rating"], 9)
+        self.candidate.first_name = "Renamed"
+        self.candidate.save()
+        candidate = self.client.get(self.url).data["candidate"]
+        self.assertEqual(candidate["first_name"], "Renamed")
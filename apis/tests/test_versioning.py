@@ -0,0 +1,105 @@
+from django.test import TestCase
+from django.urls import reverse
+from apis.exceptions import ConcurrentUpdateError
+from apis.models import InterviewRound, Role, Skill
+from apis.tests.fixtures import (
+    api_client,
+    create_candidate,
+    create_employee,
+    create_interview
+)
+
+
+class OptimisticConcurrencyTestCase(TestCase):
+
+    def setUp(self):
+        self.skill = Skill.objects.create(name="Python")
+        self.hr = create_employee("hr", Role.HR)
+        self.interviewer = create_employee("dev", Role.DEV, skills=[self.skill])
+        self.interviews = [
+            create_interview(
+                self.hr,
+                create_candidate(f"candidate{i}@example.com"),
+                rounds=[{}]
+            ) for i in range(2)
+        ]
+        self.client = api_client(self.hr)
+        self.url = reverse("round-detail-and-edit", kwargs={
+            "job_id": self.interviews[0].job_id, "round_no": 1
+        })
+        self.form = {
+            "interviewer": self.interviewer.username,
+            "date": "01-02-2021",
+            "rating": 5,
+            "remarks": "Good",
+            "skills": [self.skill.name],
+        }
+
+    def patch(self, data=None, **headers):
+        return self.client.patch(
+            self.url, data or self.form, format="json", **headers
+        )
+
+    def test_etag_follows_the_version(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["ETag"], '"1"')
+        response = self.patch(HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], '"2"')
+        self.assertEqual(response.data["version"], 2)
+
+    def test_stale_if_match_is_412(self):
+        self.assertEqual(self.patch(HTTP_IF_MATCH='"1"').status_code, 200)
+        response = self.patch(HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(
+            self.patch(HTTP_IF_MATCH='W/"2", "7"').status_code, 200
+        )
+        self.assertEqual(self.patch(HTTP_IF_MATCH="*").status_code, 200)
+
+    def test_stale_body_version_is_409(self):
+        self.assertEqual(
+            self.patch(dict(self.form, version=1)).status_code, 200
+        )
+        response = self.patch(dict(self.form, version=1))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            InterviewRound.objects.get(interview=self.interviews[0]).version, 2
+        )
+
+    def test_stale_action_is_412(self):
+        url = reverse(
+            "interview-action", kwargs={"job_id": self.interviews[0].job_id}
+        )
+        response = self.client.post(
+            url, {"action": "reject", "remarks": "No"}, format="json",
+            HTTP_IF_MATCH='"5"'
+        )
+        self.assertEqual(response.status_code, 412)
+
+    def test_concurrent_save_raises(self):
+        first = InterviewRound.objects.get(interview=self.interviews[0])
+        second = InterviewRound.objects.get(pk=first.pk)
+        first.remarks = "First"
+        first.save()
+        second.remarks = "Second"
+        with self.assertRaises(ConcurrentUpdateError):
+            second.save()
+        self.assertEqual(InterviewRound.objects.get(pk=first.pk).remarks, "First")
+
+    def test_stale_bulk_row_is_409(self):
+        rows = [
+            {"job_id": interview.job_id, "round_no": 1, "rating": 6, "version": 1}
+            for interview in self.interviews
+        ]
+        url = reverse("round-bulk-update")
+        self.assertEqual(
+            self.client.post(url, {"rounds": rows}, format="json").status_code,
+            200
+        )
+        response = self.client.post(url, {"rounds": rows}, format="json")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            [error["errors"] for error in response.data["errors"]],
+            [["Round is at version 2."]] * 2
+        )
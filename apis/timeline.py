@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+from apis import models
+
+TIMELINE_CACHE_KEY = "candidate-timeline:{}"
+
+
+def get_timeline_queryset():
+    """
+    Candidate with everything its timeline renders, always 6 queries:
+    candidate, skills, experiences, interviews (+HR), rounds
+    (+interviewer) and round skills.
+    """
+    return models.CandidateInfo.objects.prefetch_related(
+        "skills",
+        "experiences",
+        Prefetch(
+            "interviews",
+            queryset=models.Interview.objects.select_related("employee")
+        ),
+        Prefetch(
+            "interviews__interview_round",
+            queryset=models.InterviewRound.objects.select_related(
+                "interviewer"
+            ).prefetch_related("skills")
+        ),
+    )
+
+
+def get_cache_timeout():
+    return getattr(settings, "TIMELINE_CACHE_SECONDS", 0)
+
+
+def get_cached_timeline(candidate_id):
+    if not get_cache_timeout():
+        return None
+    return cache.get(TIMELINE_CACHE_KEY.format(candidate_id))
+
+
+def set_cached_timeline(candidate_id, data):
+    timeout = get_cache_timeout()
+    if timeout:
+        cache.set(TIMELINE_CACHE_KEY.format(candidate_id), data, timeout)
+
+
+def invalidate_candidate_timelines(candidate_ids):
+    """Drops the cached timelines once the current transaction commits."""
+    if not get_cache_timeout():
+        return
+    keys = [
+        TIMELINE_CACHE_KEY.format(candidate_id)
+        for candidate_id in set(candidate_ids) if candidate_id
+    ]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_interview_timelines(interview_ids):
+    if not get_cache_timeout() or not interview_ids:
+        return
+    invalidate_candidate_timelines(
+        models.Interview.objects.filter(
+            pk__in=set(interview_ids)
+        ).values_list("candidate_id", flat=True)
+    )
@@ -15,17 +15,26 @@ router.register(
 )
 
 urlpatterns = [
-    path('api/v1/', include(router.urls)),
     path(
         'api/v1/skill/add/',
         views.SkillAPIView.as_view(),
         name="skill-create"
     ),
+    path(
+        'api/v1/skill/autocomplete/',
+        views.SkillAutocompleteAPIView.as_view(),
+        name="skill-autocomplete"
+    ),
     path(
         'api/v1/interview/assign/',
         views.HRAssignInterviewApiView.as_view(),
         name="interview-create"
     ),
+    path(
+        'api/v1/interview/assign/bulk/',
+        views.HRBulkAssignInterviewApiView.as_view(),
+        name="interview-bulk-create"
+    ),
     path(
         'api/v1/employee/add/',
         views.EmployeeViewSet.as_view({'post': 'create'}),
@@ -36,6 +45,16 @@ urlpatterns = [
         views.EmployeeViewSet.as_view({'put': 'update'}),
         name="employee-edit"
     ),
+    path(
+        'api/v1/interview/round/auto-assign/',
+        views.InterviewRoundAutoAssignAPIView.as_view(),
+        name="round-auto-assign"
+    ),
+    path(
+        'api/v1/interview/round/bulk/',
+        views.InterviewRoundBulkUpdateAPIView.as_view(),
+        name="round-bulk-update"
+    ),
     path(
         'api/v1/interview/action/<str:job_id>/',
         views.InterviewActionAPIView.as_view(),
@@ -46,4 +65,41 @@ urlpatterns = [
         views.InterviewRoundDetailAPIView.as_view(),
         name="round-detail-and-edit"
     ),
+    path(
+        'api/v1/audit/',
+        views.AuditLogListAPIView.as_view(),
+        name="audit-log-list"
+    ),
+    path(
+        'api/v1/changes/',
+        views.ChangeFeedAPIView.as_view(),
+        name="change-feed"
+    ),
+    path(
+        'api/v1/token/',
+        views.TokenObtainAPIView.as_view(),
+        name="token-obtain"
+    ),
+    path(
+        'api/v1/token/refresh/',
+        views.TokenRefreshAPIView.as_view(),
+        name="token-refresh"
+    ),
+    path(
+        'api/v1/token/revoke/',
+        views.TokenRevokeAPIView.as_view(),
+        name="token-revoke"
+    ),
+    path(
+        'api/v1/profiles/',
+        views.RequestProfileListAPIView.as_view(),
+        name="request-profile-list"
+    ),
+    path(
+        'api/v1/profiles/<str:profile_id>/',
+        views.RequestProfileDetailAPIView.as_view(),
+        name="request-profile-detail"
+    ),
+    # last, interview/<job_id>/ would otherwise shadow interview/assign/
+    path('api/v1/', include(router.urls)),
 ]
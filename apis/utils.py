@@ -1,5 +1,8 @@
+from collections import defaultdict
+from django.db.models import Q
 from rest_framework.exceptions import ValidationError
 from apis.models import CandidateInfo, Employee, Role, Interview, Skill
+from apis.skills import suggest_skills
 
 
 def candidate_exists(email, instance=None):
@@ -38,20 +41,57 @@ def validate_skills(instance, attrs, skills):
             raise ValidationError({
                 "detail": "skills must be send in a list or array."
             })
-        all_skills = list(Skill.objects.values_list('name', flat=True))
-        missing_skills = []
-        for skill in skills:
-            if skill not in all_skills:
-                missing_skills.append(skill)
+        skill_ids = dict(Skill.objects.filter(
+            name__in=skills
+        ).values_list("name", "id"))
+        missing_skills = [skill for skill in skills if skill not in skill_ids]
         if missing_skills:
-            raise ValidationError(
-                {"detail":
-                    f"{', '.join(missing_skills)} are not valid 'skills'. "
-                    f"valid choices are: {', '.join(all_skills)}"}
-            )
-        skills_list = list(Skill.objects.filter(
-            name__in=[skill for skill in skills]
-        ).values_list("id", flat=True))
+            raise ValidationError(build_missing_skills_error(missing_skills))
         attrs.update({
-            'skills': skills_list,
+            'skills': list(skill_ids.values()),
         })
+
+
+def build_missing_skills_error(missing_skills):
+    """The closest skill names instead of every valid one."""
+    return {
+        "detail": f"{', '.join(map(str, missing_skills))} are not valid 'skills'.",
+        "suggestions": suggest_skills(missing_skills),
+    }
+
+
+def apply_m2m_diff(m2m_descriptor, desired):
+    """
+    Brings a many-to-many relation to the `desired` state, given as
+    {source object id: target ids}, by writing only the differences to
+    the through table: one read, at most one delete and one bulk insert
+    for any number of source objects.
+    Usage: apply_m2m_diff(CandidateInfo.skills, {candidate.pk: skill_ids})
+
+    The through rows are written around the related managers, so no
+    m2m_changed is sent and the receivers in apis/signals.py don't run.
+    Callers record the change feed entries and invalidate the timelines
+    of the source objects themselves (saving the candidate does both).
+    """
+    through = m2m_descriptor.through
+    source_attr = f"{m2m_descriptor.field.m2m_field_name()}_id"
+    target_attr = f"{m2m_descriptor.field.m2m_reverse_field_name()}_id"
+    existing = defaultdict(set)
+    rows = through.objects.filter(
+        **{f"{source_attr}__in": list(desired.keys())}
+    ).values_list(source_attr, target_attr)
+    for source_id, target_id in rows:
+        existing[source_id].add(target_id)
+    stale, to_add = Q(), []
+    for source_id, target_ids in desired.items():
+        target_ids = set(target_ids)
+        removed = existing[source_id] - target_ids
+        if removed:
+            stale |= Q(**{source_attr: source_id, f"{target_attr}__in": removed})
+        to_add += [
+            through(**{source_attr: source_id, target_attr: target_id})
+            for target_id in target_ids - existing[source_id]
+        ]
+    if stale:
+        through.objects.filter(stale).delete()
+    through.objects.bulk_create(to_add)
@@ -1,40 +1,165 @@
 import json
 from json import JSONDecodeError
+from django.http import Http404
+from django.utils.http import parse_etags, quote_etag
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError, APIException
 from rest_framework.generics import (
     CreateAPIView,
     get_object_or_404,
+    ListAPIView,
     RetrieveUpdateAPIView
 )
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin
-from rest_framework.parsers import MultiPartParser
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.pagination import CursorPagination
+from rest_framework.parsers import MultiPartParser, JSONParser
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from apis import profiling
+from apis.assignment import bulk_auto_assign
+from apis.authentication import (
+    REFRESH,
+    SignedTokenAuthentication,
+    issue_tokens,
+    read_token,
+    refresh_tokens,
+    revoke_session
+)
+from apis.bulk import bulk_assign_interviews, bulk_update_rounds
+from apis.changes import get_start_cursor, read_changes
+from apis.exceptions import ConflictError, PreconditionFailedError
+from apis.audit import (
+    build_audit_entry,
+    record_audit,
+    record_audit_entries,
+    round_audit_snapshot,
+    snapshot_changes
+)
 from apis.models import (
+    ArchivedInterview,
+    AuditLog,
+    ChangeResource,
     Employee,
     CandidateInfo,
     Interview,
     InterviewRound
 )
+from apis.filters import CandidateFilterBackend, InterviewFilterBackend
+from apis.paginators import ApproximateCountPagination
 from apis.permissions import IsAdminOrHrEmployee, IsAdmin, IsHrEmployee
 from apis.serializers import (
     SkillSerializer,
     EmployeeSerializer,
     CandidateInfoSerializer,
+    CandidateRankingSerializer,
+    CandidateTimelineSerializer,
+    ChangeFeedQuerySerializer,
     HRAssignInterviewSerializer,
+    HRBulkAssignInterviewSerializer,
     InterviewActionSerializer,
     InterviewRoundSerializer,
-    InterviewSerializer
+    InterviewSerializer,
+    InterviewRoundAutoAssignSerializer,
+    InterviewRoundBulkUpdateSerializer,
+    AuditLogSerializer,
+    ArchivedInterviewSerializer,
+    ArchivedInterviewSummarySerializer,
+    InterviewSummarySerializer,
+    SkillAutocompleteQuerySerializer,
+    TokenObtainSerializer,
+    TokenRefreshSerializer
 )
+from apis.timeline import (
+    get_cached_timeline,
+    get_timeline_queryset,
+    set_cached_timeline
+)
+from apis.skills import autocomplete_skills
 from apis.utils import is_valid_action
 
 
+class SparseFieldsetMixin:
+    """
+    Lets the serializer trim the queryset to the relations
+    rendered for ?fields= / ?expand=.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, "optimize_queryset"):
+            queryset = serializer_class.optimize_queryset(
+                queryset, self.request
+            )
+        return queryset
+
+
+class VersionPreconditionMixin:
+    """
+    Optimistic concurrency for views changing a VersionedModel: responses
+    carry the version as ETag and writes are checked against If-Match
+    (412) or a "version" in the body (409). The save itself only updates
+    the version that was checked, a concurrent write in between is a 409.
+    """
+    write_methods = ("POST", "PUT", "PATCH")
+
+    @staticmethod
+    def get_etag(obj):
+        return quote_etag(str(obj.version))
+
+    def check_version(self, obj):
+        if self.request.method not in self.write_methods:
+            return
+        if_match = self.request.headers.get("If-Match", None)
+        if if_match:
+            etags = [etag.replace("W/", "", 1) for etag in parse_etags(if_match)]
+            if "*" not in etags and self.get_etag(obj) not in etags:
+                raise PreconditionFailedError()
+            return
+        version = self.request.data.get("version", None)
+        if version in (None, ""):
+            return
+        if str(version) != str(obj.version):
+            raise ConflictError()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        obj = getattr(self, "versioned_object", None)
+        if obj is not None and response.status_code < 400:
+            response["ETag"] = self.get_etag(obj)
+        return response
+
+
 class SkillAPIView(CreateAPIView):
     permission_classes = [IsAdminOrHrEmployee]
     serializer_class = SkillSerializer
     http_method_names = ['post']
+    query_budget = {"post": 3}
+
+
+class SkillAutocompleteAPIView(APIView):
+    """
+    Skills whose name, alias or one of their words starts with ?q=, most
+    used first, from the in-process trie of apis/skills.py.
+    """
+    permission_classes = [IsAdminOrHrEmployee]
+    http_method_names = ['get']
+    serializer_class = SkillAutocompleteQuerySerializer
+    query_budget = {"get": 6}
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        results = [
+            {"id": skill_id, "name": name, "usage_count": usage_count}
+            for skill_id, name, usage_count in autocomplete_skills(
+                params["q"], params["limit"]
+            )
+        ]
+        return Response({"results": results}, status=status.HTTP_200_OK)
 
 
 class EmployeeViewSet(viewsets.ModelViewSet):
@@ -44,18 +169,27 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     http_method_names = ["post", "put"]
     lookup_url_kwarg = "pk"
     queryset = Employee.objects.all()
+    query_budget = {"create": 6, "update": 6}
 
 
-class CandidateViewSet(viewsets.ModelViewSet):
+class CandidateViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminOrHrEmployee]
     model = CandidateInfo
     serializer_class = CandidateInfoSerializer
     lookup_url_kwarg = "pk"
-    queryset = CandidateInfo.objects.prefetch_related(
-        'skills', 'experiences'
-    ).all()
+    queryset = CandidateInfo.objects.all()
+    filter_backends = [CandidateFilterBackend]
     parser_classes = [MultiPartParser]
     http_method_names = ['get', 'post', 'put', 'patch']
+    query_budget = {
+        "list": 3,
+        "retrieve": 3,
+        "create": 15,
+        "update": 22,
+        "partial_update": 18,
+        "rank": 5,
+        "timeline": 6,
+    }
 
     def prepare_data(self, request_data):
         data = {key: request_data.get(key) for key in request_data.keys()}
@@ -63,9 +197,10 @@ class CandidateViewSet(viewsets.ModelViewSet):
             skills = json.loads(
                 data.pop('skills')
             ) if 'skills' in data else []
+            # None when left out, which keeps the experiences as they are
             experience = json.loads(
                 data.pop('experience')
-            ) if 'experience' in data else []
+            ) if 'experience' in data else None
         except JSONDecodeError as e:
             raise APIException(
                 detail=f"Either skills or experience data is not correct. "
@@ -75,12 +210,9 @@ class CandidateViewSet(viewsets.ModelViewSet):
             )
         if not skills and self.request.method in ['POST', 'PUT']:
             raise ValidationError(detail="'skills' are missing.")
-        data.update(
-            {
-                'skills': skills,
-                'experience': experience
-            }
-        )
+        data.update({'skills': skills})
+        if experience is not None:
+            data.update({'experience': experience})
         return data
 
     def process(self, kwargs, request, update=False):
@@ -107,25 +239,102 @@ class CandidateViewSet(viewsets.ModelViewSet):
     def update(self, request, *args, **kwargs):
         return self.process(kwargs, request, update=True)
 
+    @action(
+        detail=False,
+        methods=['post'],
+        parser_classes=[JSONParser],
+        serializer_class=CandidateRankingSerializer
+    )
+    def rank(self, request, *args, **kwargs):
+        # numpy is only needed here, keep it out of the worker boot
+        from apis.ranking import rank_candidates
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        top = rank_candidates(
+            serializer.validated_data["skills"],
+            limit=serializer.validated_data["limit"],
+            experience_weight=serializer.validated_data["experience_weight"]
+        )
+        candidates = CandidateInfo.objects.in_bulk(
+            [candidate_id for candidate_id, _ in top]
+        )
+        results = [
+            {
+                "id": candidate_id,
+                "email": candidates[candidate_id].email,
+                "first_name": candidates[candidate_id].first_name,
+                "last_name": candidates[candidate_id].last_name,
+                "score": round(score, 2)
+            } for candidate_id, score in top if candidate_id in candidates
+        ]
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    @action(
+        detail=True,
+        methods=['get'],
+        serializer_class=CandidateTimelineSerializer
+    )
+    def timeline(self, request, *args, **kwargs):
+        candidate_id = kwargs[self.lookup_url_kwarg]
+        data = get_cached_timeline(candidate_id)
+        if data is None:
+            candidate = get_object_or_404(
+                get_timeline_queryset(), pk=candidate_id
+            )
+            self.check_object_permissions(request, candidate)
+            data = self.get_serializer(candidate).data
+            set_cached_timeline(candidate_id, data)
+        return Response(data, status=status.HTTP_200_OK)
+
 
 class HRAssignInterviewApiView(CreateAPIView):
     permission_classes = [IsAdmin]
     http_method_names = ['post']
     serializer_class = HRAssignInterviewSerializer
+    query_budget = {"post": 9}
 
 
-class InterviewActionAPIView(APIView):
+class HRBulkAssignInterviewApiView(APIView):
+    permission_classes = [IsAdmin]
+    http_method_names = ['post']
+    serializer_class = HRBulkAssignInterviewSerializer
+    query_budget = {"post": 11}
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        interviews = bulk_assign_interviews(
+            serializer.validated_data["candidates"],
+            serializer.validated_data["employees"]
+        )
+        response_dict = {
+            "created": [
+                {
+                    "job_id": interview.job_id,
+                    "employee": interview.employee.username,
+                    "candidate": interview.candidate.email
+                } for interview in interviews
+            ]
+        }
+        return Response(response_dict, status=status.HTTP_201_CREATED)
+
+
+class InterviewActionAPIView(VersionPreconditionMixin, APIView):
     permission_classes = [IsHrEmployee]
     http_method_names = ['post']
     serializer_class = InterviewActionSerializer
+    query_budget = {"post": 21}
 
     def get_object(self):
         job_id = self.kwargs.get("job_id", None)
         obj = get_object_or_404(Interview, job_id=job_id)
+        self.check_version(obj)
+        self.versioned_object = obj
         return obj
 
     def post(self, request, *args, **kwargs):
-        from inspect import getfullargspec, formatargspec
+        from inspect import getfullargspec
 
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -145,6 +354,16 @@ class InterviewActionAPIView(APIView):
         action_status, action_err = action_func(
             remarks=remarks
         ) if remarks and "remarks" in action_func_args else action_func()
+        record_audit(
+            request.user,
+            f"interview.{action.lower()}",
+            job_id=obj.job_id,
+            changes={
+                "succeeded": action_status,
+                "remarks": remarks,
+                "status": obj.status
+            }
+        )
         response_dict = {"status": action_status}
         if not action_status and action_err:
             response_dict.update({
@@ -154,10 +373,14 @@ class InterviewActionAPIView(APIView):
         return Response(response_dict, status=status_code)
 
 
-class InterviewRoundDetailAPIView(RetrieveUpdateAPIView):
+class InterviewRoundDetailAPIView(
+    VersionPreconditionMixin,
+    RetrieveUpdateAPIView
+):
     permission_classes = [IsAuthenticated]
     serializer_class = InterviewRoundSerializer
     queryset = InterviewRound.objects.all()
+    query_budget = {"get": 3, "put": 19, "patch": 19}
 
     def get_object(self):
         job_id = self.kwargs.get('job_id', None)
@@ -167,10 +390,138 @@ class InterviewRoundDetailAPIView(RetrieveUpdateAPIView):
             interview__job_id=job_id,
             round_no=round_no
         )
+        self.check_version(obj)
+        self.versioned_object = obj
         return obj
 
+    def perform_update(self, serializer):
+        before = round_audit_snapshot(serializer.instance)
+        instance = serializer.save()
+        changes = snapshot_changes(before, round_audit_snapshot(instance))
+        record_audit(
+            self.request.user,
+            "round.update",
+            job_id=self.kwargs.get('job_id', None),
+            round_no=instance.round_no,
+            changes=changes
+        )
+
+
+class InterviewRoundAutoAssignAPIView(APIView):
+    permission_classes = [IsAdminOrHrEmployee]
+    http_method_names = ['post']
+    serializer_class = InterviewRoundAutoAssignSerializer
+    query_budget = {"post": 12}
+
+    @staticmethod
+    def get_round_error(obj):
+        if not obj:
+            return "Interview round not found."
+        if obj.interviewer_id:
+            return "Round already has an interviewer."
+        if obj.status:
+            return f"Round status is already {obj.status}."
+        return None
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        requested = [
+            (ref["job_id"], ref["round_no"])
+            for ref in serializer.validated_data["rounds"]
+        ]
+        rounds = InterviewRound.objects.filter(
+            interview__job_id__in={job_id for job_id, _ in requested},
+            round_no__in={round_no for _, round_no in requested},
+        ).select_related("interview").prefetch_related("skills")
+        rounds_by_ref = {
+            (obj.interview.job_id, obj.round_no): obj for obj in rounds
+        }
+        errors, to_assign, seen = [], [], set()
+        for ref in requested:
+            job_id, round_no = ref
+            obj = rounds_by_ref.get(ref)
+            duplicate = ref in seen
+            seen.add(ref)
+            if duplicate:
+                error = "Round is listed more than once."
+            else:
+                error = self.get_round_error(obj)
+            if error is None:
+                to_assign.append(obj)
+                continue
+            errors.append(
+                {"job_id": job_id, "round_no": round_no, "error": error}
+            )
+        # rounds assigned by a concurrent request since the read above
+        # come back as taken
+        assigned, unassigned, taken = bulk_auto_assign(to_assign)
+        errors += [
+            {
+                "job_id": obj.interview.job_id,
+                "round_no": obj.round_no,
+                "error": self.get_round_error(obj)
+                or "Interview round not found."
+            } for obj in taken
+        ]
+        record_audit_entries([
+            build_audit_entry(
+                request.user,
+                "round.auto_assign",
+                job_id=obj.interview.job_id,
+                round_no=obj.round_no,
+                changes={"interviewer": [None, obj.interviewer_id]}
+            ) for obj in assigned
+        ])
+        errors += [
+            {
+                "job_id": obj.interview.job_id,
+                "round_no": obj.round_no,
+                "error": "No eligible interviewer found for the round skills."
+            } for obj in unassigned
+        ]
+        interviewers = dict(Employee.objects.filter(
+            id__in={obj.interviewer_id for obj in assigned}
+        ).values_list("id", "username"))
+        response_dict = {
+            "assigned": [
+                {
+                    "job_id": obj.interview.job_id,
+                    "round_no": obj.round_no,
+                    "interviewer": interviewers[obj.interviewer_id]
+                } for obj in assigned
+            ],
+            "errors": errors
+        }
+        return Response(response_dict, status=status.HTTP_200_OK)
+
+
+class InterviewRoundBulkUpdateAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+    http_method_names = ['post']
+    serializer_class = InterviewRoundBulkUpdateSerializer
+    query_budget = {"post": 13}
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = bulk_update_rounds(
+            serializer.validated_data["rounds"], request.user
+        )
+        response_dict = {
+            "updated": [
+                {
+                    "job_id": obj.interview.job_id,
+                    "round_no": obj.round_no,
+                    "version": obj.version
+                } for obj in updated
+            ]
+        }
+        return Response(response_dict, status=status.HTTP_200_OK)
+
 
 class InterviewListRetrieveViewSet(
+    SparseFieldsetMixin,
     ListModelMixin,
     RetrieveModelMixin,
     viewsets.GenericViewSet
@@ -180,4 +531,225 @@ class InterviewListRetrieveViewSet(
     queryset = Interview.objects.all()
     http_method_names = ['get']
     lookup_field = "job_id"
+    filter_backends = [InterviewFilterBackend]
+    pagination_class = ApproximateCountPagination
+    query_budget = {"list": 4, "retrieve": 3}
+    # ?view= -> (serializer, serializer of archived interviews)
+    representations = {
+        "full": (InterviewSerializer, ArchivedInterviewSerializer),
+        "summary": (
+            InterviewSummarySerializer,
+            ArchivedInterviewSummarySerializer
+        ),
+    }
+
+    def get_representation(self):
+        request = getattr(self, "request", None)
+        if request is None:  # schema generation
+            return self.representations["full"]
+        representation = request.query_params.get("view", "full")
+        if representation not in self.representations:
+            raise ValidationError(
+                detail=f"view must be one of: "
+                       f"{', '.join(self.representations)}."
+            )
+        return self.representations[representation]
+
+    def get_serializer_class(self):
+        return self.get_representation()[0]
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            pass
+        # archived interviews stay readable, see apis/archive.py
+        serializer_class = self.get_representation()[1]
+        queryset = serializer_class.optimize_queryset(
+            ArchivedInterview.objects.all(), request
+        )
+        instance = get_object_or_404(
+            queryset, job_id=kwargs[self.lookup_field]
+        )
+        serializer = serializer_class(
+            instance, context=self.get_serializer_context()
+        )
+        return Response(serializer.data)
+
+
+class AuditLogPagination(CursorPagination):
+    ordering = '-id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class AuditLogListAPIView(ListAPIView):
+    permission_classes = [IsAdmin]
+    serializer_class = AuditLogSerializer
+    pagination_class = AuditLogPagination
+    http_method_names = ['get']
+    query_budget = {"get": 1}
+
+    def get_queryset(self):
+        queryset = AuditLog.objects.all()
+        job_id = self.request.query_params.get('job_id', None)
+        actor = self.request.query_params.get('actor', None)
+        if job_id:
+            queryset = queryset.filter(job_id=job_id)
+        if actor:
+            queryset = queryset.filter(actor_username=actor)
+        return queryset
+
+
+class ChangeFeedAPIView(APIView):
+    """
+    Interviews and candidates changed after ?cursor=, in change sequence
+    order with deletes as tombstones, see apis/changes.py. Rounds and
+    work experiences come with their interview and candidate. Archived
+    interviews are not deleted, they come from the archive.
+    """
+    permission_classes = [IsAdminOrHrEmployee]
+    http_method_names = ['get']
+    serializer_class = ChangeFeedQuerySerializer
+    query_budget = {"get": 7}
+    # resource -> [(model, serializer)], objects not found in the first
+    # one are looked up in the next
+    resources = {
+        ChangeResource.INTERVIEW: [
+            (Interview, InterviewSerializer),
+            (ArchivedInterview, ArchivedInterviewSerializer),
+        ],
+        ChangeResource.CANDIDATE: [
+            (CandidateInfo, CandidateInfoSerializer),
+        ],
+    }
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        if params.get("start", None):
+            return Response({
+                "results": [],
+                "next_cursor": get_start_cursor(),
+                "has_more": False
+            }, status=status.HTTP_200_OK)
+        changes, cursor, has_more = read_changes(
+            params.get("cursor", None), params["page_size"]
+        )
+        rendered = {}
+        for resource, sources in self.resources.items():
+            ids = {
+                object_id for _, change_resource, object_id, deleted in changes
+                if change_resource == resource and not deleted
+            }
+            for model, serializer_class in sources:
+                if not ids:
+                    break
+                queryset = serializer_class.optimize_queryset(
+                    model.objects.filter(pk__in=ids), None
+                )
+                # no request in the context, every field is rendered
+                for data in serializer_class(
+                    queryset, many=True, context={"request": None}
+                ).data:
+                    rendered[resource, data["id"]] = data
+                    ids.discard(data["id"])
+        results = []
+        for sequence, resource, object_id, deleted in changes:
+            data = rendered.get((resource, object_id), None)
+            results.append({
+                "sequence": sequence,
+                "resource": resource,
+                "id": object_id,
+                "deleted": data is None,
+                "data": data
+            })
+        return Response({
+            "results": results,
+            "next_cursor": cursor,
+            "has_more": has_more
+        }, status=status.HTTP_200_OK)
+
+
+class RequestProfileListAPIView(APIView):
+    """Profiled requests kept by this worker, newest first, without details."""
+    permission_classes = [IsAdmin]
+    http_method_names = ['get']
+    query_budget = {"get": 0}
 
+    def get(self, request, *args, **kwargs):
+        return Response([
+            {
+                key: value for key, value in entry.items()
+                if key not in ("queries", "functions")
+            }
+            for entry in reversed(profiling.profiles)
+        ])
+
+
+class RequestProfileDetailAPIView(APIView):
+    permission_classes = [IsAdmin]
+    http_method_names = ['get']
+    query_budget = {"get": 0}
+
+    def get(self, request, profile_id, *args, **kwargs):
+        entry = profiling.get_profile(profile_id)
+        if entry is None:
+            raise Http404
+        return Response(entry)
+
+
+class TokenAPIView(APIView):
+    """Token endpoints, called without credentials."""
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    http_method_names = ['post']
+
+    def get_authenticate_header(self, request):
+        # 401 with WWW-Authenticate instead of 403 for bad credentials
+        return SignedTokenAuthentication.keyword
+
+
+class TokenObtainAPIView(TokenAPIView):
+    """Access and refresh token for a username and password."""
+    serializer_class = TokenObtainSerializer
+    query_budget = {"post": 3}
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(
+            data=request.data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            issue_tokens(serializer.validated_data["user"]),
+            status=status.HTTP_200_OK
+        )
+
+
+class TokenRefreshAPIView(TokenAPIView):
+    """New token pair for a refresh token, which can't be used again."""
+    serializer_class = TokenRefreshSerializer
+    query_budget = {"post": 8}
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            refresh_tokens(serializer.validated_data["refresh"]),
+            status=status.HTTP_200_OK
+        )
+
+
+class TokenRevokeAPIView(TokenAPIView):
+    """Revokes the access and refresh token of a session (logout)."""
+    serializer_class = TokenRefreshSerializer
+    query_budget = {"post": 5}
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        claims = read_token(serializer.validated_data["refresh"], REFRESH)
+        revoke_session(claims["sid"])
+        return Response(status=status.HTTP_204_NO_CONTENT)
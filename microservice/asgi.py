@@ -2,6 +2,8 @@
 ASGI config for microservice project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Besides the Django application it serves the interview event stream,
+see apis/streams.py.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.1/howto/deployment/asgi/
@@ -13,4 +15,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'microservice.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# imported once the apps are loaded
+from apis.streams import EventStreamRouter  # noqa: E402
+
+application = EventStreamRouter(django_application)
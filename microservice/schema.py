@@ -0,0 +1,134 @@
+"""
+OpenAPI schema served from a build artifact or a warm in-memory copy.
+
+`./manage.py generate_openapi_schema` writes the versioned artifact
+(OPENAPI_SCHEMA_DIR/openapi-<version>.json|.yaml plus gzipped copies)
+at deploy time; when it's missing the schema is generated once per
+process on the first request. Either way the bytes, their gzip copies
+and the ETag are computed once and every request just sends them.
+"""
+import gzip
+import hashlib
+import threading
+from pathlib import Path
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.views import View
+
+SCHEMA_TITLE = "Hiring Portal"
+SCHEMA_DESCRIPTION = "Hiring Portal API Endpoints"
+SCHEMA_URLCONF = "apis.urls"
+SCHEMA_FORMATS = {
+    "json": "application/vnd.oai.openapi+json",
+    "yaml": "application/vnd.oai.openapi",
+}
+
+
+def get_schema_version():
+    return getattr(settings, "OPENAPI_SCHEMA_VERSION", "1.0.0")
+
+
+def get_artifact_path(fmt, version=None):
+    schema_dir = Path(getattr(
+        settings, "OPENAPI_SCHEMA_DIR", settings.BASE_DIR / "schema"
+    ))
+    return schema_dir / f"openapi-{version or get_schema_version()}.{fmt}"
+
+
+def render_schema():
+    """Generates the public schema, returns {format: bytes}."""
+    from rest_framework.renderers import JSONOpenAPIRenderer, OpenAPIRenderer
+    from rest_framework.schemas.openapi import SchemaGenerator
+
+    generator = SchemaGenerator(
+        title=SCHEMA_TITLE,
+        description=SCHEMA_DESCRIPTION,
+        version=get_schema_version(),
+        urlconf=SCHEMA_URLCONF
+    )
+    schema = generator.get_schema(request=None, public=True)
+    return {
+        "json": JSONOpenAPIRenderer().render(schema),
+        "yaml": OpenAPIRenderer().render(schema),
+    }
+
+
+def write_schema_artifacts(version=None):
+    written = []
+    for fmt, body in render_schema().items():
+        path = get_artifact_path(fmt, version)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+        path.with_name(f"{path.name}.gz").write_bytes(gzip.compress(body, 9))
+        written.append(path)
+    return written
+
+
+class SchemaDocument:
+    def __init__(self, body, gzipped=None):
+        self.body = body
+        self.gzipped = gzipped or gzip.compress(body, 9)
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+_documents = {}
+_documents_lock = threading.Lock()
+
+
+def get_schema_document(fmt):
+    document = _documents.get(fmt)
+    if document:
+        return document
+    with _documents_lock:
+        if not _documents:
+            paths = {fmt: get_artifact_path(fmt) for fmt in SCHEMA_FORMATS}
+            if all(path.exists() for path in paths.values()):
+                for key, path in paths.items():
+                    gz_path = path.with_name(f"{path.name}.gz")
+                    _documents[key] = SchemaDocument(
+                        path.read_bytes(),
+                        gz_path.read_bytes() if gz_path.exists() else None
+                    )
+            else:
+                for key, body in render_schema().items():
+                    _documents[key] = SchemaDocument(body)
+        return _documents[fmt]
+
+
+class CachedSchemaView(View):
+    http_method_names = ["get", "head"]
+
+    @staticmethod
+    def get_format(request):
+        fmt = request.GET.get("format", "")
+        if fmt in ("openapi", "yaml"):
+            return "yaml"
+        if fmt in ("openapi-json", "json"):
+            return "json"
+        accept = request.headers.get("Accept", "")
+        accept = accept.replace(SCHEMA_FORMATS["json"], "")
+        if "yaml" in accept or SCHEMA_FORMATS["yaml"] in accept:
+            return "yaml"
+        return "json"
+
+    def get(self, request, *args, **kwargs):
+        fmt = self.get_format(request)
+        document = get_schema_document(fmt)
+        if document.etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        elif "gzip" in request.headers.get("Accept-Encoding", ""):
+            response = HttpResponse(
+                document.gzipped, content_type=SCHEMA_FORMATS[fmt]
+            )
+            response["Content-Encoding"] = "gzip"
+        else:
+            response = HttpResponse(
+                document.body, content_type=SCHEMA_FORMATS[fmt]
+            )
+        response["ETag"] = document.etag
+        response["Cache-Control"] = "public, max-age=%d" % getattr(
+            settings, "OPENAPI_SCHEMA_MAX_AGE", 300
+        )
+        patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+        return response
@@ -7,7 +7,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.1/ref/settings/
 """
 import os
-import logging.config
+import logging
 
 from pathlib import Path
 from environs import Env
@@ -24,7 +24,11 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # ######################## Sensitive Section ##################################
 # #############################################################################
 env = Env()
-env.read_env(recurse=True)
+# .env is read from ENV_FILE (default BASE_DIR/.env) without walking up the
+# directory tree, workers with a populated environment can set it to "".
+ENV_FILE = os.getenv("ENV_FILE", os.path.join(BASE_DIR, ".env"))
+if ENV_FILE and os.path.exists(ENV_FILE):
+    env.read_env(ENV_FILE, recurse=False)
 
 # Determine the Environment
 ENVIRONMENT = env.str("ENVIRONMENT", "PROD")
@@ -46,7 +50,7 @@ if ENVIRONMENT == "DEV":
 
 # Application definition
 LOCAL_INSTALLED_APPS = [
-    "apis",
+    "apis.apps.ApisConfig",
 ]
 
 INSTALLED_APPS = [
@@ -59,9 +63,14 @@ INSTALLED_APPS = [
     # 3rd party apps
     "corsheaders",
     "rest_framework",
-    "django_extensions",
 ] + LOCAL_INSTALLED_APPS
 
+# dev only apps, kept out of production workers to speed up their boot
+if ENVIRONMENT == "DEV":
+    INSTALLED_APPS += [
+        "django_extensions",
+    ]
+
 MIDDLEWARE = [
     # 3rd party middleware
     "corsheaders.middleware.CorsMiddleware",
@@ -73,6 +82,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # Project middleware
+    "apis.profiling.ProfilerMiddleware",
 ]
 
 ROOT_URLCONF = "microservice.urls"
@@ -194,8 +205,119 @@ LOGGING = {
 }
 
 REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'apis.authentication.SignedTokenAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    ],
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
-    ]
-}
\ No newline at end of file
+    ],
+    'EXCEPTION_HANDLER': 'apis.exceptions.exception_handler',
+}
+if ENVIRONMENT == "DEV" or DEBUG:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append(
+        'rest_framework.renderers.BrowsableAPIRenderer'
+    )
+
+
+# Duplicate candidate detection, see apis/dedupe.py. A phonetic name
+# match (0.4) only counts with a phone (1.0) or email (0.6) match unless
+# DEDUPE_MIN_SCORE is lowered to 0.4.
+DEDUPE_DEFAULT_COUNTRY_CODE = env.str("DEDUPE_DEFAULT_COUNTRY_CODE", "91")
+DEDUPE_MIN_SCORE = env.float("DEDUPE_MIN_SCORE", 0.6)
+
+
+# Candidate ranking matrix refresh intervals (seconds), see apis/ranking.py
+RANKING_REFRESH_SECONDS = env.int("RANKING_REFRESH_SECONDS", 30)
+RANKING_FULL_REFRESH_SECONDS = env.int("RANKING_FULL_REFRESH_SECONDS", 3600)
+
+
+# Audit log write-behind buffer, see apis/audit.py
+# "buffered" or "sync" (every entry inserted in the request transaction)
+AUDIT_LOG_DURABILITY = env.str("AUDIT_LOG_DURABILITY", "buffered")
+AUDIT_LOG_BUFFER_SIZE = env.int("AUDIT_LOG_BUFFER_SIZE", 100)
+AUDIT_LOG_FLUSH_SECONDS = env.float("AUDIT_LOG_FLUSH_SECONDS", 5.0)
+# entries kept for a retry while inserts fail, the oldest are dropped beyond
+AUDIT_LOG_MAX_BACKLOG = env.int("AUDIT_LOG_MAX_BACKLOG", 10000)
+
+
+# Transactional outbox for notifications, see apis/outbox.py
+OUTBOX_WEBHOOK_URL = env.str("OUTBOX_WEBHOOK_URL", "")
+OUTBOX_MAX_ATTEMPTS = env.int("OUTBOX_MAX_ATTEMPTS", 8)
+OUTBOX_RETRY_BASE_SECONDS = env.float("OUTBOX_RETRY_BASE_SECONDS", 5.0)
+
+
+# Tables bigger than this are counted from the database statistics
+# in unfiltered admin changelists, see apis/paginators.py
+ESTIMATED_COUNT_THRESHOLD = env.int("ESTIMATED_COUNT_THRESHOLD", 100000)
+# filtered lists requested with ?approx_count=true stop counting here
+APPROXIMATE_COUNT_CAP = env.int("APPROXIMATE_COUNT_CAP", 10000)
+
+
+# OpenAPI schema artifact, see microservice/schema.py
+OPENAPI_SCHEMA_VERSION = env.str("OPENAPI_SCHEMA_VERSION", "1.0.0")
+OPENAPI_SCHEMA_DIR = env.str("OPENAPI_SCHEMA_DIR", os.path.join(BASE_DIR, "schema"))
+OPENAPI_SCHEMA_MAX_AGE = env.int("OPENAPI_SCHEMA_MAX_AGE", 300)
+
+
+# Cold start budget (milliseconds) checked by `./manage.py profile_startup`
+STARTUP_BUDGET_MS = env.int("STARTUP_BUDGET_MS", 1500)
+
+
+# Seconds a candidate timeline stays cached, 0 disables the cache.
+# Invalidation goes through the configured cache, so enable it only
+# with a cache shared by all workers.
+TIMELINE_CACHE_SECONDS = env.int("TIMELINE_CACHE_SECONDS", 0)
+
+
+# Columnar analytics snapshots, see apis/analytics.py
+SNAPSHOT_DIR = env.str("SNAPSHOT_DIR", os.path.join(BASE_DIR, "snapshots"))
+
+
+# Closed interviews older than this are moved to the archive tables
+# by `./manage.py archive_interviews`, see apis/archive.py
+ARCHIVE_AFTER_DAYS = env.int("ARCHIVE_AFTER_DAYS", 365)
+
+
+# Opt-in request profiler for superusers (X-Profile header or ?_profile=1),
+# see apis/profiling.py. Profiles are kept per worker process. Off unless
+# DEBUG, turn it on explicitly to profile a deployment.
+REQUEST_PROFILER_ENABLED = env.bool("REQUEST_PROFILER_ENABLED", DEBUG)
+REQUEST_PROFILER_BUFFER_SIZE = env.int("REQUEST_PROFILER_BUFFER_SIZE", 50)
+REQUEST_PROFILER_TOP_FUNCTIONS = env.int("REQUEST_PROFILER_TOP_FUNCTIONS", 40)
+REQUEST_PROFILER_TOP_QUERIES = env.int("REQUEST_PROFILER_TOP_QUERIES", 20)
+
+
+# Signed API tokens (Authorization: Bearer <token>), see apis/authentication.py
+ACCESS_TOKEN_SECONDS = env.int("ACCESS_TOKEN_SECONDS", 900)
+REFRESH_TOKEN_SECONDS = env.int("REFRESH_TOKEN_SECONDS", 86400)
+# how long workers may keep using their copy of the revoked sessions
+REVOKED_TOKENS_CACHE_SECONDS = env.int("REVOKED_TOKENS_CACHE_SECONDS", 30)
+
+
+# Change feed (/api/v1/changes/), see apis/changes.py. Sequences skipped
+# by a cursor are read again for the gap timeout, a change committed
+# later than that after a newer one is lost, entries are deleted after
+# the retention by `./manage.py prune_change_log`.
+CHANGE_FEED_GAP_TIMEOUT_SECONDS = env.int("CHANGE_FEED_GAP_TIMEOUT_SECONDS", 300)
+CHANGE_LOG_RETENTION_DAYS = env.int("CHANGE_LOG_RETENTION_DAYS", 30)
+
+
+# Server-Sent Events of interview status changes, served by microservice/asgi.py
+# (not under WSGI), see apis/streams.py. Every process polls the events of
+# the others and reads the ids it skipped again for the gap timeout,
+# events are deleted by `./manage.py prune_interview_events`.
+STREAM_POLL_SECONDS = env.float("STREAM_POLL_SECONDS", 2.0)
+STREAM_GAP_TIMEOUT_SECONDS = env.int("STREAM_GAP_TIMEOUT_SECONDS", 300)
+STREAM_QUEUE_SIZE = env.int("STREAM_QUEUE_SIZE", 100)
+STREAM_HEARTBEAT_SECONDS = env.int("STREAM_HEARTBEAT_SECONDS", 15)
+STREAM_MAX_SECONDS = env.int("STREAM_MAX_SECONDS", 900)
+STREAM_EVENT_RETENTION_DAYS = env.int("STREAM_EVENT_RETENTION_DAYS", 7)
+
+
+# Skill autocomplete trie, see apis/skills.py. Skill and alias changes
+# reach the other workers through a version kept in the database, usage
+# counts are refreshed every SKILL_INDEX_REFRESH_SECONDS.
+SKILL_INDEX_REFRESH_SECONDS = env.int("SKILL_INDEX_REFRESH_SECONDS", 300)
+SKILL_INDEX_NODE_SIZE = env.int("SKILL_INDEX_NODE_SIZE", 20)
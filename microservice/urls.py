@@ -18,18 +18,11 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import TemplateView
-from rest_framework.schemas import get_schema_view
-
-openapi_view = get_schema_view(
-    title='Hiring Portal',
-    description='Hiring Portal API Endpoints',
-    version="1.0.0",
-    urlconf='apis.urls'
-)
+from microservice.schema import CachedSchemaView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('openapi/', openapi_view, name='openapi-schema'),
+    path('openapi/', CachedSchemaView.as_view(), name='openapi-schema'),
     path('', TemplateView.as_view(
         template_name='swagger-ui.html',
         extra_context={'schema_url': 'openapi-schema'}